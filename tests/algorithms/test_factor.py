@@ -661,3 +661,18 @@ def test_int_factor(factor1_with_int, factor2_with_int):
     assert f1 in factor2_with_int.factors()
     assert f2 in factor2_with_int.factors()
     assert f3 in factor2_with_int.factors()
+
+
+def test_factor_counters(tiling1, tiling2):
+    Factor.counters.clear()
+    factor = FactorWithInterleaving(tiling2)
+    components = factor.get_components()
+    assert factor.get_components() is components
+    assert Factor.counters.computed == 1
+    assert len(Factor(tiling2).get_components()) == 2
+    assert len(FactorWithMonotoneInterleaving(tiling2).get_components()) == 2
+    assert len(Factor(tiling1).get_components()) == 2
+    assert Factor.counters.computed == 4
+    assert "4 computed" in Factor.counters.status()
+    Factor.counters.clear()
+    assert Factor.counters.computed == 0
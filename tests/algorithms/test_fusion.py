@@ -294,6 +294,24 @@ class TestFusion:
         algo = Fusion(t, col_idx=0)
         assert algo.min_left_right_points() == (1, 0)
 
+    def test_candidate_rows_and_cols(self):
+        t = Tiling(
+            obstructions=[
+                GriddedPerm((0, 1), ((0, 0), (0, 0))),
+                GriddedPerm((0, 1), ((1, 0), (1, 0))),
+                GriddedPerm((0, 1, 2), ((2, 0), (2, 0), (2, 0))),
+            ]
+        )
+        rows, cols = Fusion.candidate_rows_and_cols(t)
+        assert rows == []
+        assert cols == [0]
+        for idx in range(t.dimensions[0] - 1):
+            if Fusion(t, col_idx=idx).fusable():
+                assert idx in cols
+        for idx in range(t.dimensions[1] - 1):
+            if Fusion(t, row_idx=idx).fusable():
+                assert idx in rows
+
 
 class TestComponentFusion(TestFusion):
     @pytest.fixture
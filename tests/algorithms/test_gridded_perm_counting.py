@@ -0,0 +1,78 @@
+from collections import Counter
+
+import pytest
+
+from tilings import GriddedPerm, Tiling
+from tilings.algorithms import GriddedPermCounter
+from tilings.assumptions import SumComponentAssumption, TrackingAssumption
+
+
+@pytest.fixture
+def tiling():
+    return Tiling(
+        obstructions=(
+            GriddedPerm((0, 1), ((0, 0), (0, 0))),
+            GriddedPerm((0, 1), ((1, 0), (1, 0))),
+            GriddedPerm((0, 2, 1), ((0, 0), (0, 1), (0, 1))),
+            GriddedPerm((0, 1, 2), ((0, 1), (0, 1), (0, 1))),
+            GriddedPerm((0, 1, 2), ((0, 1), (1, 1), (1, 1))),
+            GriddedPerm((1, 0, 2), ((1, 1), (1, 1), (1, 1))),
+            GriddedPerm((1, 0), ((0, 1), (1, 1))),
+        ),
+        requirements=(
+            (GriddedPerm((0,), ((1, 0),)),),
+            (
+                GriddedPerm((1, 0), ((0, 1), (0, 0))),
+                GriddedPerm((0, 1), ((0, 0), (1, 1))),
+            ),
+        ),
+    )
+
+
+def test_count(tiling):
+    expected = Counter(len(gp) for gp in tiling.gridded_perms(7))
+    assert GriddedPermCounter(tiling).count(7) == [expected[i] for i in range(8)]
+    assert GriddedPermCounter(Tiling.from_string("132")).count(8) == [
+        1,
+        1,
+        2,
+        5,
+        14,
+        42,
+        132,
+        429,
+        1430,
+    ]
+
+
+def test_count_by_parameters(tiling):
+    assumptions = (
+        TrackingAssumption.from_cells([(0, 1), (1, 0)]),
+        SumComponentAssumption.from_cells([(1, 1)]),
+    )
+    expected = [Counter() for _ in range(7)]
+    for gp in tiling.gridded_perms(6):
+        expected[len(gp)][tuple(ass.get_value(gp) for ass in assumptions)] += 1
+    assert GriddedPermCounter(tiling, assumptions).count_by_parameters(6) == expected
+
+
+def test_empty_tiling():
+    tiling = Tiling((GriddedPerm.empty_perm(),))
+    assert GriddedPermCounter(tiling).count(3) == [0, 0, 0, 0]
+
+
+def test_workers(tiling):
+    assumptions = (TrackingAssumption.from_cells([(0, 1), (1, 0)]),)
+    counter = GriddedPermCounter(tiling, assumptions)
+    assert counter.count_by_parameters(7, workers=2) == counter.count_by_parameters(7)
+    assert Tiling.from_string("1324").enmerate_gp_up_to(8, workers=2) == [
+        1,
+        1,
+        2,
+        6,
+        23,
+        103,
+        513,
+        2762,
+        15793,
+    ]
@@ -0,0 +1,73 @@
+import pytest
+
+from tilings import GriddedPerm, Tiling
+from tilings.algorithms import GriddedPermsOnTiling
+
+
+@pytest.fixture
+def tiling():
+    return Tiling(
+        obstructions=(
+            GriddedPerm((0, 1), ((0, 0), (0, 0))),
+            GriddedPerm((0, 1), ((1, 0), (1, 0))),
+            GriddedPerm((1, 0), ((1, 0), (1, 0))),
+            GriddedPerm((0, 2, 1), ((0, 0), (0, 1), (0, 1))),
+            GriddedPerm((0, 1, 2), ((0, 1), (0, 1), (0, 1))),
+            GriddedPerm((0, 1), ((0, 1), (1, 0))),
+        ),
+        requirements=(
+            (GriddedPerm((0,), ((1, 0),)),),
+            (GriddedPerm((1, 0), ((0, 1), (0, 0))), GriddedPerm((0,), ((0, 0),))),
+        ),
+    )
+
+
+def test_matches_place_at_most(tiling):
+    for size in range(7):
+        gps = list(GriddedPermsOnTiling(tiling).gridded_perms(size))
+        assert len(gps) == len(set(gps))
+        assert [len(gp) for gp in gps] == sorted(len(gp) for gp in gps)
+        assert set(gps) == set(
+            GriddedPermsOnTiling(tiling).gridded_perms(size, place_at_most=size)
+        )
+
+
+def test_levels(tiling):
+    levels = list(GriddedPermsOnTiling(tiling).levels(6))
+    assert len(levels) == 7
+    for length, level in enumerate(levels):
+        assert all(len(gp) == length for gp in level)
+        assert all(gp in tiling for gp in level)
+    assert [len(level) for level in levels] == tiling.enmerate_gp_up_to(6)
+
+
+def test_non_minimal_seeds():
+    tiling = Tiling(
+        obstructions=(GriddedPerm((0, 1), ((0, 0), (0, 0))),),
+        requirements=(
+            (GriddedPerm((0,), ((0, 0),)),),
+            (GriddedPerm((1, 0), ((0, 0), (0, 0))),),
+        ),
+    )
+    gps = list(GriddedPermsOnTiling(tiling, yield_non_minimal=True).gridded_perms(5))
+    assert gps == [
+        GriddedPerm(tuple(range(n - 1, -1, -1)), ((0, 0),) * n) for n in (2, 3, 4, 5)
+    ]
+
+
+def test_empty_tiling():
+    tiling = Tiling((GriddedPerm.empty_perm(),))
+    assert list(GriddedPermsOnTiling(tiling).levels(4)) == []
+    assert tiling.enmerate_gp_up_to(4) == [0, 0, 0, 0, 0]
+
+
+def test_roots():
+    gps = GriddedPermsOnTiling(Tiling.from_string("132"))
+    above, roots = gps.roots(6, 20)
+    assert len(roots) >= 20
+    subtrees = [gp for root in roots for gp in gps.subtree(root, 6)]
+    assert sorted(above + subtrees) == sorted(gps.gridded_perms(6))
+
+
+def test_workers(tiling):
+    assert sorted(tiling.gridded_perms(6, workers=2)) == sorted(tiling.gridded_perms(6))
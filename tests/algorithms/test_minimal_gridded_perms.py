@@ -339,3 +339,53 @@ def test_order():
         GriddedPerm(Perm([3, 1, 0, 2]), [(1, 2), (2, 1), (2, 1), (2, 1)]),
         GriddedPerm(Perm([1, 3, 2, 4, 0]), [(1, 2), (2, 3), (2, 3), (2, 3), (2, 1)]),
     ]
+
+
+def test_shared_caches():
+    MinimalGriddedPerms.clear_caches()
+    tiling = tilings[1]
+    expected = list(
+        MinimalGriddedPerms(
+            tiling.obstructions, tiling.requirements
+        ).minimal_gridded_perms()
+    )
+    misses = [cache.misses for cache in MinimalGriddedPerms.caches()]
+    assert sum(misses) > 0
+    mgps = MinimalGriddedPerms(tiling.obstructions, tiling.requirements)
+    assert list(mgps.minimal_gridded_perms()) == expected
+    # everything computed for the first instance is reused
+    assert [cache.misses for cache in MinimalGriddedPerms.caches()] == misses
+    assert all(
+        cache.hits >= count
+        for cache, count in zip(MinimalGriddedPerms.caches(), misses)
+    )
+    assert "Upward closure cache" in MinimalGriddedPerms.cache_status()
+    MinimalGriddedPerms.upward_closures.maxsize = 0
+    MinimalGriddedPerms.clear_caches()
+    assert list(mgps.minimal_gridded_perms()) == expected
+    assert len(MinimalGriddedPerms.upward_closures) == 0
+    MinimalGriddedPerms.upward_closures.maxsize = 2**17
+
+
+@pytest.mark.parametrize("tiling", tilings)
+def test_witness(tiling):
+    mgps = MinimalGriddedPerms(tiling.obstructions, tiling.requirements)
+    witness = mgps.witness()
+    if any(True for _ in mgps.minimal_gridded_perms()):
+        assert witness is not None
+        assert mgps.satisfies_obstructions(witness)
+        assert mgps.satisfies_requirements(witness)
+    else:
+        assert witness is None
+    empty = Tiling(
+        obstructions=(
+            GriddedPerm((0, 1), ((0, 0), (1, 0))),
+            GriddedPerm((1, 0), ((0, 0), (1, 0))),
+        ),
+        requirements=(
+            (GriddedPerm((0,), ((0, 0),)),),
+            (GriddedPerm((0,), ((1, 0),)),),
+        ),
+        simplify=False,
+    )
+    assert MinimalGriddedPerms(empty.obstructions, empty.requirements).witness() is None
@@ -0,0 +1,120 @@
+from itertools import combinations
+
+import pytest
+
+from tilings import GriddedPerm, Tiling
+from tilings.algorithms import ObstructionIndex
+
+
+@pytest.fixture
+def obstructions():
+    return (
+        GriddedPerm((0,), ((2, 0),)),
+        GriddedPerm((0, 1), ((0, 0), (0, 0))),
+        GriddedPerm((0, 1), ((0, 0), (1, 0))),
+        GriddedPerm((1, 0), ((1, 0), (1, 0))),
+        GriddedPerm((0, 2, 1), ((0, 0), (1, 1), (1, 1))),
+        GriddedPerm((0, 1, 2), ((1, 1), (1, 1), (1, 1))),
+    )
+
+
+@pytest.fixture
+def index(obstructions):
+    return ObstructionIndex(obstructions)
+
+
+def test_relevant_obstructions(index):
+    assert index.relevant_obstructions(frozenset([(0, 0)])) == (
+        GriddedPerm((0, 1), ((0, 0), (0, 0))),
+    )
+    assert set(index.relevant_obstructions(frozenset([(0, 0), (1, 0)]))) == {
+        GriddedPerm((0, 1), ((0, 0), (0, 0))),
+        GriddedPerm((0, 1), ((0, 0), (1, 0))),
+        GriddedPerm((1, 0), ((1, 0), (1, 0))),
+    }
+    relevant = index.relevant_obstructions(frozenset([(0, 0), (1, 0), (1, 1)]))
+    assert list(map(len, relevant)) == sorted(map(len, relevant))
+    assert index.relevant_obstructions(frozenset([(3, 3)])) == ()
+    assert index.relevant_obstructions_by_cell(frozenset([(0, 0), (1, 1)]), (1, 1)) == (
+        GriddedPerm((0, 2, 1), ((0, 0), (1, 1), (1, 1))),
+        GriddedPerm((0, 1, 2), ((1, 1), (1, 1), (1, 1))),
+    )
+
+
+def test_avoided_by(index, obstructions):
+    gps = [
+        GriddedPerm((0,), ((2, 0),)),
+        GriddedPerm((1, 0), ((0, 0), (0, 0))),
+        GriddedPerm((1, 0), ((0, 0), (1, 0))),
+        GriddedPerm((2, 1, 0), ((0, 0), (0, 0), (1, 0))),
+        GriddedPerm((0, 2, 1), ((0, 0), (1, 1), (1, 1))),
+        GriddedPerm((1, 0, 3, 2), ((0, 0), (0, 0), (1, 1), (1, 1))),
+        GriddedPerm((2, 0, 1), ((1, 1), (1, 1), (1, 1))),
+        GriddedPerm((0, 1, 3, 2), ((1, 1), (1, 1), (1, 1), (1, 1))),
+    ]
+    for gp in gps:
+        assert index.avoided_by(gp) == gp.avoids(*obstructions)
+        assert index.contained_in(gp) == gp.contains(*obstructions)
+
+
+def test_must_contain(index):
+    gp = GriddedPerm((0, 1, 2, 3), ((0, 0), (0, 0), (1, 1), (1, 1)))
+    assert index.contained_in(gp)
+    assert index.contained_in(gp, must_contain=(0, 0))
+    assert not index.contained_in(gp, must_contain=(1, 1))
+
+
+def test_add(index):
+    gp = GriddedPerm((0, 1), ((1, 1), (1, 1)))
+    assert index.avoided_by(gp)
+    index.add(GriddedPerm((0, 1), ((1, 1), (1, 1))))
+    assert not index.avoided_by(gp)
+    assert len(index) == 7
+    assert gp in index.obstructions
+    index.add(gp)
+    assert len(index) == 7
+
+
+def test_remove(index, obstructions):
+    gp = GriddedPerm((0, 2, 1, 3), ((0, 0), (1, 0), (1, 0), (2, 0)))
+    contained = index.contained_obstructions(gp)
+    assert len(contained) == 3
+    assert set(contained) == set(ob for ob in obstructions if gp.contains(ob))
+    index.remove(*contained)
+    assert index.contained_obstructions(gp) == []
+    assert index.avoided_by(gp)
+    assert len(index) == len(obstructions) - 3
+    assert list(index.avoiders([gp, GriddedPerm((0, 1), ((0, 0), (0, 0)))])) == [gp]
+
+
+def test_memos_bounded(index, obstructions):
+    assert index.memo_maxsize == 4 * len(obstructions) + 16
+    assert index.max_size() == len(obstructions) + index.memo_maxsize
+    all_cells = [(i, j) for i in range(4) for j in range(4)]
+    for n in range(1, 4):
+        for cells in combinations(all_cells, n):
+            cells = frozenset(cells)
+            relevant = index.relevant_obstructions(cells)
+            assert set(relevant) == {
+                ob for ob in obstructions if frozenset(ob.pos) <= cells
+            }
+            for cell in cells:
+                index.relevant_obstructions_by_cell(cells, cell)
+            memos = tuple(index._relevant.values()) + tuple(
+                index._relevant_by_cell.values()
+            )
+            assert sum(len(res) + 1 for res in memos) <= index.memo_maxsize
+
+
+def test_empty_obstruction():
+    index = ObstructionIndex((GriddedPerm.empty_perm(),))
+    assert not index.avoided_by(GriddedPerm.empty_perm())
+    assert not index.avoided_by(GriddedPerm((0,), ((0, 0),)))
+
+
+def test_tiling_obstruction_index(obstructions):
+    tiling = Tiling(obstructions)
+    assert tiling.obstruction_index is tiling.obstruction_index
+    assert tuple(tiling.obstruction_index) == tiling.obstructions
+    for gp in tiling.gridded_perms(4):
+        assert tiling.obstruction_index.avoided_by(gp)
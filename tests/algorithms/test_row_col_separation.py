@@ -4,6 +4,7 @@ import pytest
 
 from tilings import GriddedPerm, Tiling
 from tilings.algorithms.row_col_separation import (
+    BitGraph,
     Graph,
     RowColSeparation,
     _RowColSeparationSingleApplication,
@@ -254,6 +255,66 @@ def test_le(graph2, graph3):
     assert graph2 <= graph3
 
 
+# ----------------------------------------------------------------------------
+#           Test for the BitGraph class
+# ----------------------------------------------------------------------------
+
+
+def test_bitgraph(matrix2):
+    g = BitGraph.from_matrix("abcde", matrix2)
+    assert g.num_vertices == 5
+    assert g.adjacency_matrix() == matrix2
+    assert g.vertex_labels() == [set(c) for c in "abcde"]
+    g.reduce()
+    assert g.num_vertices == 1
+    assert g.is_acyclic()
+    assert g.vertex_order() == [set("abcde")]
+
+    m = [[0, 0, 1, 0], [1, 0, 1, 1], [1, 0, 0, 1], [0, 0, 1, 0]]
+    g = BitGraph.from_matrix(range(4), m)
+    g.reduce()
+    assert g.vertex_labels() == [{0, 3}, {1}, {2}]
+    assert g.adjacency_matrix() == [[0, 0, 1], [1, 0, 1], [1, 0, 0]]
+    assert set(g.find_cycle()) == {(0, 2), (2, 0)}
+    childs = list(g.break_cycle_in_all_ways([(0, 2), (2, 0)]))
+    assert g.adjacency_matrix() == [[0, 0, 1], [1, 0, 1], [1, 0, 0]]
+    assert [c.adjacency_matrix() for c in childs] == [
+        [[0, 0, 0], [1, 0, 1], [1, 0, 0]],
+        [[0, 0, 1], [1, 0, 1], [0, 0, 0]],
+    ]
+    for c in childs:
+        c.reduce()
+    assert childs[0].vertex_order() == [{1}, {2}, {0, 3}]
+    assert childs[1].vertex_order() == [{1}, {0, 3}, {2}]
+
+    three_cycle = BitGraph.from_matrix(range(3), [[0, 1, 0], [0, 0, 1], [1, 0, 0]])
+    three_cycle.reduce()
+    assert set(three_cycle.find_cycle()) == {(0, 1), (1, 2), (2, 0)}
+    assert not three_cycle.is_acyclic()
+
+    empty_graph = BitGraph([], [])
+    empty_graph.reduce()
+    assert empty_graph.is_acyclic()
+    assert empty_graph.vertex_order() == []
+
+
+def test_bitgraph_same_orders_as_graph():
+    for m in product((0, 1), repeat=9):
+        matrix = [list(m[i : i + 3]) for i in range(0, 9, 3)]
+        for i in range(3):
+            matrix[i][i] = 0
+        orders = list(
+            _RowColSeparationSingleApplication._all_order(
+                Graph(range(3), [row.copy() for row in matrix])
+            )
+        )
+        assert orders == list(
+            _RowColSeparationSingleApplication._all_order(
+                BitGraph.from_matrix(range(3), matrix)
+            )
+        )
+
+
 # ----------------------------------------------------------------------------
 #           Test for the _RowColSeparationSingleApplication class
 # ----------------------------------------------------------------------------
@@ -390,16 +451,20 @@ def separable_tiling4():
     )
 
 
-def assert_matrix_entry_is(rcs, matrix, cell1, cell2, value):
+def assert_mask_entry_is(rcs, masks, cell1, cell2, value):
     i1 = rcs.cell_idx(cell1)
     i2 = rcs.cell_idx(cell2)
-    if matrix[i1][i2] != value:
-        m = "Value matrix[{}][{}] is {}, not {}".format(
-            cell1, cell2, matrix[i1][i2], value
+    if masks[i1] >> i2 & 1 != value:
+        m = "Bit {} of masks[{}] is {}, not {}".format(
+            cell2, cell1, masks[i1] >> i2 & 1, value
         )
         raise AssertionError(m)
 
 
+def masks_to_matrix(masks):
+    return [[mask >> j & 1 for j in range(len(masks))] for mask in masks]
+
+
 def test_init(separable_tiling2):
     rcs = _RowColSeparationSingleApplication(separable_tiling2)
     assert rcs._tiling == separable_tiling2
@@ -419,22 +484,22 @@ def test_cell_at_idx(separable_tiling2):
         assert i == rcs.cell_idx(rcs.cell_at_idx(i))
 
 
-def test_basic_matrix(separable_tiling2):
+def test_basic_masks(separable_tiling2):
     rcs = _RowColSeparationSingleApplication(separable_tiling2)
-    # Row basic matrix
-    m = rcs._basic_matrix(True)
+    # Row basic masks
+    m = rcs._basic_masks(True)
     for c1, c2 in product(separable_tiling2.active_cells, repeat=2):
         if c1[1] < c2[1]:
-            assert_matrix_entry_is(rcs, m, c1, c2, 1)
+            assert_mask_entry_is(rcs, m, c1, c2, 1)
         else:
-            assert_matrix_entry_is(rcs, m, c1, c2, 0)
-    # Column basic matrix
-    m = rcs._basic_matrix(False)
+            assert_mask_entry_is(rcs, m, c1, c2, 0)
+    # Column basic masks
+    m = rcs._basic_masks(False)
     for c1, c2 in product(separable_tiling2.active_cells, repeat=2):
         if c1[0] < c2[0]:
-            assert_matrix_entry_is(rcs, m, c1, c2, 1)
+            assert_mask_entry_is(rcs, m, c1, c2, 1)
         else:
-            assert_matrix_entry_is(rcs, m, c1, c2, 0)
+            assert_mask_entry_is(rcs, m, c1, c2, 0)
 
 
 def test_cell_order(separable_tiling1):
@@ -449,10 +514,10 @@ def test_cell_order(separable_tiling1):
     assert rcs._row_cell_order(ob) == ((0, 0), (1, 0))
 
 
-def test_complete_inequalities_matrices(separable_tiling2):
+def test_complete_inequalities_masks(separable_tiling2):
     rcs = _RowColSeparationSingleApplication(separable_tiling2)
-    row_m, col_m = rcs._complete_ineq_matrices()
-    # Row basic matrix
+    row_m, col_m = rcs._complete_ineq_masks()
+    # Row basic masks
     ob_ineq = [
         ((1, 0), (0, 0)),
         ((2, 0), (0, 0)),
@@ -466,28 +531,31 @@ def test_complete_inequalities_matrices(separable_tiling2):
     for c1, c2 in product(separable_tiling2.active_cells, repeat=2):
         if c1[1] < c2[1] or (c1, c2) in ob_ineq:
             print(1, c1, c2)
-            assert_matrix_entry_is(rcs, row_m, c1, c2, 1)
+            assert_mask_entry_is(rcs, row_m, c1, c2, 1)
         else:
             print(0, c1, c2)
-            assert_matrix_entry_is(rcs, row_m, c1, c2, 0)
-    assert rcs._ineq_matrices == (row_m, col_m)
-    # Column basic matrix
+            assert_mask_entry_is(rcs, row_m, c1, c2, 0)
+    # Column basic masks
     ob_ineq = [((0, 1), (0, 0))]
     for c1, c2 in product(separable_tiling2.active_cells, repeat=2):
         if c1[0] < c2[0] or (c1, c2) in ob_ineq:
-            assert_matrix_entry_is(rcs, col_m, c1, c2, 1)
+            assert_mask_entry_is(rcs, col_m, c1, c2, 1)
         else:
-            assert_matrix_entry_is(rcs, col_m, c1, c2, 0)
+            assert_mask_entry_is(rcs, col_m, c1, c2, 0)
 
 
 def test_row_ineq_graph(separable_tiling2):
     rcs = _RowColSeparationSingleApplication(separable_tiling2)
-    assert rcs.row_ineq_graph()._matrix == rcs._complete_ineq_matrices()[0]
+    assert rcs.row_ineq_graph().adjacency_matrix() == masks_to_matrix(
+        rcs._complete_ineq_masks()[0]
+    )
 
 
 def test_col_ineq_graph(separable_tiling2):
     rcs = _RowColSeparationSingleApplication(separable_tiling2)
-    assert rcs.col_ineq_graph()._matrix == rcs._complete_ineq_matrices()[1]
+    assert rcs.col_ineq_graph().adjacency_matrix() == masks_to_matrix(
+        rcs._complete_ineq_masks()[1]
+    )
 
 
 def test_all_order():
@@ -708,6 +776,18 @@ def test_separable(
         assert rcs.separable()
 
 
+def test_separation_cached(separable_tiling1):
+    rcs = RowColSeparation(separable_tiling1)
+    separated = rcs.separated_tiling()
+    assert RowColSeparation(separable_tiling1).separated_tiling() is separated
+    assert separated._cached_properties["row_col_separation"] == ()
+    assert not RowColSeparation(separated).separable()
+    single = _RowColSeparationSingleApplication(separable_tiling1)
+    masks = single._complete_ineq_masks()
+    assert single.max_row_order and single.max_col_order
+    assert single._complete_ineq_masks() is masks
+
+
 def test_multiple_separation():
     """
     Test that the row column separation is idempotent. This tilings needs two
@@ -1,4 +1,5 @@
 from tilings import GriddedPerm, Tiling
+from tilings.algorithms import GriddedPermReduction
 
 
 def test_duplicate_req_lists():
@@ -392,3 +393,18 @@ def test_minimal_req_duplicate():
         requirements=((GriddedPerm((1, 0), ((1, 0), (1, 0))),),),
         assumptions=(),
     )
+
+
+def test_already_minimized_reqs():
+    obs = (
+        GriddedPerm((0, 1), ((0, 0), (1, 1))),
+        GriddedPerm((0, 1), ((1, 1), (1, 1))),
+        GriddedPerm((1, 0), ((1, 1), (1, 1))),
+    )
+    reqs = ((GriddedPerm((0,), ((1, 1),)),),)
+    gpr = GriddedPermReduction(obs, reqs)
+    assert gpr.obstructions[0] == GriddedPerm((0,), ((0, 0),))
+    # the caller promises the requirement implies no new obstructions
+    gpr = GriddedPermReduction(obs, reqs, already_minimized_reqs=reqs)
+    assert gpr.obstructions == obs
+    assert gpr.requirements == reqs
@@ -4,9 +4,11 @@ from comb_spec_searcher import DisjointUnion
 from comb_spec_searcher.strategies import Rule
 from permuta.misc import DIR_EAST, DIR_NORTH, DIR_SOUTH, DIR_WEST, DIRS
 from tilings import GriddedPerm, Tiling
+from tilings.algorithms import Fusion
 from tilings.assumptions import TrackingAssumption
 from tilings.strategies import (
     AllPlacementsFactory,
+    FusableRowAndColumnPlacementFactory,
     PatternPlacementFactory,
     RowAndColumnPlacementFactory,
 )
@@ -208,6 +210,41 @@ def test_row_col_placement():
     assert len(list(partial_cr_placement(t))) == 4
 
 
+def test_fusable_row_col_placement():
+    t = Tiling(
+        obstructions=[
+            GriddedPerm((0, 1), ((0, 0),) * 2),
+            GriddedPerm((0, 1), ((1, 0),) * 2),
+            GriddedPerm((0, 1), ((0, 0), (1, 0))),
+            GriddedPerm((0, 1, 2), ((2, 0),) * 3),
+        ],
+        requirements=[[GriddedPerm((0,), ((2, 0),))]],
+    )
+    for tiling in (t, t.inverse()):
+        fusable_cols = set()
+        for idx in range(tiling.dimensions[0] - 1):
+            if Fusion(tiling, col_idx=idx).fusable():
+                fusable_cols.update((idx, idx + 1))
+        fusable_rows = set()
+        for idx in range(tiling.dimensions[1] - 1):
+            if Fusion(tiling, row_idx=idx).fusable():
+                fusable_rows.update((idx, idx + 1))
+        expected = set()
+        for rule in RowAndColumnPlacementFactory()(tiling):
+            cell = rule.strategy.gps[0].pos[0]
+            if rule.strategy.direction in (DIR_EAST, DIR_WEST):
+                fusable = cell[0] in fusable_cols
+            else:
+                fusable = cell[1] in fusable_rows
+            if fusable:
+                expected.add((rule.strategy.gps, rule.strategy.direction))
+        rules = list(FusableRowAndColumnPlacementFactory()(tiling))
+        assert len(rules) == 4
+        assert {
+            (rule.strategy.gps, rule.strategy.direction) for rule in rules
+        } == expected
+
+
 def test_all_placements():
     t = Tiling(
         obstructions=[GriddedPerm((0, 1), ((0, 0),) * 2)],
@@ -1,4 +1,5 @@
 from tilings import GriddedPerm, Tiling
+from tilings.assumptions import SumComponentAssumption, TrackingAssumption
 from tilings.strategies.symmetry import SymmetriesFactory
 
 
@@ -19,3 +20,57 @@ def test_symmetries():
         rule = strat(t)
         rule.sanity_check(1)
         rule.sanity_check(4)
+
+
+def test_symmetry_properties():
+    t = Tiling(
+        obstructions=(
+            GriddedPerm((0, 1), ((1, 1), (1, 1))),
+            GriddedPerm((1, 0), ((1, 1), (1, 1))),
+            GriddedPerm((1, 2, 0), ((0, 0), (0, 2), (0, 0))),
+            GriddedPerm((0, 2, 1), ((0, 0), (0, 0), (2, 0))),
+            GriddedPerm((0, 1, 2), ((0, 2),) * 3),
+        ),
+        requirements=(
+            (GriddedPerm((0,), ((1, 1),)),),
+            (GriddedPerm((0, 1), ((0, 0), (0, 0))), GriddedPerm((0,), ((2, 0),))),
+        ),
+        assumptions=(
+            SumComponentAssumption((GriddedPerm((0,), ((0, 0),)),)),
+            TrackingAssumption((GriddedPerm((0,), ((2, 0),)),)),
+        ),
+    )
+    # the empty column on the boundary is not removed
+    boundary = Tiling(
+        obstructions=(
+            GriddedPerm((0,), ((0, 0),)),
+            GriddedPerm((0, 1), ((1, 0), (1, 0))),
+        ),
+        remove_empty_rows_and_cols=False,
+    )
+    for tiling in (t, boundary):
+        assert tiling.point_cells is not None and tiling.possibly_empty is not None
+        for strat in SymmetriesFactory()(tiling):
+            child = strat(tiling).children[0]
+            expected = Tiling(
+                child.obstructions,
+                child.requirements,
+                child.assumptions,
+                remove_empty_rows_and_cols=False,
+                derive_empty=False,
+                simplify=False,
+            )
+            assert child == expected
+            for prop in (
+                "dimensions",
+                "active_cells",
+                "empty_cells",
+                "point_cells",
+                "positive_cells",
+                "possibly_empty",
+            ):
+                assert getattr(child, prop) == getattr(expected, prop)
+            assert sorted(type(ass).__name__ for ass in child.assumptions) == sorted(
+                strat.__class__.assumption_type_transform(ass).__name__
+                for ass in tiling.assumptions
+            )
@@ -22,3 +22,7 @@ def test_tracked_classdb():
     tracked_classdb.add(tiling)
     new_tiling = tracked_classdb.get_class(0)
     assert tiling == new_tiling
+    assert tracked_classdb.get_bytes(0) == tiling.to_bytes()
+    underlying = tiling.remove_assumptions()
+    label = tracked_classdb.get_label(underlying)
+    assert tracked_classdb.get_bytes(label) == underlying.to_bytes()
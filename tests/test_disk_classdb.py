@@ -0,0 +1,113 @@
+import pickle
+
+import pytest
+
+from tilings import GriddedPerm, Tiling
+from tilings.assumptions import SkewComponentAssumption, TrackingAssumption
+from tilings.disk_classdb import DiskClassDB, DiskKeyStore, DiskTrackedClassDB
+from tilings.strategy_pack import TileScopePack
+from tilings.tilescope import LimitedAssumptionTileScope, TileScope
+
+
+@pytest.fixture
+def keys():
+    return [bytes(range(i % 7)) + i.to_bytes(3, "little") for i in range(2000)]
+
+
+def test_disk_key_store(tmp_path, keys):
+    store = DiskKeyStore(str(tmp_path), cache_size=10)
+    for key in keys:
+        assert store.add(key) == len(store) - 1
+    assert store.add(keys[5]) == 5
+    assert len(store) == len(keys)
+    assert store == keys
+    assert store[-1] == keys[-1]
+    assert store[10:20] == keys[10:20]
+    with pytest.raises(IndexError):
+        store[len(keys)]  # pylint: disable=pointless-statement
+    store.cache.clear()
+    assert all(store.get_label(key) == label for label, key in enumerate(keys))
+    assert store.get_label(b"not a key") is None
+    assert keys[3] in store.labels
+    assert store.labels[keys[3]] == 3
+    assert list(store.labels.values()) == list(range(len(keys)))
+    assert dict(store.labels.items()) == {key: i for i, key in enumerate(keys)}
+    with pytest.raises(TypeError):
+        store.labels[b"not a key"] = 0  # type: ignore[index]
+    store.close()
+    # the keys are kept when reopened
+    store = DiskKeyStore(str(tmp_path))
+    assert store == keys
+    assert store.get_label(keys[1234]) == 1234
+    store.close()
+
+
+def test_pickle_truncates(tmp_path, keys):
+    store = DiskKeyStore(str(tmp_path))
+    for key in keys[:100]:
+        store.add(key)
+    pickled = pickle.dumps(store)
+    for key in keys[100:]:
+        store.add(key)
+    store.close()
+    store = pickle.loads(pickled)
+    assert store == keys[:100]
+    assert store.get_label(keys[100]) is None
+    assert store.add(keys[150]) == 100
+    store.close()
+
+
+def test_disk_classdb(tmp_path):
+    classdb = DiskClassDB(str(tmp_path))
+    tiling = Tiling.from_string("123")
+    label = classdb.get_label(tiling)
+    assert classdb.get_class(label) == tiling
+    assert not classdb.is_empty(tiling, label)
+    assert classdb.empty_list[label] is False
+    assert len(classdb.label_to_info) == 1
+    other = pickle.loads(pickle.dumps(classdb))
+    assert other.get_label(tiling) == label
+    assert other.is_empty(tiling, label) is False
+    classdb.close()
+    other.close()
+
+
+def test_tilescope_on_disk(tmp_path):
+    pack = TileScopePack.point_placements()
+    classdb = DiskClassDB(str(tmp_path))
+    spec = TileScope("132", pack, classdb=classdb).auto_search()
+    assert spec == TileScope("132", pack).auto_search()
+    assert len(classdb.label_to_info) > 1
+    classdb.close()
+
+
+def test_limited_assumption_tilescope_on_disk(tmp_path):
+    pack = TileScopePack.point_placements().make_fusion(tracked=True)
+    classdb = DiskTrackedClassDB(str(tmp_path))
+    searcher = LimitedAssumptionTileScope("123", pack, 1, classdb=classdb)
+    spec = searcher.auto_search()
+    for comb_class in spec.comb_classes():
+        label = classdb.get_label(comb_class)
+        assert classdb.get_class(label) == comb_class
+    assert len(classdb.label_to_tilings) == len(classdb.tilings_to_label)
+    classdb.close()
+
+
+def test_assumption_types_kept(tmp_path):
+    tiling = Tiling.from_string("123")
+    skew = tiling.add_assumption(
+        SkewComponentAssumption([GriddedPerm((0,), ((0, 0),))])
+    )
+    tracked = tiling.add_assumption(TrackingAssumption([GriddedPerm((0,), ((0, 0),))]))
+    classdb = DiskTrackedClassDB(str(tmp_path))
+    labels = [classdb.get_label(skew), classdb.get_label(tracked)]
+    classdb.close()
+    # the types are read back in the order they were added, not assigned anew
+    classdb = DiskTrackedClassDB(str(tmp_path))
+    assert classdb.get_class(labels[0]) == skew
+    assert classdb.get_class(labels[1]) == tracked
+    assert classdb.get_label(tracked) == labels[1]
+    classdb.close()
+    (tmp_path / "assumption_types").unlink()
+    with pytest.raises(ValueError):
+        DiskTrackedClassDB(str(tmp_path))
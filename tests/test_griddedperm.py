@@ -1,8 +1,11 @@
+import pickle
+
 import pytest
 
 from permuta import Perm
 from permuta.misc import DIR_EAST, DIR_NORTH, DIR_SOUTH, DIR_WEST
 from tilings import GriddedPerm
+from tilings.griddedperm import OccurrenceMasks
 
 
 @pytest.fixture
@@ -411,6 +414,14 @@ def test_compression(simpleob, singlecellob, everycellob, typicalob, isolatedob)
     assert isolatedob == GriddedPerm.decompress(isolatedob.compress())
 
 
+def test_from_unchecked(typicalob):
+    gp = GriddedPerm.from_unchecked(typicalob.patt, typicalob.pos)
+    assert gp == typicalob
+    assert hash(gp) == hash(typicalob)
+    assert len(gp) == len(typicalob)
+    assert all(gp.occupies(cell) for cell in typicalob.pos)
+
+
 def test_plot_helper():
     gp = GriddedPerm(
         Perm((0, 3, 6, 1, 4, 7, 2, 5, 8)),
@@ -566,3 +577,56 @@ def test_extend():
         GriddedPerm((1, 2, 0), ((0, 1), (1, 1), (1, 0))),
         GriddedPerm((1, 0, 2), ((0, 1), (1, 0), (1, 1))),
     }
+
+
+def test_occurrence_masks():
+    gp = GriddedPerm(
+        (3, 0, 5, 1, 7, 2, 4, 6, 8),
+        ((0, 0), (0, 0), (0, 1), (1, 0), (1, 1), (1, 0), (2, 0), (2, 1), (2, 1)),
+    )
+    masks = OccurrenceMasks(gp)
+    patts = [subgp for subgp in gp.all_subperms(proper=False) if len(subgp) <= 5]
+    patts.extend(
+        GriddedPerm(subgp.patt, subgp.pos[:-1] + ((2, 0),))
+        for subgp in list(patts)
+        if subgp.pos and subgp.pos[-1] == (2, 1)
+    )
+    patts.extend(GriddedPerm(subgp.patt.reverse(), subgp.pos) for subgp in list(patts))
+    for patt in patts:
+        assert masks.contains_patt(patt) == gp.contains_patt(patt)
+    assert not masks.contains(GriddedPerm((0, 1), ((3, 0), (3, 0))))
+    assert not masks.contains(GriddedPerm(tuple(range(10)), ((0, 0),) * 10))
+    assert masks.contains(GriddedPerm.empty_perm())
+    assert OccurrenceMasks.worthwhile(gp, 4)
+    assert not OccurrenceMasks.worthwhile(gp, 1)
+    # the values need not be standardised
+    gp = GriddedPerm((0, 3, 1, 2, 4, 6, 7), ((0, 0),) * 7)
+    assert OccurrenceMasks(gp).contains(GriddedPerm((1, 0), ((0, 0), (0, 0))))
+    assert not OccurrenceMasks(gp).contains(GriddedPerm((2, 1, 0), ((0, 0),) * 3))
+
+
+def test_batch_contains():
+    hosts = [
+        GriddedPerm((0, 2, 1, 3), ((0, 0), (1, 0), (1, 0), (2, 0))),
+        GriddedPerm((3, 2, 1, 0, 4, 5, 6), ((0, 0),) * 4 + ((1, 1),) * 3),
+        GriddedPerm.empty_perm(),
+    ]
+    patts = [
+        GriddedPerm((0, 1), ((0, 0), (1, 0))),
+        GriddedPerm((1, 0), ((0, 0), (0, 0))),
+        GriddedPerm((0, 1), ((0, 0), (1, 0))),
+        GriddedPerm((2, 1, 0), ((0, 0),) * 3),
+        GriddedPerm((0, 1, 2), ((0, 0), (1, 1), (1, 1))),
+        GriddedPerm.empty_perm(),
+    ]
+    rows = GriddedPerm.batch_contains(hosts, patts)
+    assert next(rows) == (True, False, True, False, False, True)
+    assert list(rows) == [
+        tuple(host.contains(patt) for patt in patts) for host in hosts[1:]
+    ]
+
+
+def test_occurrence_plan_not_pickled():
+    patt = GriddedPerm((0, 2, 1), ((0, 0), (1, 1), (1, 0)))
+    assert patt.occurrence_plan() == (((0, 0), -1, -1), ((1, 1), 0, -1), ((1, 0), 0, 1))
+    assert "_occurrence_plan" not in pickle.loads(pickle.dumps(patt)).__dict__
@@ -0,0 +1,99 @@
+import gc
+
+import pytest
+
+from permuta import Perm
+from tilings import GriddedPerm, Tiling
+from tilings.interning import (
+    GRIDDED_PERMS,
+    TILINGS,
+    InternTable,
+    disable_interning,
+    enable_interning,
+    intern_gridded_perm,
+    intern_tiling,
+    interning_status,
+)
+
+
+@pytest.fixture
+def interning():
+    enable_interning()
+    yield
+    disable_interning()
+
+
+def test_disabled():
+    gp = GriddedPerm((0, 1), ((0, 0), (0, 0)))
+    assert intern_gridded_perm(gp) is gp
+    assert intern_gridded_perm(GriddedPerm((0, 1), ((0, 0), (0, 0)))) is not gp
+    assert len(GRIDDED_PERMS) == 0
+    assert GRIDDED_PERMS.hits == GRIDDED_PERMS.misses == 0
+
+
+def test_intern_gridded_perm(interning):
+    gp = intern_gridded_perm(GriddedPerm((0, 1), ((0, 0), (1, 0))))
+    assert intern_gridded_perm(GriddedPerm((0, 1), ((0, 0), (1, 0)))) is gp
+    assert intern_gridded_perm(GriddedPerm((1, 0), ((0, 0), (1, 0)))) is not gp
+    assert GRIDDED_PERMS.hits == 1
+    assert GRIDDED_PERMS.misses == 2
+    assert GRIDDED_PERMS.hit_rate() == pytest.approx(1 / 3)
+
+
+def test_weak_references(interning):
+    intern_gridded_perm(GriddedPerm((0, 1), ((0, 0), (1, 0))))
+    gc.collect()
+    assert len(GRIDDED_PERMS) == 0
+
+
+def test_maxsize():
+    table = InternTable("test", maxsize=1)
+    table.enabled = True
+    gp1 = GriddedPerm((0,), ((0, 0),))
+    gp2 = GriddedPerm((0,), ((1, 0),))
+    assert table.intern(gp1) is gp1
+    assert table.intern(gp2) is gp2
+    assert len(table) == 1
+    assert table.intern(GriddedPerm((0,), ((0, 0),))) is gp1
+    assert table.intern(GriddedPerm((0,), ((1, 0),))) is not gp2
+
+
+def test_tiling_shares_gridded_perms(interning):
+    t1 = Tiling.from_string("123")
+    t2 = Tiling.from_string("123").add_single_cell_requirement(Perm((0,)), (0, 0))
+    assert t1.obstructions[0] is t2.obstructions[0]
+
+
+def test_intern_tiling(interning):
+    tiling = Tiling.from_string("132_4321")
+    assert intern_tiling(tiling) is tiling
+    assert Tiling.from_bytes(tiling.to_bytes()) is tiling
+    assert TILINGS.hits == 1
+
+
+def test_tiling_hash():
+    tiling = Tiling.from_string("123")
+    assert hash(tiling) == hash(tiling)
+    assert hash(tiling) == hash(Tiling.from_string("123"))
+    tiling = Tiling(
+        [GriddedPerm((0, 1), ((0, 0), (0, 0))), GriddedPerm((0, 1), ((2, 0), (2, 0)))],
+        remove_empty_rows_and_cols=False,
+    )
+    before = hash(tiling)
+    assert not tiling.forward_map.is_identity()
+    assert hash(tiling) != before
+    assert hash(tiling) == hash(
+        Tiling(
+            [
+                GriddedPerm((0, 1), ((0, 0), (0, 0))),
+                GriddedPerm((0, 1), ((1, 0), (1, 0))),
+            ]
+        )
+    )
+
+
+def test_interning_status(interning):
+    intern_gridded_perm(GriddedPerm((0,), ((0, 0),)))
+    status = interning_status()
+    assert status.startswith("GriddedPerm intern table:")
+    assert "Tiling intern table:" in status
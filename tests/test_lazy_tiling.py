@@ -0,0 +1,123 @@
+import json
+import pickle
+
+import pytest
+
+from tilings import GriddedPerm, Tiling
+from tilings.assumptions import TrackingAssumption
+from tilings.lazy_tiling import LazyTilingView, decode
+from tilings.tilescope import LazyClassDB
+
+
+@pytest.fixture
+def tiling():
+    return Tiling(
+        obstructions=(
+            GriddedPerm((0, 1), ((0, 0), (0, 0))),
+            GriddedPerm((0, 1), ((1, 1), (1, 1))),
+            GriddedPerm((1, 0), ((1, 1), (1, 1))),
+            GriddedPerm((0, 2, 1), ((0, 0), (1, 0), (1, 0))),
+            GriddedPerm((1, 0, 2), ((1, 0), (1, 0), (1, 0))),
+        ),
+        requirements=(
+            (GriddedPerm((0,), ((1, 1),)),),
+            (GriddedPerm((0,), ((0, 0),)), GriddedPerm((0,), ((1, 0),))),
+        ),
+        assumptions=(TrackingAssumption([GriddedPerm((0,), ((1, 0),))]),),
+    )
+
+
+def test_lazy_tiling(tiling):
+    lazy = Tiling.from_bytes(tiling.to_bytes(), lazy=True)
+    assert type(lazy) is Tiling
+    assert lazy._view is not None
+    assert lazy.dimensions == tiling.dimensions
+    assert lazy.active_cells == tiling.active_cells
+    assert lazy.empty_cells == tiling.empty_cells
+    # none of the gridded perms have been built
+    assert "_obstructions" not in lazy.__dict__
+    assert "_requirements" not in lazy.__dict__
+    assert lazy.requirements == tiling.requirements
+    assert "_obstructions" not in lazy.__dict__
+    assert not lazy.is_empty()
+    assert lazy == tiling
+    assert hash(lazy) == hash(tiling)
+    assert lazy.to_bytes() == tiling.to_bytes()
+    assert str(lazy) == str(tiling)
+    assert lazy.to_jsonable() == tiling.to_jsonable()
+    assert Tiling.from_json(json.dumps(lazy.to_jsonable())) == tiling
+    unpickled = pickle.loads(pickle.dumps(lazy))
+    assert unpickled._view is not None
+    assert unpickled == tiling
+    with pytest.raises(AttributeError):
+        lazy.not_an_attribute  # pylint: disable=pointless-statement
+
+
+def test_remove_assumptions(tiling):
+    lazy = Tiling.from_bytes(tiling.to_bytes(), lazy=True)
+    underlying = lazy.remove_assumptions()
+    assert underlying == tiling.remove_assumptions()
+    assert underlying.to_bytes() == tiling.remove_assumptions().to_bytes()
+
+
+def test_derived_tilings(tiling):
+    lazy = Tiling.from_bytes(tiling.to_bytes(), lazy=True)
+    assert lazy.add_single_cell_obstruction(
+        (0, 1), (0, 0)
+    ) == tiling.add_single_cell_obstruction((0, 1), (0, 0))
+    assert lazy.find_factors() == tiling.find_factors()
+    # the tilings built from a lazy tiling are not lazy
+    assert type(lazy.sub_tiling([(1, 1)])) is Tiling
+    assert type(lazy.remove_components_from_assumptions()) is Tiling
+    assert lazy.place_point_in_cell((1, 1), 0) == tiling.place_point_in_cell((1, 1), 0)
+
+
+def test_decode(tiling):
+    obstructions, requirements, assumptions = decode(tiling.to_bytes())
+    assert tuple(obstructions) == tiling.obstructions
+    assert tuple(map(tuple, requirements)) == tiling.requirements
+    assert tuple(assumptions) == tiling.assumptions
+    # cells beyond 127 are written with more than one byte
+    big = Tiling(
+        obstructions=(GriddedPerm((0, 1), ((200, 0), (200, 300))),),
+        requirements=((GriddedPerm((0,), ((200, 300),)),),),
+        remove_empty_rows_and_cols=False,
+        derive_empty=False,
+    )
+    assert Tiling.from_bytes(big.to_bytes()) == big
+    lazy = Tiling.from_bytes(big.to_bytes(), lazy=True)
+    assert lazy.obstructions == big.obstructions
+    assert lazy.dimensions == big.dimensions
+
+
+def test_point_obstructions_not_derived():
+    tiling = Tiling(
+        obstructions=(GriddedPerm((0, 1), ((0, 0), (1, 1))),),
+        remove_empty_rows_and_cols=False,
+        derive_empty=False,
+    )
+    lazy = Tiling.from_bytes(tiling.to_bytes(), lazy=True)
+    assert lazy.dimensions == tiling.dimensions
+    assert lazy.obstructions == tiling.obstructions
+    assert lazy.to_bytes() == tiling.to_bytes()
+
+
+def test_empty():
+    empty = Tiling((GriddedPerm.empty_perm(),))
+    lazy = Tiling.from_bytes(empty.to_bytes(), lazy=True)
+    assert lazy.is_empty()
+    assert lazy.dimensions == (1, 1)
+    assert lazy == empty
+    with pytest.raises(ValueError):
+        LazyTilingView(b"")
+
+
+def test_lazy_classdb(tiling):
+    classdb = LazyClassDB()
+    label = classdb.get_label(tiling)
+    lazy = classdb.get_class(label)
+    assert "_obstructions" not in lazy.__dict__
+    assert lazy == tiling
+    assert classdb.get_label(lazy) == label
+    assert classdb.get_bytes(label) == tiling.to_bytes()
+    assert not classdb.is_empty(lazy, label)
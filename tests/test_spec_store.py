@@ -0,0 +1,66 @@
+import pytest
+
+from comb_spec_searcher.exception import InvalidOperationError
+from permuta import Perm
+from tilings import Tiling
+from tilings.spec_store import (
+    SpecStore,
+    disable_spec_store,
+    enable_spec_store,
+    get_spec_store,
+)
+from tilings.strategies.verification import OneByOneVerificationStrategy
+from tilings.tilescope import GuidedSearcher, TileScope, TileScopePack
+
+
+@pytest.fixture
+def spec():
+    pack = TileScopePack.point_placements()
+    return TileScope("132", pack).auto_search()
+
+
+@pytest.fixture
+def store(tmp_path):
+    yield SpecStore(str(tmp_path), download=False)
+    disable_spec_store()
+
+
+def test_basis_key(store):
+    assert SpecStore.basis_key([Perm((1, 0, 2)), Perm((0, 1))]) == "01_021"
+    store.set_basis([Perm((2, 0, 1))], {"specs_and_eqs": []})
+    for basis in ("021", "102", "120", "201"):
+        assert store.get_basis([Perm.to_standard(basis)]) == {"specs_and_eqs": []}
+    assert store.get_basis([Perm((0, 1, 2))]) is None
+
+
+def test_offline(store):
+    with pytest.raises(InvalidOperationError):
+        store.fetch_basis([Perm((0, 1, 2))])
+    with pytest.raises(InvalidOperationError):
+        store.fetch_uri("https://permpal.com/")
+
+
+def test_one_by_one_spec(store, spec):
+    store.add_specification(spec)
+    enable_spec_store(store.path, download=False)
+    assert get_spec_store().path == store.path
+    # the symmetry of the stored specification is fixed
+    for basis in ("132", "213"):
+        tiling = Tiling.from_string(basis)
+        one_by_one_spec = OneByOneVerificationStrategy._spec_from_permpal(tiling)
+        assert one_by_one_spec.root == tiling
+    disable_spec_store()
+    assert get_spec_store() is None
+
+
+def test_from_uri(store, spec):
+    uri = "https://permpal.com/132"
+    store.set_uri(
+        uri,
+        {
+            "specification": spec.to_jsonable(),
+            "pack": TileScopePack.point_placements().to_jsonable(),
+        },
+    )
+    searcher = GuidedSearcher.from_uri(uri, store)
+    assert searcher.tilings == frozenset(spec.comb_classes())
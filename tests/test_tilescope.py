@@ -1,18 +1,28 @@
 import gc
+from collections import Counter, deque
 
 import pytest
 import sympy
 
 from comb_spec_searcher import CombinatorialSpecification
-from comb_spec_searcher.rule_db import RuleDBForest
+from comb_spec_searcher.class_db import ClassDB
+from comb_spec_searcher.exception import ExceededMaxtimeError
+from comb_spec_searcher.rule_db import RuleDB, RuleDBForest
 from comb_spec_searcher.strategies import ReverseRule
 from comb_spec_searcher.utils import taylor_expand
 from permuta import Av, Perm
 from tilings import GriddedPerm, Tiling
 from tilings import strategies as strat
+from tilings.checkpoint import CheckpointRuleDB, _copy, _diff, _patch
 from tilings.strategies.fusion import ComponentFusionStrategy, FusionStrategy
 from tilings.strategy_pack import TileScopePack
-from tilings.tilescope import GuidedSearcher, TileScope
+from tilings.tilescope import (
+    GuidedSearcher,
+    LimitedAssumptionTileScope,
+    ParallelTileScope,
+    PrefetchQueue,
+    TileScope,
+)
 
 point_placements = TileScopePack.point_placements()
 all_the_strategies = TileScopePack.all_the_strategies()
@@ -403,6 +413,75 @@ def forest_expansion():
     ]
 
 
+@pytest.mark.timeout(60)
+def test_parallel_tilescope():
+    serial = TileScope("132", point_placements)
+    spec = serial.auto_search(smallest=True)
+    with ParallelTileScope("132", point_placements, workers=2) as parallel:
+        assert isinstance(parallel.classqueue, PrefetchQueue)
+        assert next(parallel._upcoming_work(), None) is not None
+        parallel_spec = parallel.auto_search(smallest=True)
+    assert parallel_spec == spec
+    assert parallel.classdb.label_to_info == serial.classdb.label_to_info
+    assert list(parallel.ruledb) == list(serial.ruledb)
+    assert parallel._pool is None
+
+
+def test_checkpoint(tmp_path):
+    path = str(tmp_path / "132.checkpoint")
+    searcher = TileScope("132", point_placements)
+    # the databases are only changed for a checkpoint
+    assert type(searcher.classdb) is ClassDB
+    assert type(searcher.ruledb) is RuleDB
+    with pytest.raises(ExceededMaxtimeError):
+        searcher.auto_search(
+            checkpoint=path, checkpoint_interval=0, max_expansion_time=0
+        )
+    assert isinstance(searcher.ruledb, CheckpointRuleDB)
+    resumed = TileScope.from_checkpoint(path)
+    assert resumed.checkpoint.path == path
+    assert resumed.classdb == searcher.classdb
+    assert resumed.ruledb == searcher.ruledb
+    assert resumed.classqueue == searcher.classqueue
+    assert resumed.tried_to_verify == searcher.tried_to_verify
+    # a partly written frame is ignored
+    with open(path, "ab") as f:
+        f.write(b"\x00\x00\x00\x00\x00\x00\x01\x00partial")
+    resumed = TileScope.from_checkpoint(path)
+    assert resumed.classdb == searcher.classdb
+    spec = searcher.auto_search()
+    assert resumed.auto_search() == spec
+    with pytest.raises(TypeError):
+        LimitedAssumptionTileScope.from_checkpoint(path)
+
+
+def test_checkpoint_state_changes():
+    old = {
+        "labels": {1, 2, 3},
+        "queue": deque([4, 5, 6]),
+        "levels": (deque([1]), deque()),
+        "counts": Counter({1: 2, 3: 1}),
+        "searchers": [TileScope("12", point_placements)],
+    }
+    copied = {attr: _copy(value) for attr, value in old.items()}
+    new = old
+    new["labels"].update((4, 5))
+    new["queue"].popleft()
+    new["queue"].extend((7, 8))
+    new["levels"][1].append(2)
+    new["counts"].update((1, 4))
+    del new["counts"][3]
+    changes = {attr: _diff(copied[attr], value) for attr, value in new.items()}
+    # only the new entries are written
+    assert changes["labels"] == ("set", {4, 5}, set())
+    assert changes["queue"] == ("sequence", 1, [7, 8])
+    assert changes["counts"] == ("dict", {1: 3, 4: 1}, [3])
+    # a container of objects that can change in place is written in full
+    assert changes["searchers"] == ("value", new["searchers"])
+    patched = {attr: _patch(copied[attr], changes[attr]) for attr in copied}
+    assert patched == new
+
+
 def test_guided_searcher():
     tilescope = TileScope(
         "123", TileScopePack.point_placements().make_fusion(tracked=False)
@@ -428,3 +507,42 @@ def test_guided_searcher():
         58786,
         208012,
     ]
+    with pytest.raises(ValueError):
+        GuidedSearcher(
+            spec.comb_classes(),
+            spec.root,
+            TileScopePack.point_placements(),
+            canonical_symmetries=True,
+        )
+
+
+@pytest.mark.timeout(30)
+def test_canonical_symmetries():
+    pack = TileScopePack.point_placements().make_fusion().add_all_symmetry()
+    searcher = TileScope("123", pack)
+    searcher.auto_search()
+    canonical_searcher = TileScope("123", pack, canonical_symmetries=True)
+    spec = canonical_searcher.auto_search()
+    # only the tilings and their canonical symmetries are in the universe
+    assert len(canonical_searcher.classdb.label_to_info) < len(
+        searcher.classdb.label_to_info
+    )
+    assert canonical_searcher._canonical_labels
+    spec = spec.expand_verified()
+    assert [spec.count_objects_of_size(i) for i in range(10)] == [
+        1,
+        1,
+        2,
+        5,
+        14,
+        42,
+        132,
+        429,
+        1430,
+        4862,
+    ]
+    av = Av([Perm((0, 1, 2))])
+    for i in range(8):
+        assert set(av.of_length(i)) == set(
+            gp.patt for gp in spec.generate_objects_of_size(i)
+        )
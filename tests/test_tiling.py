@@ -1,6 +1,7 @@
 import json
 from collections import Counter
 from itertools import chain, product
+from unittest.mock import patch
 
 import pytest
 import sympy
@@ -487,6 +488,33 @@ def test_bytes(compresstil):
     )
 
 
+def test_bytes_format():
+    gp = GriddedPerm((0, 1), ((0, 0), (0, 0)))
+    tiling = Tiling(
+        obstructions=[gp],
+        requirements=[[gp], [gp, GriddedPerm((1, 0), ((0, 0), (0, 0)))]],
+        assumptions=[TrackingAssumption([gp])],
+        remove_empty_rows_and_cols=False,
+        derive_empty=False,
+        simplify=False,
+    )
+    b = tiling.to_bytes()
+    assert b[0] == Tiling.BYTES_FORMAT_VERSION
+    # the repeated gridded perm is written out once
+    assert b.count(bytes((4, 0, 1, 0, 0, 0, 0))) == 1
+    assert tiling == Tiling.from_bytes(b)
+    # values beyond a single byte
+    wide = Tiling(
+        obstructions=[GriddedPerm((0, 1), ((300, 0), (300, 70000)))],
+        requirements=[[GriddedPerm.point_perm((300, 0))]],
+        remove_empty_rows_and_cols=False,
+        derive_empty=False,
+    )
+    assert wide == Tiling.from_bytes(wide.to_bytes())
+    with pytest.raises(ValueError):
+        Tiling.from_bytes(bytes((0,)) + b[1:])
+
+
 def test_json(compresstil):
     assert compresstil == Tiling.from_json(json.dumps(compresstil.to_jsonable()))
     # For backward compatibility make sure we can load from json that don't have
@@ -652,6 +680,33 @@ def test_add_list_requirement(finite_tiling):
     )
 
 
+def test_add_obstructions_and_requirements_incrementally(compresstil):
+    new_obs = (
+        GriddedPerm((0, 1, 2), ((0, 1), (0, 1), (0, 1))),
+        GriddedPerm((0, 2, 1, 3), ((0, 0), (0, 0), (0, 0), (0, 0))),
+        GriddedPerm((0, 1, 2, 3), ((0, 1), (0, 1), (0, 1), (0, 1))),
+        GriddedPerm((1, 0), ((0, 1), (1, 1))),
+    )
+    tiling = compresstil.add_obstructions(new_obs)
+    assert tiling == Tiling(
+        compresstil.obstructions + new_obs,
+        compresstil.requirements,
+    )
+    assert GriddedPerm((0, 1, 2), ((0, 1), (0, 1), (0, 1))) in tiling.obstructions
+    assert all(
+        gp not in tiling.obstructions
+        for gp in new_obs[1:3] + compresstil.obstructions[-8::2]
+    )
+    req = (
+        GriddedPerm((0, 1), ((0, 1), (0, 1))),
+        GriddedPerm((1, 0), ((0, 0), (1, 1))),
+    )
+    for t in (compresstil, tiling):
+        assert t.add_list_requirement(req) == Tiling(
+            t.obstructions, t.requirements + (req,)
+        )
+
+
 def test_add_requirement(compresstil, factorable_tiling):
     assert compresstil.add_requirement(Perm((1, 0)), ((1, 1), (2, 0))) == Tiling(
         obstructions=(GriddedPerm((), ()),)
@@ -1676,6 +1731,44 @@ def test_find_factors(compresstil, factorable_tiling):
         factors = compresstil.find_factors(interleaving="magic")
 
 
+def test_sub_tilings(factorable_tiling):
+    def expected(tiling, cells):
+        def inside(gps):
+            return all(cell in cells for gp in gps for cell in gp.pos)
+
+        return Tiling(
+            [ob for ob in tiling.obstructions if inside([ob])],
+            [req for req in tiling.requirements if inside(req)],
+            [
+                ass.__class__(gp for gp in ass.gps if inside([gp]))
+                for ass in tiling.assumptions
+                if any(inside([gp]) for gp in ass.gps)
+            ],
+            simplify=False,
+        )
+
+    cells = sorted(factorable_tiling.active_cells)
+    partitions = [
+        [cells[:2], cells[2:4], cells[4:]],
+        [cells[::2], cells[1:2]],
+        [cells],
+    ]
+    for partition in partitions:
+        assert factorable_tiling.sub_tilings(partition) == tuple(
+            expected(factorable_tiling, part) for part in partition
+        )
+    t = factorable_tiling.add_assumption(
+        TrackingAssumption(
+            [GriddedPerm((0,), (cells[0],)), GriddedPerm((0,), (cells[-1],))]
+        )
+    )
+    partition = [cells[:2], cells[2:]]
+    sub_tilings = t.sub_tilings(partition)
+    assert sub_tilings == tuple(expected(t, part) for part in partition)
+    assert sub_tilings == tuple(t.sub_tiling(part) for part in partition)
+    assert all(len(sub_tiling.assumptions) == 1 for sub_tiling in sub_tilings)
+
+
 def test_row_and_column_separation():
     separable_t = Tiling(
         obstructions=[
@@ -2733,6 +2826,121 @@ def test_contains():
     assert GriddedPerm((0, 1), ((1, 0), (1, 0))) not in t
 
 
+def test_contains_after_preparing_properties():
+    t = Tiling(
+        [GriddedPerm((0, 1), ((0, 0),) * 2), GriddedPerm((0, 1), ((1, 1),) * 2)],
+        derive_empty=False,
+        remove_empty_rows_and_cols=False,
+        simplify=False,
+    )
+    gp = GriddedPerm((0,), ((1, 0),))
+    assert gp in t
+    assert t.dimensions == (2, 2)
+    # the point obstructions of the empty cells are added to the index
+    assert gp not in t
+
+
+def test_construction_cache():
+    cache = Tiling.construction_cache
+    obs = [
+        GriddedPerm((0, 1), ((0, 0), (0, 0))),
+        GriddedPerm((0, 1, 2), ((0, 0), (0, 0), (2, 1))),
+        GriddedPerm((1, 0), ((2, 1), (2, 1))),
+    ]
+    reqs = [[GriddedPerm((0,), ((2, 1),))]]
+    cache.clear()
+    t1 = Tiling(obs, reqs)
+    assert (cache.hits, cache.misses) == (0, 1)
+    t2 = Tiling(reversed(obs), reqs)
+    assert (cache.hits, cache.misses) == (1, 1)
+    # the cache stores bytes, and the gridded perms are built when accessed
+    assert all(isinstance(key[0], bytes) for key in cache)
+    assert "_obstructions" not in t2.__dict__
+    assert t2.to_bytes() == t1.to_bytes()
+    assert t1 == t2
+    assert t1.dimensions == t2.dimensions == (2, 2)
+    assert t2.forward_map.map_cell((2, 1)) == (1, 1)
+    assert t2.obstructions == (
+        GriddedPerm((0,), ((0, 1),)),
+        GriddedPerm((0,), ((1, 0),)),
+        GriddedPerm((0, 1), ((0, 0), (0, 0))),
+        GriddedPerm((1, 0), ((1, 1), (1, 1))),
+    )
+    assert Tiling(obs, reqs, remove_empty_rows_and_cols=False) != t1
+    assert cache.misses == 2
+    # a tiling built with the shortcuts is not served to a full construction
+    redundant_ob = GriddedPerm((0, 1, 2), ((0, 0), (0, 0), (0, 0)))
+    shortcut = Tiling(obs + [redundant_ob], already_minimized_obs=True)
+    assert redundant_ob in shortcut.obstructions
+    assert Tiling(obs + [redundant_ob]).obstructions == t2.obstructions
+    assert cache.misses == 4
+    cache.enabled = False
+    try:
+        assert Tiling(obs, reqs) == t1
+        assert (cache.hits, cache.misses) == (1, 4)
+    finally:
+        cache.enabled = True
+
+
+def test_emptiness_cache():
+    cache = Tiling.emptiness_cache
+    cache.clear()
+    obs = [
+        GriddedPerm((0, 1), ((0, 0), (0, 0))),
+        GriddedPerm((0, 1), ((0, 0), (1, 0))),
+        GriddedPerm((1, 0), ((0, 0), (1, 0))),
+    ]
+    empty = Tiling(
+        obs, [[GriddedPerm((0,), ((0, 0),))], [GriddedPerm((0,), ((1, 0),))]]
+    )
+    assert empty.is_empty()
+    assert empty.is_empty()
+    assert (cache.hits, cache.misses) == (0, 1)
+    non_empty = Tiling(
+        obs[:2], [[GriddedPerm((0,), ((0, 0),))], [GriddedPerm((0,), ((1, 0),))]]
+    )
+    assert not non_empty.is_empty()
+    assert not Tiling(non_empty.obstructions, non_empty.requirements).is_empty()
+    assert (cache.hits, cache.misses) == (1, 2)
+    assert all(isinstance(key, bytes) for key in cache)
+    # an empty tiling that was not simplified
+    unsimplified = Tiling(
+        obs,
+        [
+            [GriddedPerm((0, 1), ((0, 0), (0, 0)))],
+            [GriddedPerm((0,), ((1, 0),))],
+        ],
+        simplify=False,
+    )
+    assert unsimplified.is_empty()
+
+
+def test_is_empty_without_searching():
+    Tiling.emptiness_cache.clear()
+    points = [[GriddedPerm((0,), ((0, 0),))], [GriddedPerm((0,), ((1, 1),))]]
+    # every way of placing a point in both cells is an obstruction
+    same_row = Tiling(
+        [
+            GriddedPerm((0, 1), ((0, 0), (0, 0))),
+            GriddedPerm((0, 1), ((0, 0), (1, 0))),
+            GriddedPerm((1, 0), ((0, 0), (1, 0))),
+        ],
+        [[GriddedPerm((0,), ((0, 0),))], [GriddedPerm((0,), ((1, 0),))]],
+    )
+    forced = Tiling([GriddedPerm((0, 1), ((0, 0), (1, 1)))], points, simplify=False)
+    not_forced = Tiling(
+        [GriddedPerm((0, 1), ((0, 0), (1, 1)))],
+        [[GriddedPerm((0,), ((0, 0),)), GriddedPerm((0,), ((1, 0),))], points[1]],
+        simplify=False,
+    )
+    with patch("tilings.tiling.MinimalGriddedPerms") as mgp:
+        assert same_row.is_empty()
+        assert forced.is_empty()
+        assert not mgp.called
+        not_forced.is_empty()
+        assert mgp.called
+
+
 @pytest.mark.slow
 def test_generate_known_equinumerous_tilings():
     check_up_to = 5
@@ -0,0 +1,125 @@
+import sqlite3
+
+import pytest
+
+from permuta import Perm
+from tilings import GriddedPerm, Tiling
+from tilings.algorithms import SubclassVerificationAlgorithm
+from tilings.strategies.verification import (
+    InsertionEncodingVerificationStrategy,
+    LocallyFactorableVerificationStrategy,
+    OneByOneVerificationStrategy,
+)
+from tilings.verification_cache import (
+    VerificationCache,
+    disable_verification_cache,
+    enable_verification_cache,
+    get_verification_cache,
+    verification_cache_status,
+)
+
+
+@pytest.fixture
+def path(tmp_path):
+    yield str(tmp_path / "verified.db")
+    disable_verification_cache()
+
+
+@pytest.fixture
+def tiling():
+    return Tiling(
+        obstructions=(
+            GriddedPerm((0, 1), ((0, 0), (0, 0))),
+            GriddedPerm((0, 1), ((1, 1), (1, 1))),
+        ),
+        requirements=((GriddedPerm((0,), ((0, 0),)),),),
+    )
+
+
+def test_disabled(tiling):
+    assert get_verification_cache() is None
+    assert verification_cache_status() == "Verification cache: disabled"
+    assert LocallyFactorableVerificationStrategy().verified(tiling)
+
+
+def test_verified(path, tiling):
+    enable_verification_cache(path)
+    strategies = [
+        OneByOneVerificationStrategy(basis=[Perm((0, 1, 2))]),
+        LocallyFactorableVerificationStrategy(),
+        InsertionEncodingVerificationStrategy(),
+    ]
+    one_by_one = Tiling.from_string("123_1432")
+    expected = [
+        [strategy.verified(t) for strategy in strategies] for t in (tiling, one_by_one)
+    ]
+    cache = get_verification_cache()
+    assert (cache.hits, cache.misses, len(cache)) == (0, 6, 6)
+    assert [
+        [strategy.verified(t) for strategy in strategies] for t in (tiling, one_by_one)
+    ] == expected
+    assert (cache.hits, cache.misses) == (6, 6)
+    # the basis is part of the key of the strategy
+    OneByOneVerificationStrategy(basis=[Perm((0, 2, 1))]).verified(one_by_one)
+    assert (cache.hits, cache.misses) == (6, 7)
+
+
+def test_persistent(path, tiling):
+    enable_verification_cache(path)
+    assert LocallyFactorableVerificationStrategy().verified(tiling)
+    disable_verification_cache()
+    enable_verification_cache(path)
+    assert LocallyFactorableVerificationStrategy().verified(tiling)
+    assert get_verification_cache().hits == 1
+    assert "1 hits" in verification_cache_status()
+
+
+def test_version_change(path, tiling):
+    cache = VerificationCache(path)
+    cache.set("strategy", tiling, True)
+    cache.close()
+    assert len(VerificationCache(path)) == 1
+    connection = sqlite3.connect(path)
+    connection.execute("UPDATE meta SET value = '0.0.0' WHERE key = 'version'")
+    connection.commit()
+    connection.close()
+    cache = VerificationCache(path)
+    assert len(cache) == 0
+    assert cache.get("strategy", tiling) is None
+
+
+def test_subclasses(path):
+    tiling = Tiling(
+        obstructions=(
+            GriddedPerm((0, 1), ((0, 0), (0, 0))),
+            GriddedPerm((0, 1), ((0, 0), (1, 0))),
+            GriddedPerm((0, 1, 2), ((1, 0), (1, 0), (1, 0))),
+        ),
+        requirements=((GriddedPerm((0,), ((0, 0),)),),),
+    )
+    perms = {Perm((0, 1, 2)), Perm((0, 1, 2, 3)), Perm((1, 0))}
+    expected = SubclassVerificationAlgorithm(tiling, perms).subclasses
+    assert expected == (Perm((0, 1, 2)), Perm((0, 1, 2, 3)))
+    enable_verification_cache(path)
+    assert SubclassVerificationAlgorithm(tiling, perms).subclasses == expected
+    assert SubclassVerificationAlgorithm(tiling, perms).subclasses == expected
+    cache = get_verification_cache()
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_committed_on_set(path, tiling):
+    cache = VerificationCache(path)
+    cache.set("strategy", tiling, True)
+    assert VerificationCache(path).get("strategy", tiling) is True
+
+
+def test_locked(path, tiling):
+    cache = VerificationCache(path, timeout=0)
+    cache.set("strategy", tiling, True)
+    connection = sqlite3.connect(path)
+    connection.execute("BEGIN EXCLUSIVE")
+    cache.set("strategy", Tiling.from_string("12"), True)
+    connection.rollback()
+    connection.close()
+    assert len(cache) == 1
+    assert cache.get("strategy", tiling) is True
@@ -1,11 +1,13 @@
 from .enumeration import LocalEnumeration, MonotoneTreeEnumeration
 from .factor import Factor, FactorWithInterleaving, FactorWithMonotoneInterleaving
 from .fusion import ComponentFusion, Fusion
+from .gridded_perm_counting import GriddedPermCounter
 from .gridded_perm_generation import GriddedPermsOnTiling
 from .gridded_perm_reduction import GriddedPermReduction
 from .guess_obstructions import guess_obstructions
 from .map import RowColMap
 from .minimal_gridded_perms import MinimalGriddedPerms
+from .obstruction_index import ObstructionIndex
 from .obstruction_inferral import (
     AllObstructionInferral,
     EmptyCellInferral,
@@ -26,10 +28,12 @@ __all__ = [
     "ComponentFusion",
     "Fusion",
     "MinimalGriddedPerms",
+    "ObstructionIndex",
     "AllObstructionInferral",
     "EmptyCellInferral",
     "SubobstructionInferral",
     "ObstructionTransitivity",
+    "GriddedPermCounter",
     "GriddedPermsOnTiling",
     "GriddedPermReduction",
     "RequirementPlacement",
@@ -1,6 +1,16 @@
+import time
 from collections import defaultdict
-from itertools import chain, combinations
-from typing import TYPE_CHECKING, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+from itertools import chain
+from typing import (
+    TYPE_CHECKING,
+    Dict,
+    FrozenSet,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+)
 
 from permuta.misc import UnionFind
 from tilings import GriddedPerm
@@ -13,6 +23,30 @@ if TYPE_CHECKING:
 
 Cell = Tuple[int, int]
 ReqList = Tuple[GriddedPerm, ...]
+Components = Tuple[FrozenSet[Cell], ...]
+
+
+class FactorCounters:
+    """
+    Counters for the components of tilings, counting how many times they were
+    computed and the time spent computing them.
+    """
+
+    def __init__(self) -> None:
+        self.computed = 0
+        self.time = 0.0
+
+    def clear(self) -> None:
+        """Reset the counters."""
+        self.computed = 0
+        self.time = 0.0
+
+    def status(self) -> str:
+        """Return a string describing the counters."""
+        return (
+            f"Factor components: {self.computed:,d} computed in "
+            f"{self.time:.2f} seconds"
+        )
 
 
 class Factor:
@@ -26,13 +60,15 @@ class Factor:
     factor if they are covered by the same assumption.
     """
 
+    counters = FactorCounters()
+
     def __init__(self, tiling: "Tiling") -> None:
         self._tiling = tiling
         self._active_cells = tiling.active_cells
         nrow = tiling.dimensions[1]
         ncol = tiling.dimensions[0]
         self._cell_unionfind = UnionFind(nrow * ncol)
-        self._components: Optional[Tuple[Set[Cell], ...]] = None
+        self._components: Optional[Components] = None
         self._factors_obs_and_reqs: Optional[
             List[
                 Tuple[
@@ -69,8 +105,9 @@ class Factor:
             return
         c1_int = self._cell_to_int(c1)
         for c2 in cell_iterator:
-            c2_int = self._cell_to_int(c2)
-            self._cell_unionfind.unite(c1_int, c2_int)
+            if c2 != c1:
+                c2_int = self._cell_to_int(c2)
+                self._cell_unionfind.unite(c1_int, c2_int)
 
     def _unite_assumptions(self) -> None:
         """
@@ -107,17 +144,23 @@ class Factor:
         """
         return cell1[0] == cell2[0] or cell1[1] == cell2[1]
 
+    def _unite_rows_and_cols_of(self, cells: Iterable[Cell]) -> None:
+        """
+        Unite all the given cells that are on the same row or column.
+        """
+        rows: Dict[int, List[Cell]] = defaultdict(list)
+        cols: Dict[int, List[Cell]] = defaultdict(list)
+        for cell in cells:
+            cols[cell[0]].append(cell)
+            rows[cell[1]].append(cell)
+        for cells_in_line in chain(rows.values(), cols.values()):
+            self._unite_cells(cells_in_line)
+
     def _unite_rows_and_cols(self) -> None:
         """
         Unite all the active cell that are on the same row or column.
         """
-        cell_pair_to_unite = (
-            c
-            for c in combinations(self._active_cells, r=2)
-            if self._same_row_or_col(c[0], c[1])
-        )
-        for c1, c2 in cell_pair_to_unite:
-            self._unite_cells((c1, c2))
+        self._unite_rows_and_cols_of(self._active_cells)
 
     def _unite_all(self) -> None:
         """
@@ -129,20 +172,24 @@ class Factor:
         self._unite_assumptions()
         self._unite_rows_and_cols()
 
-    def get_components(self) -> Tuple[Set[Cell], ...]:
+    def get_components(self) -> Components:
         """
         Returns the tuple of all the components. Each component is set of
         cells.
         """
         if self._components is not None:
             return self._components
+        start = time.perf_counter()
         self._unite_all()
-        all_components: Dict[Cell, Set[Cell]] = defaultdict(set)
+        all_components: Dict[Cell, List[Cell]] = defaultdict(list)
         for cell in self._active_cells:
             rep = self._get_cell_representative(cell)
-            all_components[rep].add(cell)
-        self._components = tuple(all_components.values())
-        return self._components
+            all_components[rep].append(cell)
+        components = tuple(map(frozenset, all_components.values()))
+        Factor.counters.computed += 1
+        Factor.counters.time += time.perf_counter() - start
+        self._components = components
+        return components
 
     def _get_factors_obs_and_reqs(
         self,
@@ -159,27 +206,35 @@ class Factor:
             return self._factors_obs_and_reqs
         if self._tiling.is_empty():
             return [((GriddedPerm((), []),), tuple(), tuple())]
-        factors = []
-        for component in self.get_components():
-            obstructions = tuple(
-                ob for ob in self._tiling.obstructions if ob.pos[0] in component
-            )
-            requirements = tuple(
-                req for req in self._tiling.requirements if req[0].pos[0] in component
-            )
-            # TODO: consider skew/sum assumptions
-            assumptions = tuple(
-                ass.__class__(gp for gp in ass.gps if gp.pos[0] in component)
-                for ass in self._tiling.assumptions
-            )
-            factors.append(
-                (
-                    obstructions,
-                    requirements,
-                    tuple(set(ass for ass in assumptions if ass.gps)),
-                )
-            )
-        self._factors_obs_and_reqs = factors
+        components = self.get_components()
+        component_of = {
+            cell: idx for idx, component in enumerate(components) for cell in component
+        }
+        obstructions: List[List[GriddedPerm]] = [[] for _ in components]
+        requirements: List[List[ReqList]] = [[] for _ in components]
+        for ob in self._tiling.obstructions:
+            idx = component_of.get(ob.pos[0])
+            if idx is not None:
+                obstructions[idx].append(ob)
+        for req in self._tiling.requirements:
+            idx = component_of.get(req[0].pos[0])
+            if idx is not None:
+                requirements[idx].append(req)
+        # TODO: consider skew/sum assumptions
+        assumptions: List[List[TrackingAssumption]] = [[] for _ in components]
+        for ass in self._tiling.assumptions:
+            ass_gps: List[List[GriddedPerm]] = [[] for _ in components]
+            for gp in ass.gps:
+                idx = component_of.get(gp.pos[0])
+                if idx is not None:
+                    ass_gps[idx].append(gp)
+            for idx, gps in enumerate(ass_gps):
+                if gps:
+                    assumptions[idx].append(ass.__class__(gps))
+        self._factors_obs_and_reqs = [
+            (tuple(obs), tuple(reqs), tuple(set(asses)))
+            for obs, reqs, asses in zip(obstructions, requirements, assumptions)
+        ]
         return self._factors_obs_and_reqs
 
     def factorable(self) -> bool:
@@ -245,17 +300,11 @@ class FactorWithMonotoneInterleaving(Factor):
 
         Override `Factor._unite_rows_and_cols`.
         """
-        cell_pair_to_unite = (
-            c
-            for c in combinations(self._active_cells, r=2)
-            if (
-                self._same_row_or_col(c[0], c[1])
-                and not self._tiling.is_monotone_cell(c[0])
-                and not self._tiling.is_monotone_cell(c[1])
-            )
+        self._unite_rows_and_cols_of(
+            cell
+            for cell in self._active_cells
+            if not self._tiling.is_monotone_cell(cell)
         )
-        for c1, c2 in cell_pair_to_unite:
-            self._unite_cells((c1, c2))
 
 
 class FactorWithInterleaving(Factor):
@@ -12,9 +12,11 @@ from typing import (
     Iterator,
     List,
     Optional,
+    Set,
     Tuple,
 )
 
+from permuta import Perm
 from tilings.assumptions import (
     ComponentAssumption,
     SkewComponentAssumption,
@@ -79,6 +81,34 @@ class Fusion:
         ], "The only valid isolation levels are None, 'noninteracting', and 'isolated'."
         self._fused_tiling: Optional["Tiling"] = None
 
+    @staticmethod
+    def candidate_rows_and_cols(tiling: "Tiling") -> Tuple[List[int], List[int]]:
+        """
+        Return the rows and the columns of the tiling that might be fusable
+        with the next one.
+
+        For the obstructions to be fusable, every obstruction in a single row
+        must also be an obstruction when it is moved to the other row, as
+        otherwise its fused gridded perm is not counted once for each way of
+        unfusing it. The same holds for columns, and the obstructions in
+        a single row and in a single column are found in one pass.
+        """
+        cols, rows = tiling.dimensions
+        in_row: List[Set[Tuple[Perm, Tuple[int, ...]]]] = [set() for _ in range(rows)]
+        in_col: List[Set[Tuple[Perm, Tuple[int, ...]]]] = [set() for _ in range(cols)]
+        for ob in tiling.obstructions:
+            if not ob.len:
+                continue
+            xs, ys = zip(*ob.pos)
+            if ys.count(ys[0]) == ob.len:
+                in_row[ys[0]].add((ob.patt, xs))
+            if xs.count(xs[0]) == ob.len:
+                in_col[xs[0]].add((ob.patt, ys))
+        return (
+            [idx for idx in range(rows - 1) if in_row[idx] == in_row[idx + 1]],
+            [idx for idx in range(cols - 1) if in_col[idx] == in_col[idx + 1]],
+        )
+
     def fuse_gridded_perm(self, gp: GriddedPerm) -> GriddedPerm:
         """
         Fuse the gridded permutation `gp`.
@@ -0,0 +1,322 @@
+import multiprocessing
+from collections import Counter
+from functools import partial
+from itertools import accumulate
+from typing import TYPE_CHECKING, Dict, FrozenSet, List, Optional, Sequence, Tuple
+
+from tilings.assumptions import ComponentAssumption
+from tilings.griddedperm import GriddedPerm
+
+from .gridded_perm_generation import ROOTS_PER_WORKER, GriddedPermsOnTiling, Root
+from .minimal_gridded_perms import MinimalGriddedPerms
+
+if TYPE_CHECKING:
+    from tilings import Tiling
+    from tilings.assumptions import TrackingAssumption
+
+__all__ = ["GriddedPermCounter"]
+
+Cell = Tuple[int, int]
+# The order in which the points of a pattern are matched. For each point, its
+# cell, the steps that matched the closest points of the pattern to the left
+# and right, and the steps that matched the points with the closest smaller and
+# larger values, or -1 if there are none.
+Plan = Tuple[Tuple[Cell, int, int, int, int], ...]
+
+
+def _plan(gp: GriddedPerm, forced: int = -1) -> Plan:
+    """
+    Return the plan for matching the points of gp left to right, or if forced
+    is given, starting with the point forced, then the points to its left
+    going left and then the points to its right.
+    """
+    if forced == -1:
+        order = list(range(len(gp)))
+    else:
+        order = [forced, *range(forced - 1, -1, -1), *range(forced + 1, len(gp))]
+    res = []
+    for step, k in enumerate(order):
+        done = order[:step]
+        left = [j for j in done if j < k]
+        right = [j for j in done if j > k]
+        below = [j for j in done if gp.patt[j] < gp.patt[k]]
+        above = [j for j in done if gp.patt[j] > gp.patt[k]]
+        res.append(
+            (
+                gp.pos[k],
+                order.index(max(left)) if left else -1,
+                order.index(min(right)) if right else -1,
+                order.index(max(below, key=gp.patt.__getitem__)) if below else -1,
+                order.index(min(above, key=gp.patt.__getitem__)) if above else -1,
+            )
+        )
+    return tuple(res)
+
+
+class GridState:
+    """
+    The values and cells of a gridded perm that is changed in place, with the
+    number of points in each column, row and cell, and the index of the first
+    point in each column.
+    """
+
+    __slots__ = ("values", "cells", "col_count", "row_count", "cell_count", "colstart")
+
+    def __init__(self, gp: GriddedPerm, dimensions: Cell, active_cells: Sequence[Cell]):
+        width, height = dimensions
+        self.values = list(gp.patt)
+        self.cells = list(gp.pos)
+        self.col_count = [0 for _ in range(width)]
+        self.row_count = [0 for _ in range(height)]
+        self.cell_count = {cell: 0 for cell in active_cells}
+        for x, y in gp.pos:
+            self.col_count[x] += 1
+            self.row_count[y] += 1
+            self.cell_count[(x, y)] += 1
+        self.colstart = list(accumulate(self.col_count, initial=0))
+
+    def insert(self, idx: int, val: int, cell: Cell) -> None:
+        values = self.values
+        values[:] = [v + 1 if v >= val else v for v in values]
+        values.insert(idx, val)
+        self.cells.insert(idx, cell)
+        self.col_count[cell[0]] += 1
+        self.row_count[cell[1]] += 1
+        self.cell_count[cell] += 1
+        self.colstart = list(accumulate(self.col_count, initial=0))
+
+    def remove(self, idx: int, cell: Cell) -> None:
+        values = self.values
+        val = values.pop(idx)
+        values[:] = [v - 1 if v > val else v for v in values]
+        self.cells.pop(idx)
+        self.col_count[cell[0]] -= 1
+        self.row_count[cell[1]] -= 1
+        self.cell_count[cell] -= 1
+        self.colstart = list(accumulate(self.col_count, initial=0))
+
+
+def _search(
+    plan: Plan, step: int, chosen: List[int], state: GridState, skip: int
+) -> bool:
+    """
+    Return True if the points of the plan from step on can be matched to
+    points of the state other than skip, given the points chosen for the
+    earlier steps.
+    """
+    if step == len(plan):
+        return True
+    cell, left, right, below, above = plan[step]
+    low = state.values[chosen[below]] if below >= 0 else -1
+    high = state.values[chosen[above]] if above >= 0 else len(state.values)
+    start = state.colstart[cell[0]]
+    if left >= 0 and chosen[left] >= start:
+        start = chosen[left] + 1
+    end = state.colstart[cell[0] + 1]
+    if right >= 0 and chosen[right] < end:
+        end = chosen[right]
+    for i in range(start, end):
+        if i != skip and state.cells[i] == cell and low < state.values[i] < high:
+            chosen[step] = i
+            if _search(plan, step + 1, chosen, state, skip):
+                return True
+    return False
+
+
+_WORKER_COUNTER: Optional["GriddedPermCounter"] = None
+
+
+def _init_worker(tiling: "Tiling", assumptions: Sequence["TrackingAssumption"]) -> None:
+    # pylint: disable=global-statement
+    global _WORKER_COUNTER
+    _WORKER_COUNTER = GriddedPermCounter(tiling, assumptions)
+
+
+def _count_in_worker(root: Root, size: int) -> List[Counter]:
+    assert _WORKER_COUNTER is not None
+    return _WORKER_COUNTER.count_subtree(root, size)
+
+
+class GriddedPermCounter:
+    """
+    Count the gridded permutations on a tiling without building them.
+
+    The gridded permutations are built in the same way as by
+    GriddedPermsOnTiling, by inserting points into the minimal gridded perms
+    and only keeping the insertions into their canonical parent, but depth
+    first on a single list of values and cells that is changed in place.
+    After inserting a point only the occurrences of the obstructions that use
+    the new point are looked for, as the parent avoids the obstructions.
+    """
+
+    def __init__(
+        self,
+        tiling: "Tiling",
+        assumptions: Sequence["TrackingAssumption"] = (),
+    ):
+        self._tiling = tiling
+        self._minimal_gps = MinimalGriddedPerms(
+            tiling.obstructions, tiling.requirements
+        )
+        self._obstruction_index = self._minimal_gps.obstruction_index
+        self._active_cells = sorted(tiling.active_cells)
+        self._obstruction_plans: Dict[Tuple[GriddedPerm, Cell], Tuple[Plan, ...]] = {}
+        self._reqs_by_cell: Dict[Cell, List[Tuple[Plan, ...]]] = {
+            cell: [
+                tuple(_plan(req) for req in reqlist)
+                for reqlist in tiling.requirements
+                if any(req.occupies(cell) for req in reqlist)
+            ]
+            for cell in tiling.active_cells
+        }
+        # the cells of the assumptions on points that can be counted from the
+        # number of points in each cell, otherwise None
+        self._assumptions = tuple(assumptions)
+        self._assumption_cells = tuple(
+            (
+                None
+                if isinstance(ass, ComponentAssumption)
+                or any(len(gp) != 1 for gp in ass.gps)
+                else tuple(gp.pos[0] for gp in ass.gps)
+            )
+            for ass in self._assumptions
+        )
+        self._state = GridState(GriddedPerm(), tiling.dimensions, ())
+
+    def _get_obstruction_plans(self, ob: GriddedPerm, cell: Cell) -> Tuple[Plan, ...]:
+        """Return the plans for matching ob starting from each point in cell."""
+        res = self._obstruction_plans.get((ob, cell))
+        if res is None:
+            res = tuple(_plan(ob, k) for k, c in enumerate(ob.pos) if c == cell)
+            self._obstruction_plans[(ob, cell)] = res
+        return res
+
+    def count(self, size: int, workers: int = 1) -> List[int]:
+        """Return the number of gridded perms of each length up to size."""
+        res = [0 for _ in range(size + 1)]
+        for length, counter in enumerate(self.count_by_parameters(size, workers)):
+            res[length] = sum(counter.values())
+        return res
+
+    def count_by_parameters(self, size: int, workers: int = 1) -> List[Counter]:
+        """
+        Return for each length up to size a Counter of the number of gridded
+        perms with each tuple of values of the assumptions.
+
+        If workers is more than one, the gridded perms are split into subtrees
+        which are counted in a pool of that many processes.
+        """
+        res: List[Counter] = [Counter() for _ in range(size + 1)]
+        if workers > 1:
+            above, roots = GriddedPermsOnTiling(self._tiling).roots(
+                size, ROOTS_PER_WORKER * workers
+            )
+            for gp in above:
+                self._start(gp)
+                self._record(res)
+            with multiprocessing.Pool(
+                workers,
+                initializer=_init_worker,
+                initargs=(self._tiling, self._assumptions),
+            ) as pool:
+                for counts in pool.imap_unordered(
+                    partial(_count_in_worker, size=size), roots
+                ):
+                    for counter, subtree_counter in zip(res, counts):
+                        counter.update(subtree_counter)
+            return res
+        for mgp in self._minimal_gps.minimal_gridded_perms():
+            if len(mgp) > size:
+                break
+            self._start(mgp)
+            if self._is_canonical(-1):
+                self._record(res)
+                if len(mgp) < size:
+                    self._count(-1, frozenset(mgp.pos), res, size)
+        return res
+
+    def count_subtree(self, root: Root, size: int) -> List[Counter]:
+        """
+        Return for each length up to size a Counter of the number of gridded
+        perms in the subtree of the root with each tuple of values of the
+        assumptions.
+        """
+        res: List[Counter] = [Counter() for _ in range(size + 1)]
+        gp, last_idx = root
+        self._start(gp)
+        self._record(res)
+        if len(gp) < size:
+            self._count(last_idx, frozenset(gp.pos), res, size)
+        return res
+
+    def _start(self, gp: GriddedPerm) -> None:
+        """Set the state to the gridded perm gp."""
+        self._state = GridState(gp, self._tiling.dimensions, self._active_cells)
+
+    def _record(self, res: List[Counter]) -> None:
+        params = tuple(
+            self._assumption_value(ass, cells)
+            for ass, cells in zip(self._assumptions, self._assumption_cells)
+        )
+        res[len(self._state.values)][params] += 1
+
+    def _assumption_value(self, ass: "TrackingAssumption", cells) -> int:
+        if cells is None:
+            gp = GriddedPerm(self._state.values, self._state.cells)
+            return ass.get_value(gp)
+        return sum(self._state.cell_count.get(cell, 0) for cell in cells)
+
+    def _count(
+        self, last_idx: int, occupied: FrozenSet[Cell], res: List[Counter], size: int
+    ) -> None:
+        """
+        Count the descendants of the gridded perm in the state, whose point
+        at last_idx was the last inserted.
+        """
+        state = self._state
+        length = len(state.values) + 1
+        rowstart = list(accumulate(state.row_count, initial=0))
+        for cell in self._active_cells:
+            x, y = cell
+            children_occupied = occupied if cell in occupied else occupied | {cell}
+            plans = [
+                plan
+                for ob in self._obstruction_index.relevant_obstructions_by_cell(
+                    children_occupied, cell
+                )
+                if len(ob) <= length
+                for plan in self._get_obstruction_plans(ob, cell)
+            ]
+            for idx in range(
+                max(state.colstart[x], last_idx + 1), state.colstart[x + 1] + 1
+            ):
+                for val in range(rowstart[y], rowstart[y + 1] + 1):
+                    state.insert(idx, val, cell)
+                    if not self._contains_obstruction(plans, idx) and (
+                        self._is_canonical(idx)
+                    ):
+                        self._record(res)
+                        if length < size:
+                            self._count(idx, children_occupied, res, size)
+                    state.remove(idx, cell)
+
+    def _contains_obstruction(self, plans: List[Plan], idx: int) -> bool:
+        """Return True if an obstruction occurs using the point at idx."""
+        state = self._state
+        chosen = [idx for _ in state.values]
+        return any(_search(plan, 1, chosen, state, -1) for plan in plans)
+
+    def _is_canonical(self, idx: int) -> bool:
+        """
+        Return True if no point to the right of idx can be removed leaving a
+        gridded perm that contains the requirements.
+        """
+        state = self._state
+        chosen = [0 for _ in state.values]
+        for j in range(len(state.cells) - 1, idx, -1):
+            if all(
+                any(_search(plan, 0, chosen, state, j) for plan in reqlist)
+                for reqlist in self._reqs_by_cell[state.cells[j]]
+            ):
+                return False
+        return True
@@ -1,5 +1,9 @@
+import multiprocessing
+from collections import deque
+from functools import partial
 from heapq import heapify, heappop, heappush
-from typing import TYPE_CHECKING, Dict, List, Optional, Set, Tuple
+from itertools import takewhile
+from typing import TYPE_CHECKING, Deque, Dict, Iterator, List, Optional, Set, Tuple
 
 from tilings.griddedperm import GriddedPerm
 
@@ -9,6 +13,24 @@ if TYPE_CHECKING:
     from tilings import Tiling
 
 Cell = Tuple[int, int]
+# a gridded perm with the index of its last inserted point, or -1
+Root = Tuple[GriddedPerm, int]
+
+# the number of subtrees to split the gridded perms into for each worker
+ROOTS_PER_WORKER = 16
+
+_WORKER_GPS: Optional["GriddedPermsOnTiling"] = None
+
+
+def _init_worker(tiling: "Tiling", yield_non_minimal: bool) -> None:
+    # pylint: disable=global-statement
+    global _WORKER_GPS
+    _WORKER_GPS = GriddedPermsOnTiling(tiling, yield_non_minimal)
+
+
+def _subtree_in_worker(root: Root, size: int) -> List[GriddedPerm]:
+    assert _WORKER_GPS is not None
+    return list(_WORKER_GPS.subtree(root, size))
 
 
 class QueuePacket:
@@ -30,6 +52,13 @@ class GriddedPermsOnTiling:
 
     The gridded permutations yielded in order of size, shortest first. They are
     built by inserting points into the minimal gridded permutations.
+
+    Each gridded permutation that is not minimal has a canonical parent, found
+    by removing its rightmost point whose removal leaves a gridded permutation
+    on the tiling. Only the insertions that are the inverse of this are kept,
+    so every gridded permutation is built exactly once, and the gridded
+    permutations can be built one length at a time without remembering those
+    already yielded.
     """
 
     def __init__(self, tiling: "Tiling", yield_non_minimal: bool = False):
@@ -39,6 +68,14 @@ class GriddedPermsOnTiling:
         )
         self._yield_non_minimal = yield_non_minimal
         self._yielded_gridded_perms: Set[GriddedPerm] = set()
+        self._reqs_by_cell: Dict[Cell, List[Tuple[GriddedPerm, ...]]] = {
+            cell: [
+                reqlist
+                for reqlist in tiling.requirements
+                if any(req.occupies(cell) for req in reqlist)
+            ]
+            for cell in tiling.active_cells
+        }
 
     def prepare_queue(self, size: int) -> List[QueuePacket]:
         queue: List[QueuePacket] = []
@@ -53,46 +90,190 @@ class GriddedPermsOnTiling:
                 break
         return queue
 
-    def gridded_perms(self, size: int, place_at_most: Optional[int] = None):
-        if place_at_most is None:
-            place_at_most = size
+    def gridded_perms(
+        self, size: int, place_at_most: Optional[int] = None, workers: int = 1
+    ) -> Iterator[GriddedPerm]:
+        """
+        Yield the gridded perms on the tiling of length at most size.
+
+        If place_at_most is given, only the gridded perms found by inserting
+        at most that many points into a minimal gridded perm are yielded.
+
+        If workers is more than one, the subtrees are built in a pool of
+        that many processes, and the gridded perms are no longer yielded in
+        order of size.
+        """
+        if place_at_most is None and workers > 1:
+            yield from self._parallel_gridded_perms(size, workers)
+        elif place_at_most is None:
+            for level in self.levels(size):
+                yield from level
+        else:
+            yield from self._placed_gridded_perms(size, place_at_most)
+
+    def _parallel_gridded_perms(self, size: int, workers: int) -> Iterator[GriddedPerm]:
+        """
+        Yield the gridded perms on the tiling of length at most size, building
+        the subtrees in a pool of workers processes.
+        """
+        above, roots = self.roots(size, ROOTS_PER_WORKER * workers)
+        yield from above
+        with multiprocessing.Pool(
+            workers,
+            initializer=_init_worker,
+            initargs=(self._tiling, self._yield_non_minimal),
+        ) as pool:
+            for gps in pool.imap_unordered(
+                partial(_subtree_in_worker, size=size), roots
+            ):
+                yield from gps
+
+    def _placed_gridded_perms(
+        self, size: int, place_at_most: int
+    ) -> Iterator[GriddedPerm]:
+        """
+        Yield the gridded perms on the tiling of length at most size found by
+        inserting at most place_at_most points into a minimal gridded perm.
+        """
         queue = self.prepare_queue(size)
         work_packets_done: Set[Tuple[GriddedPerm, Cell]] = set()
         while queue:
             packet = heappop(queue)
-            gp, mindices = (
-                packet.gp,
-                packet.mindices,
-            )
-            if len(gp) <= size:
-                if gp not in self._yielded_gridded_perms:
-                    self._yielded_gridded_perms.add(gp)
-                    yield gp
-            else:
+            if len(packet.gp) > size:
                 return
-            if packet.placed >= place_at_most:
+            if packet.gp not in self._yielded_gridded_perms:
+                self._yielded_gridded_perms.add(packet.gp)
+                yield packet.gp
+            if packet.placed < place_at_most:
+                for next_packet in self._next_packets(packet, work_packets_done):
+                    heappush(queue, next_packet)
+
+    def _next_packets(
+        self, packet: QueuePacket, work_packets_done: Set[Tuple[GriddedPerm, Cell]]
+    ) -> Iterator[QueuePacket]:
+        """
+        Yield the packets found by inserting a point into the gridded perm of
+        the packet in a cell that is not before the last cell of the packet.
+        """
+        gp, mindices = packet.gp, packet.mindices
+        for cell in self._tiling.active_cells:
+            if cell < packet.last_cell:
                 continue
-            for cell in self._tiling.active_cells:
-                if cell < packet.last_cell:
+            for idx, nextgp in self._minimal_gps.insert_point(
+                gp, cell, mindices.get(cell, 0)
+            ):
+                key = (nextgp, cell)
+                if key in work_packets_done:
                     continue
-                for idx, nextgp in self._minimal_gps.insert_point(
-                    gp, cell, mindices.get(cell, 0)
+                work_packets_done.add(key)
+                if not self._minimal_gps.satisfies_obstructions(
+                    nextgp, must_contain=cell
                 ):
-                    key = (nextgp, cell)
-                    if key in work_packets_done:
-                        continue
-                    work_packets_done.add(key)
-                    if not self._minimal_gps.satisfies_obstructions(
-                        nextgp, must_contain=cell
-                    ):
-                        continue
-                    next_mindices = {
-                        c: i if i <= idx else i + 1
-                        for c, i in mindices.items()
-                        if c != cell
-                    }
-                    next_mindices[cell] = idx + 1
-                    heappush(
-                        queue,
-                        QueuePacket(nextgp, cell, next_mindices, packet.placed + 1),
-                    )
+                    continue
+                next_mindices = {
+                    c: i if i <= idx else i + 1
+                    for c, i in mindices.items()
+                    if c != cell
+                }
+                next_mindices[cell] = idx + 1
+                yield QueuePacket(nextgp, cell, next_mindices, packet.placed + 1)
+
+    def levels(self, size: int) -> Iterator[List[GriddedPerm]]:
+        """
+        Yield the lists of gridded perms on the tiling of each length up to
+        size. Only the list of the current length and the one being built are
+        kept in memory.
+        """
+        minimal_gps = self._minimal_gps.minimal_gridded_perms(
+            yield_non_minimal=self._yield_non_minimal
+        )
+        next_mgp = next(minimal_gps, None)
+        # the gridded perms of the current length with the index of the point
+        # that was last inserted, or -1 for the minimal gridded perms
+        level: List[Tuple[GriddedPerm, int]] = []
+        for length in range(size + 1):
+            while next_mgp is not None and len(next_mgp) == length:
+                if self._deletable_index(next_mgp, -1) is None:
+                    level.append((next_mgp, -1))
+                next_mgp = next(minimal_gps, None)
+            if not level and (next_mgp is None or len(next_mgp) > size):
+                return
+            yield [gp for gp, _ in level]
+            if length < size:
+                level = [
+                    child
+                    for gp, last_idx in level
+                    for child in self._children(gp, last_idx)
+                ]
+
+    def roots(self, size: int, min_roots: int) -> Tuple[List[GriddedPerm], List[Root]]:
+        """
+        Split the gridded perms of length at most size into at least
+        min_roots subtrees, if there are enough gridded perms. Return the
+        gridded perms that are in none of the subtrees and the roots of the
+        subtrees. Every gridded perm is in exactly one of these.
+        """
+        minimal_gps = takewhile(
+            lambda mgp: len(mgp) <= size,
+            self._minimal_gps.minimal_gridded_perms(
+                yield_non_minimal=self._yield_non_minimal
+            ),
+        )
+        roots: Deque[Root] = deque(
+            (mgp, -1) for mgp in minimal_gps if self._deletable_index(mgp, -1) is None
+        )
+        above: List[GriddedPerm] = []
+        leaves: List[Root] = []
+        while roots and len(roots) + len(leaves) < min_roots:
+            gp, last_idx = roots.popleft()
+            if len(gp) == size:
+                leaves.append((gp, last_idx))
+            else:
+                above.append(gp)
+                roots.extend(self._children(gp, last_idx))
+        return above, leaves + list(roots)
+
+    def subtree(self, root: Root, size: int) -> Iterator[GriddedPerm]:
+        """
+        Yield the gridded perms of length at most size whose canonical
+        parents lead to the root, depth first.
+        """
+        gp, last_idx = root
+        yield gp
+        if len(gp) < size:
+            for child in self._children(gp, last_idx):
+                yield from self.subtree(child, size)
+
+    def _children(
+        self, gp: GriddedPerm, last_idx: int
+    ) -> Iterator[Tuple[GriddedPerm, int]]:
+        """
+        Yield the gridded perms whose canonical parent is gp, with the index
+        of the inserted point. The points are only inserted to the right of
+        last_idx: removing the last inserted point of gp from a child with a
+        point inserted at or before last_idx leaves the parent of gp with a
+        point added, which still contains the requirements, so that point is
+        a removable point to the right of the inserted one and the canonical
+        parent of the child is not gp.
+        """
+        for cell in self._tiling.active_cells:
+            for idx, nextgp in self._minimal_gps.insert_point(gp, cell, last_idx + 1):
+                if self._minimal_gps.satisfies_obstructions(
+                    nextgp, must_contain=cell
+                ) and (self._deletable_index(nextgp, idx) is None):
+                    yield nextgp, idx
+
+    def _deletable_index(self, gp: GriddedPerm, idx: int) -> Optional[int]:
+        """
+        Return the index of a point to the right of idx whose removal from gp
+        leaves a gridded perm that contains the requirements, or None if
+        there is no such point.
+        """
+        for j in range(len(gp) - 1, idx, -1):
+            reqlists = self._reqs_by_cell[gp.pos[j]]
+            if not reqlists:
+                return j
+            subgp = gp.remove_point(j)
+            if all(subgp.contains(*reqlist) for reqlist in reqlists):
+                return j
+        return None
@@ -5,6 +5,7 @@ from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
 
 from ..griddedperm import GriddedPerm
 from .minimal_gridded_perms import MinimalGriddedPerms
+from .obstruction_index import ObstructionIndex
 
 Cell = Tuple[int, int]
 Requirement = Tuple[GriddedPerm, ...]
@@ -18,8 +19,12 @@ class GriddedPermReduction:
         sorted_input: bool = False,
         already_minimized_obs: bool = False,
         manual: bool = False,
+        already_minimized_reqs: Iterable[Requirement] = (),
     ):
         # Only using MGP for typing purposes.
+        # The requirements known not to imply any obstructions that are not
+        # already implied by the current obstructions.
+        self._minimized_reqs: Set[Requirement] = set(already_minimized_reqs)
         if sorted_input:
             self._obstructions = obstructions
             self._requirements = requirements
@@ -82,7 +87,11 @@ class GriddedPermReduction:
         Return the obstructions which have some factors removed due to containing gp.
         """
         cleaned_obs: Set[GriddedPerm] = set()
+        gp_cells = frozenset(gp.pos)
         for ob in obstructions:
+            # a factor can only be implied by gp if it only uses cells of gp
+            if gp_cells.isdisjoint(ob.pos):
+                continue
             cells_to_remove: Set[Cell] = set()
             for factor in ob.factors():
                 if self._griddedperm_implied_by_requirement(factor, (gp,)):
@@ -101,6 +110,8 @@ class GriddedPermReduction:
         changed = False
         new_obs: Set[GriddedPerm] = set()
         for requirement in self.requirements:
+            if requirement in self._minimized_reqs:
+                continue
             cleaned_obs = tuple(
                 tuple(
                     GriddedPermReduction._minimize(
@@ -123,6 +134,7 @@ class GriddedPermReduction:
             new_obs.update(implied_obs)
         if new_obs:
             changed = True
+            self._minimized_reqs.clear()
             self._obstructions = tuple(
                 sorted(
                     GriddedPermReduction._minimize(self._obstructions + tuple(new_obs))
@@ -257,6 +269,7 @@ class GriddedPermReduction:
     ) -> List[Requirement]:
         if obstructions is None:
             obstructions = self._obstructions
+        index = ObstructionIndex(obstructions)
         res: List[Requirement] = []
         for requirement in requirements:
             # If any gridded permutation in list is empty then you vacuously
@@ -264,9 +277,7 @@ class GriddedPermReduction:
             if not all(requirement):
                 continue
             cleanreq = tuple(
-                gp
-                for gp in GriddedPermReduction._minimize(requirement)
-                if gp.avoids(*obstructions)
+                index.avoiders(GriddedPermReduction._minimize(requirement))
             )
             # If cleanreq is empty, then can not contain this requirement so
             # the tiling is empty.
@@ -343,12 +354,14 @@ class GriddedPermReduction:
         if not sizes:
             return tuple()
         minimal_perms = set(perms_by_size[sizes[0]])
+        index = ObstructionIndex(minimal_perms)
         for size in sizes[1:]:
             next_layer = set()
             for gp in perms_by_size[size]:
-                if gp.avoids(*minimal_perms):
+                if index.avoided_by(gp):
                     next_layer.add(gp)
             minimal_perms |= next_layer
+            index.add(*next_layer)
         return tuple(minimal_perms)
 
     @staticmethod
@@ -5,6 +5,9 @@ from typing import Dict, FrozenSet, Iterator, List, Optional, Set, Tuple
 
 from permuta import Perm
 from tilings import GriddedPerm
+from tilings.misc import LRUCache
+
+from .obstruction_index import ObstructionIndex
 
 __all__ = ["MinimalGriddedPerms"]
 
@@ -34,22 +37,75 @@ class QueuePacket:
 
 
 class MinimalGriddedPerms:
+    """
+    Find the minimal gridded perms on the tiling with the given obstructions
+    and requirements.
+
+    The obstruction index, requirements up to a cell, localised patterns,
+    maximum cell counts and upward closures only depend on the gridded perms
+    they are keyed on, and not on the tiling. They are computed when needed
+    and stored in LRU caches shared by all instances, so that the tilings
+    created by a strategy reuse each other's work. Each cache is bounded by
+    the number of gridded perms (or cells) it stores, counting the most that
+    the relevant obstructions cached by an obstruction index can hold, and its
+    status is shown by `MinimalGriddedPerms.cache_status`.
+    """
+
+    obstruction_indices: LRUCache[ObstructionIndex] = LRUCache(
+        "Obstruction index", maxsize=2**19, sizeof=ObstructionIndex.max_size
+    )
+    requirements_up_to_cell: LRUCache[GPTuple] = LRUCache(
+        "Requirements up to cell", maxsize=2**17, sizeof=len
+    )
+    localised_patts: LRUCache[GPTuple] = LRUCache(
+        "Localised patterns", maxsize=2**17, sizeof=len
+    )
+    max_cell_counts: LRUCache[Dict[Cell, int]] = LRUCache(
+        "Maximum cell counts", maxsize=2**17, sizeof=len
+    )
+    upward_closures: LRUCache[GPTuple] = LRUCache(
+        "Upward closure", maxsize=2**17, sizeof=len
+    )
+
     def __init__(self, obstructions: GPTuple, requirements: Reqs):
         self.obstructions = obstructions
         self.requirements = requirements
-        self.relevant_obstructions: Dict[FrozenSet[Cell], GPTuple] = {}
+        self.obstruction_index = self.get_obstruction_index(obstructions)
         self.relevant_requirements: Dict[FrozenSet[Cell], Reqs] = {}
-        self.relevant_obstructions_by_cell: Dict[
-            Tuple[Cell, FrozenSet[Cell]], GPTuple
-        ] = {}
-        self.requirements_up_to_cell: Dict[Tuple[Cell, GPTuple], GPTuple] = {}
-        # Delay computing until needed - these could all be stored on
-        # MinimalGriddedPerms, as none of these are tiling specific.
-        self.localised_patts: Dict[Tuple[Cell, GPTuple], GPTuple] = {}
-        self.max_cell_counts: Dict[GPTuple, Dict[Cell, int]] = {}
-        self.upward_closures: Dict[GPTuple, GPTuple] = {}
         self.known_patts: Dict[GriddedPerm, Set[GriddedPerm]] = defaultdict(set)
 
+    @staticmethod
+    def caches() -> Tuple[LRUCache, ...]:
+        """Return the caches shared by all instances."""
+        return (
+            MinimalGriddedPerms.obstruction_indices,
+            MinimalGriddedPerms.requirements_up_to_cell,
+            MinimalGriddedPerms.localised_patts,
+            MinimalGriddedPerms.max_cell_counts,
+            MinimalGriddedPerms.upward_closures,
+        )
+
+    @staticmethod
+    def cache_status() -> str:
+        """Return a string describing the usage of the shared caches."""
+        return "\n".join(cache.status() for cache in MinimalGriddedPerms.caches())
+
+    @staticmethod
+    def clear_caches() -> None:
+        """Remove all the values from the shared caches."""
+        for cache in MinimalGriddedPerms.caches():
+            cache.clear()
+
+    @staticmethod
+    def get_obstruction_index(obstructions: GPTuple) -> ObstructionIndex:
+        """Return the index of the obstructions."""
+        obstructions = tuple(obstructions)
+        res = MinimalGriddedPerms.obstruction_indices.get(obstructions)
+        if res is None:
+            res = ObstructionIndex(obstructions)
+            MinimalGriddedPerms.obstruction_indices.set(obstructions, res)
+        return res
+
     def get_requirements_up_to_cell(self, cell: Cell, gps: GPTuple) -> GPTuple:
         """Given a goal gps and cell (x,y), return the truncations of the reqs
         in gps to the cells < (x, y) in normal sort order."""
@@ -59,30 +115,19 @@ class MinimalGriddedPerms:
                 req.get_gridded_perm_in_cells(frozenset(c for c in req.pos if c < cell))
                 for req in gps
             )
-            self.requirements_up_to_cell[(cell, gps)] = res
+            self.requirements_up_to_cell.set((cell, gps), res)
         return res
 
     def get_relevant_obstructions(self, gp: GriddedPerm) -> GPTuple:
         """Get the obstructions that involve only cells in the gp."""
-        cells = frozenset(gp.pos)
-        res = self.relevant_obstructions.get(cells)
-        if res is None:
-            res = tuple(
-                ob for ob in self.obstructions if all(c in cells for c in ob.pos)
-            )
-            self.relevant_obstructions[cells] = res
-        return res
+        return self.obstruction_index.relevant_obstructions(frozenset(gp.pos))
 
     def get_relevant_obstructions_by_cell(self, gp: GriddedPerm, cell: Cell) -> GPTuple:
         """Get the obstructions that involve only cells in gp
         and involve cell"""
-        cells = frozenset(gp.pos)
-        res = self.relevant_obstructions_by_cell.get((cell, cells))
-        if res is None:
-            relevant_obstructions = self.get_relevant_obstructions(gp)
-            res = tuple(ob for ob in relevant_obstructions if cell in ob.pos)
-            self.relevant_obstructions_by_cell[(cell, cells)] = res
-        return res
+        return self.obstruction_index.relevant_obstructions_by_cell(
+            frozenset(gp.pos), cell
+        )
 
     def get_relevant_requirements(self, gp: GriddedPerm) -> Reqs:
         """Get the requirements that involve only cells in gp."""
@@ -100,11 +145,7 @@ class MinimalGriddedPerms:
         self, gp: GriddedPerm, must_contain: Optional[Cell] = None
     ) -> bool:
         """Check if a gridded permutation avoids the obstructions."""
-        if must_contain is None:
-            obs = self.get_relevant_obstructions(gp)
-        else:
-            obs = self.get_relevant_obstructions_by_cell(gp, must_contain)
-        return gp.avoids(*obs)
+        return self.obstruction_index.avoided_by(gp, must_contain)
 
     def satisfies_requirements(self, gp: GriddedPerm) -> bool:
         """Check if a gridded permutation contains all requirements."""
@@ -258,15 +299,15 @@ class MinimalGriddedPerms:
         res = self.max_cell_counts.get(gps)
         if res is None:
             # we work with the upward closure.
-            gps = self.get_upward_closure(gps)
-            res = MinimalGriddedPerms.cell_counter(*gps)
+            closure = self.get_upward_closure(gps)
+            res = MinimalGriddedPerms.cell_counter(*closure)
             # now we look for any cells containing more than one full req and
             # are not involved with any other requirements, because we may be
             # able to apply a better upper bound to the number of points
             # required in the cell
             for cell in res.keys():
                 in_this_cell: Set[Perm] = set()
-                for req in gps:
+                for req in closure:
                     # we ignore point requirements
                     if len(req) > 1 and cell in req.pos:
                         if req.is_single_cell():
@@ -286,7 +327,7 @@ class MinimalGriddedPerms:
                         # the dictionary is patt: v, where v is the number we
                         # can subtract from the naive bound
                         res[cell] -= better_bounds.get(frozenset(in_this_cell), 0)
-            self.max_cell_counts[gps] = res
+            self.max_cell_counts.set(gps, res)
         return res
 
     _better_bounds = None
@@ -317,7 +358,7 @@ class MinimalGriddedPerms:
                 local_patts.add(gp.get_gridded_perm_in_cells([cell]))
             # Only keep the upward closure.
             res = self.get_upward_closure(tuple(local_patts))
-            self.localised_patts[(cell, gps)] = res
+            self.localised_patts.set((cell, gps), res)
         return res
 
     def get_upward_closure(self, gps: GPTuple) -> GPTuple:
@@ -330,7 +371,7 @@ class MinimalGriddedPerms:
                 if all(gp not in g for g in upward_closure):
                     upward_closure.append(gp)
             res = tuple(upward_closure)
-            self.upward_closures[gps] = res
+            self.upward_closures.set(gps, res)
         return res
 
     def _get_cells_to_try(self, qpacket: QueuePacket) -> Iterator[Tuple[Cell, bool]]:
@@ -410,6 +451,91 @@ class MinimalGriddedPerms:
             nextgp = gp.insert_specific_point(cell, idx, val)
             yield idx, nextgp
 
+    @staticmethod
+    def _next_mindices(
+        mindices: Dict[Cell, int], cell: Cell, idx: int
+    ) -> Dict[Cell, int]:
+        """Return the minimum index to insert into each cell after inserting a
+        point at idx in cell."""
+        res = {c: i if i <= idx else i + 1 for c, i in mindices.items() if c != cell}
+        res[cell] = idx + 1
+        return res
+
+    def witness(self) -> Optional[GriddedPerm]:
+        """
+        Return a gridded perm satisfying the obstructions and requirements, or
+        None if there is none.
+
+        Unlike minimal_gridded_perms, the search is depth first and stops at the
+        first gridded perm found, without keeping track of the ones found to
+        ensure they are minimal, so the gridded perm returned may not be
+        minimal. The known_patts are only kept for the gridded perms on the
+        current branch of the search. It is used to check if a tiling is empty.
+        """
+        if not self.requirements:
+            if GriddedPerm.empty_perm() in self.obstructions:
+                return None
+            return GriddedPerm.empty_perm()
+        if len(self.requirements) == 1:
+            return next(
+                (gp for gp in self.requirements[0] if self.satisfies_obstructions(gp)),
+                None,
+            )
+        # as in _prepare_queue, but we check all of the initial gps before
+        # starting to insert points into any of them
+        qpackets: List[QueuePacket] = []
+        for gps in self._product_requirements():
+            initial_gp = self.initial_gp(*gps)
+            if self.satisfies_obstructions(initial_gp):
+                if self.satisfies_requirements(initial_gp):
+                    return initial_gp
+                qpackets.append(QueuePacket(initial_gp, gps, (-1, -1), True, {}))
+        work_packets_done: Set[WorkPackets] = set()
+        for qpacket in qpackets:
+            res = self._witness_from(qpacket, work_packets_done)
+            if res is not None:
+                return res
+        return None
+
+    def _witness_from(
+        self, qpacket: QueuePacket, work_packets_done: Set[WorkPackets]
+    ) -> Optional[GriddedPerm]:
+        """
+        Return a gridded perm satisfying the obstructions and requirements
+        found by inserting points into the gridded perm of the qpacket as in
+        minimal_gridded_perms, or None if there is none.
+        """
+        for cell, localised in self._get_cells_to_try(qpacket):
+            next_cell = qpacket.last_cell if localised else cell
+            for idx, nextgp in self.insert_point(
+                qpacket.gp, cell, qpacket.mindices.get(cell, 0)
+            ):
+                key = (nextgp, qpacket.gps, next_cell)
+                if key in work_packets_done:
+                    continue
+                work_packets_done.add(key)
+                if not self.satisfies_obstructions(nextgp, must_contain=cell):
+                    continue
+                # the patterns known to be in nextgp are only kept while
+                # searching above it
+                self.known_patts[nextgp].update(self.known_patts[qpacket.gp])
+                if self.satisfies_requirements(nextgp):
+                    return nextgp
+                res = self._witness_from(
+                    QueuePacket(
+                        nextgp,
+                        qpacket.gps,
+                        next_cell,
+                        localised,
+                        self._next_mindices(qpacket.mindices, cell, idx),
+                    ),
+                    work_packets_done,
+                )
+                if res is not None:
+                    return res
+                del self.known_patts[nextgp]
+        return None
+
     def minimal_gridded_perms(
         self, yield_non_minimal: bool = False, max_length_to_build: Optional[int] = None
     ) -> Iterator[GriddedPerm]:
@@ -493,12 +619,7 @@ class MinimalGriddedPerms:
                     ):
                         # Update the minimum index that we inserted a
                         # a point into each cell.
-                        next_mindices = {
-                            c: i if i <= idx else i + 1
-                            for c, i in qpacket.mindices.items()
-                            if c != cell
-                        }
-                        next_mindices[cell] = idx + 1
+                        next_mindices = self._next_mindices(qpacket.mindices, cell, idx)
                         # Add the work to the queue
                         heappush(
                             queue,
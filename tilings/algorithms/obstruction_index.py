@@ -0,0 +1,198 @@
+from collections import defaultdict
+from typing import Callable, Dict, FrozenSet, Iterable, Iterator, List, Optional, Tuple
+
+from tilings.griddedperm import GriddedPerm, OccurrenceMasks
+
+__all__ = ["ObstructionIndex"]
+
+Cell = Tuple[int, int]
+GPTuple = Tuple[GriddedPerm, ...]
+
+
+class ObstructionIndex:
+    """
+    An index over a set of obstructions for fast containment and avoidance
+    checks.
+
+    The obstructions are bucketed by the set of cells they use. A gridded
+    permutation can only contain an obstruction if it uses every cell the
+    obstruction uses, so for a query we only look at the buckets whose cells
+    are covered by the query. The relevant obstructions for a set of cells are
+    cached, sorted by length, so that the work is done once per set of cells.
+    The cached tuples hold at most `memo_maxsize` obstructions in total, and
+    are all discarded when they would hold more.
+
+    The index can also be used to check many gridded permutations against a
+    set of patterns, as the relevant patterns are shared between the gridded
+    permutations using the same cells. Patterns found can be removed, so that
+    they are not looked for again.
+    """
+
+    MEMO_FACTOR = 4
+    MEMO_EXTRA = 16
+
+    def __init__(self, obstructions: Iterable[GriddedPerm] = ()) -> None:
+        # a dict rather than a set to keep the order the obstructions were added
+        self._obstructions: Dict[GriddedPerm, None] = {}
+        self._buckets: Dict[FrozenSet[Cell], List[GriddedPerm]] = defaultdict(list)
+        self._relevant: Dict[FrozenSet[Cell], GPTuple] = {}
+        self._relevant_by_cell: Dict[Tuple[Cell, FrozenSet[Cell]], GPTuple] = {}
+        self._memo_size = 0
+        self.add(*obstructions)
+
+    def add(self, *obstructions: GriddedPerm) -> None:
+        """Add the obstructions to the index."""
+        if not obstructions:
+            return
+        for ob in obstructions:
+            if ob in self._obstructions:
+                continue
+            self._obstructions[ob] = None
+            self._buckets[frozenset(ob.pos)].append(ob)
+        self._clear_memos()
+
+    def remove(self, *obstructions: GriddedPerm) -> None:
+        """Remove the obstructions from the index."""
+        if not obstructions:
+            return
+        for ob in obstructions:
+            del self._obstructions[ob]
+            cells = frozenset(ob.pos)
+            bucket = self._buckets[cells]
+            bucket.remove(ob)
+            if not bucket:
+                del self._buckets[cells]
+        self._clear_memos()
+
+    @property
+    def obstructions(self) -> GPTuple:
+        return tuple(self._obstructions)
+
+    @property
+    def memo_maxsize(self) -> int:
+        """
+        The maximum number of obstructions, counting one for each cached
+        tuple, held by the cached relevant obstructions.
+        """
+        return self.MEMO_FACTOR * len(self._obstructions) + self.MEMO_EXTRA
+
+    def max_size(self) -> int:
+        """
+        Return the maximum number of obstructions held by the index, including
+        the cached relevant obstructions.
+        """
+        return len(self._obstructions) + self.memo_maxsize
+
+    def _clear_memos(self) -> None:
+        self._relevant.clear()
+        self._relevant_by_cell.clear()
+        self._memo_size = 0
+
+    def _memoise(self, memo: dict, key: object, res: GPTuple) -> None:
+        """Cache res, discarding all the cached tuples if there is no room."""
+        size = len(res) + 1
+        if self._memo_size + size > self.memo_maxsize:
+            self._clear_memos()
+        memo[key] = res
+        self._memo_size += size
+
+    def relevant_obstructions(self, cells: FrozenSet[Cell]) -> GPTuple:
+        """
+        Return the obstructions that only use cells in the given cells, sorted
+        by length.
+        """
+        res = self._relevant.get(cells)
+        if res is None:
+            res = tuple(
+                sorted(
+                    (
+                        ob
+                        for bucket_cells, obs in self._buckets.items()
+                        if bucket_cells <= cells
+                        for ob in obs
+                    ),
+                    key=len,
+                )
+            )
+            self._memoise(self._relevant, cells, res)
+        return res
+
+    def relevant_obstructions_by_cell(
+        self, cells: FrozenSet[Cell], cell: Cell
+    ) -> GPTuple:
+        """
+        Return the obstructions that only use cells in the given cells and
+        use the given cell, sorted by length.
+        """
+        res = self._relevant_by_cell.get((cell, cells))
+        if res is None:
+            res = tuple(
+                ob for ob in self.relevant_obstructions(cells) if ob.occupies(cell)
+            )
+            self._memoise(self._relevant_by_cell, (cell, cells), res)
+        return res
+
+    def contained_in(
+        self, gp: GriddedPerm, must_contain: Optional[Cell] = None
+    ) -> bool:
+        """
+        Return True if gp contains one of the obstructions. If must_contain is
+        given, only obstructions using that cell are considered.
+        """
+        # pylint: disable=protected-access
+        if must_contain is None:
+            obs = self.relevant_obstructions(gp._cells)
+        else:
+            obs = self.relevant_obstructions_by_cell(gp._cells, must_contain)
+        contains_patt = self._contains_patt(gp, len(obs))
+        for ob in obs:
+            if ob.len > gp.len:
+                return False
+            if contains_patt(ob):
+                return True
+        return False
+
+    def avoided_by(self, gp: GriddedPerm, must_contain: Optional[Cell] = None) -> bool:
+        """
+        Return True if gp avoids all of the obstructions. If must_contain is
+        given, only obstructions using that cell are considered.
+        """
+        return not self.contained_in(gp, must_contain)
+
+    def contained_obstructions(self, gp: GriddedPerm) -> List[GriddedPerm]:
+        """Return the obstructions contained in gp."""
+        # pylint: disable=protected-access
+        obs = self.relevant_obstructions(gp._cells)
+        contains_patt = self._contains_patt(gp, len(obs))
+        res: List[GriddedPerm] = []
+        for ob in obs:
+            if ob.len > gp.len:
+                break
+            if contains_patt(ob):
+                res.append(ob)
+        return res
+
+    def avoiders(self, gps: Iterable[GriddedPerm]) -> Iterator[GriddedPerm]:
+        """Yield the gps that avoid all of the obstructions."""
+        return (gp for gp in gps if not self.contained_in(gp))
+
+    @staticmethod
+    def _contains_patt(
+        gp: GriddedPerm, num_patterns: int
+    ) -> Callable[[GriddedPerm], bool]:
+        """
+        Return the function checking if gp contains a pattern, using the
+        occurrence masks if there are enough patterns to check.
+        """
+        if OccurrenceMasks.worthwhile(gp, num_patterns):
+            return OccurrenceMasks(gp).contains_patt
+        return gp.contains_patt
+
+    def __iter__(self) -> Iterator[GriddedPerm]:
+        return iter(self._obstructions)
+
+    def __len__(self) -> int:
+        return len(self._obstructions)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({tuple(self._obstructions)!r})"
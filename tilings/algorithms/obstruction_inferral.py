@@ -1,8 +1,9 @@
 import abc
 from typing import TYPE_CHECKING, Iterable, List, Optional, Set, Tuple
 
-from tilings import GriddedPerm
 from tilings.algorithms.gridded_perm_generation import GriddedPermsOnTiling
+from tilings.algorithms.obstruction_index import ObstructionIndex
+from tilings.griddedperm import GriddedPerm
 
 if TYPE_CHECKING:
     from tilings import Tiling
@@ -47,13 +48,9 @@ class ObstructionInferral(abc.ABC):
         GP = GriddedPermsOnTiling(
             self._tiling, yield_non_minimal=yield_non_minimal
         ).gridded_perms(max_length, place_at_most=max_len_of_perms_to_check)
-        perms_left = set(perms_to_check)
+        perms_left = ObstructionIndex(set(perms_to_check))
         for gp in GP:
-            to_remove: List[GriddedPerm] = []
-            for perm in perms_left:
-                if gp.contains(perm):
-                    to_remove.append(perm)
-            perms_left.difference_update(to_remove)
+            perms_left.remove(*perms_left.contained_obstructions(gp))
             if not perms_left:
                 break
         self._new_obs = sorted(perms_left)
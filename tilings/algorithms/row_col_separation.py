@@ -9,6 +9,7 @@ separation is idempotent by applying the core algorithm until it stabilises.
 """
 
 import heapq
+from collections import defaultdict
 from itertools import combinations, product
 from typing import TYPE_CHECKING, Dict, List, Tuple
 
@@ -41,6 +42,10 @@ class Graph:
         - if the graph is acyclic with `is_acyclic`
         - for a cycle of the graph with `find_cycle`
         - For the vertex order implied by a reduced acyclic graph
+
+    The row column separation uses `BitGraph`, which gives the same vertex
+    orders for matrices of zeros and ones. This class is kept as the weighted
+    reference implementation that `BitGraph` is tested against.
     """
 
     def __init__(self, vertices, matrix=None):
@@ -248,6 +253,227 @@ class Graph:
         return self.num_vertices >= other.num_vertices
 
 
+class BitGraph:
+    """
+    A directed graph over groups of vertices, where the edges are stored as
+    bitmasks.
+
+    There is an edge from a group to another if there is an edge from every
+    vertex of the first to every vertex of the second. This is the graph that
+    `Graph` gives when it starts with a matrix of zeros and ones, as the weight
+    of an edge that is kept is the product of the weights of the two vertices.
+    For each group the out-neighbours and in-neighbours are stored as bitmasks
+    over the indices of the groups, so merging two vertices, removing an edge
+    or finding a non-edge or a cycle only use operations on integers.
+
+    It supports the same operations as `Graph`, namely `reduce`,
+    `find_cycle`, `break_cycle_in_all_ways` and `vertex_order`, which
+    are done in the same order, so it gives the same vertex orders.
+    """
+
+    def __init__(self, vertices, out_masks):
+        self._vertices = tuple(vertices)
+        self._groups = [1 << i for i in range(len(self._vertices))]
+        self._out = list(out_masks)
+        assert len(self._out) == len(self._groups)
+        self._in = [
+            sum(1 << j for j, out in enumerate(self._out) if out >> i & 1)
+            for i in range(len(self._out))
+        ]
+        self._reduced = False
+        self._is_acyclic = False
+
+    @classmethod
+    def from_matrix(cls, vertices, matrix) -> "BitGraph":
+        """
+        Return the graph with an edge from `i` to `j` if `matrix[i][j]` is
+        not zero.
+        """
+        return cls(
+            vertices,
+            (sum(1 << j for j, weight in enumerate(row) if weight) for row in matrix),
+        )
+
+    @property
+    def num_vertices(self):
+        """
+        The number of vertices of the graph
+        """
+        return len(self._groups)
+
+    def vertex_labels(self):
+        """
+        Return the set of vertices in each group.
+        """
+        return [self._group_labels(group) for group in self._groups]
+
+    def _group_labels(self, group):
+        return {v for i, v in enumerate(self._vertices) if group >> i & 1}
+
+    @staticmethod
+    def _remove_bit(mask, i):
+        """
+        Return the mask obtained by removing the bit `i` and shifting the
+        bits above it.
+        """
+        low = mask & ((1 << i) - 1)
+        return low | (mask >> (i + 1) << i)
+
+    def _merge_vertices(self, v1, v2):
+        """
+        Merge the two vertices. The merged vertex only keeps the edges that
+        both vertices had.
+        """
+        out, inn = self._out, self._in
+        merged_out = out[v1] & out[v2]
+        merged_in = inn[v1] & inn[v2]
+        bit1 = 1 << v1
+        new_out, new_in = [], []
+        for v, (v_out, v_in) in enumerate(zip(out, inn)):
+            if v == v2:
+                continue
+            if v == v1:
+                v_out, v_in = merged_out, merged_in
+            else:
+                v_out = v_out & ~bit1 | (bit1 if merged_in >> v & 1 else 0)
+                v_in = v_in & ~bit1 | (bit1 if merged_out >> v & 1 else 0)
+            new_out.append(self._remove_bit(v_out, v2))
+            new_in.append(self._remove_bit(v_in, v2))
+        self._out, self._in = new_out, new_in
+        self._groups[v1] |= self._groups.pop(v2)
+
+    def reduce(self):
+        if self._reduced:
+            return
+        non_edge = self.find_non_edge()
+        while non_edge:
+            self._merge_vertices(non_edge[0], non_edge[1])
+            non_edge = self.find_non_edge()
+        self._reduced = True
+
+    def find_non_edge(self):
+        """
+        Return a non-edge of the graph.
+
+        A non edges is a pair of vertices `(v1, v2)` such that neither
+        `(v1, v2)` or `(v2, v1)` is an edge in the graph.
+        """
+        out, inn = self._out, self._in
+        for v1, (v1_out, v1_in) in enumerate(zip(out, inn)):
+            non_adjacent = ~(v1_out | v1_in) & -(2 << v1)
+            non_adjacent &= (1 << len(out)) - 1
+            if non_adjacent:
+                return (v1, self._lowest_bit(non_adjacent))
+        return None
+
+    @staticmethod
+    def _lowest_bit(mask):
+        return (mask & -mask).bit_length() - 1
+
+    def is_acyclic(self):
+        """
+        Check if the graph is acyclic.
+
+        To perform that check, the graph must first be reduced with the
+        `reduce` method.
+        """
+        assert self._reduced, "Graph must first be reduced"
+        if self._is_acyclic or self.num_vertices == 0:
+            return True
+        return self.find_cycle() is None
+
+    def find_cycle(self):
+        """
+        Return the edges of a cycle of the graphs, of length 2 if there is
+        one. The graphs first need to be reduced.
+
+        If the graph is acyclic, returns None.
+        """
+        assert self._reduced, "Graph must first be reduced"
+        out, inn = self._out, self._in
+        for v1, (v1_out, v1_in) in enumerate(zip(out, inn)):
+            both_ways = v1_out & v1_in & -(2 << v1)
+            if both_ways:
+                v2 = self._lowest_bit(both_ways)
+                return ((v1, v2), (v2, v1))
+        # The first length 3 cycle in the order of the triples v1 < v2 < v3.
+        # As there is no length 2 cycle, the direction of the edge between v1
+        # and v2 gives the orientation of the cycle.
+        for v1, (v1_out, v1_in) in enumerate(zip(out, inn)):
+            for v2 in range(v1 + 1, len(out)):
+                if v1_out >> v2 & 1:
+                    third = out[v2] & v1_in & -(2 << v2)
+                    if third:
+                        v3 = self._lowest_bit(third)
+                        return ((v1, v2), (v2, v3), (v3, v1))
+                elif out[v2] >> v1 & 1:
+                    third = v1_out & inn[v2] & -(2 << v2)
+                    if third:
+                        v3 = self._lowest_bit(third)
+                        return ((v1, v3), (v3, v2), (v2, v1))
+        self._is_acyclic = True
+        return None
+
+    def break_cycle_in_all_ways(self, edges):
+        """
+        Generator over BitGraph object obtained by removing one edge of the
+        `edges` iterator.
+        """
+        # pylint: disable=protected-access
+        for e in edges:
+            new_graph = BitGraph.__new__(BitGraph)
+            new_graph._vertices = self._vertices
+            new_graph._groups = self._groups.copy()
+            new_graph._out = self._out.copy()
+            new_graph._in = self._in.copy()
+            new_graph._out[e[0]] &= ~(1 << e[1])
+            new_graph._in[e[1]] &= ~(1 << e[0])
+            new_graph._reduced = False
+            new_graph._is_acyclic = False
+            yield new_graph
+
+    def vertex_order(self):
+        """
+        Return the order of the vertex in a reduced acyclic graph.
+
+        A reduced acyclic graph is an acyclic orientation of a complete graph,
+        so the vertices are ordered by their number of out-neighbours.
+        """
+        assert self._reduced, "Graph must first be reduced"
+        assert self.is_acyclic(), "Graph must be acyclic"
+        out_degrees = [(out & ~(1 << v)).bit_count() for v, out in enumerate(self._out)]
+        return [
+            self._group_labels(group)
+            for _, group in sorted(zip(out_degrees, self._groups), key=lambda x: -x[0])
+        ]
+
+    def adjacency_matrix(self):
+        """
+        Return the matrix of zeros and ones of the edges between the groups.
+        """
+        return [[out >> v2 & 1 for v2 in range(self.num_vertices)] for out in self._out]
+
+    def __repr__(self):
+        s = f"BitGraph over the vertices {self.vertex_labels()}\n"
+        for row in self.adjacency_matrix():
+            s += f"{row}\n"
+        return s
+
+    def __lt__(self, other):
+        """
+        A graph is 'smaller if it as more vertices.
+        Useful for the priority queue
+        """
+        return self.num_vertices > other.num_vertices
+
+    def __le__(self, other):
+        """
+        A graph is 'smaller if it as more vertices.
+        Useful for the priority queue
+        """
+        return self.num_vertices >= other.num_vertices
+
+
 class _RowColSeparationSingleApplication:
     """
     Make the row separation of the tiling.
@@ -256,9 +482,10 @@ class _RowColSeparationSingleApplication:
     def __init__(self, tiling):
         self._tiling = tiling
         self._active_cells = tuple(sorted(tiling.active_cells))
-        self._ineq_matrices = None
+        self._ineq_masks = None
         self._max_row_order = None
         self._max_col_order = None
+        self._separated_tiling = None
 
     def cell_at_idx(self, idx):
         """Return the cell at index `idx`."""
@@ -268,19 +495,6 @@ class _RowColSeparationSingleApplication:
         """Return the index of the cell"""
         return self._active_cells.index(cell)
 
-    def _basic_matrix(self, row):
-        """
-        Compute the basic matrix of inequalities based only on difference in
-        row and columns. If `row` is True return the matrix for the row,
-        otherwise return if for the columns.
-        """
-        idx = 1 if row else 0
-        m = []
-        for c1 in self._active_cells:
-            row = [1 if c1[idx] < c2[idx] else 0 for c2 in self._active_cells]
-            m.append(row)
-        return m
-
     @staticmethod
     def _row_cell_order(ob):
         """
@@ -319,26 +533,37 @@ class _RowColSeparationSingleApplication:
         assert not c1[1] == c2[1], "Obstruction is single cell"
         return c2, c1
 
-    def _add_ineq(self, ineq, matrix):
+    def _basic_masks(self, row):
         """
-        Add an inequalities to the matrix.
-
-        The inequalities must a tuple (smaller_cell, bigger_cell).
+        Compute the bitmasks of the basic inequalities based only on difference
+        in row and columns. The bitmask of a cell has the bits of the indices
+        of the cells that are bigger. If `row` is True return the bitmasks for
+        the row, otherwise return them for the columns.
         """
-        small_c, big_c = ineq
-        matrix[self.cell_idx(small_c)][self.cell_idx(big_c)] = 1
+        idx = 1 if row else 0
+        line_masks: Dict[int, int] = defaultdict(int)
+        for i, cell in enumerate(self._active_cells):
+            line_masks[cell[idx]] |= 1 << i
+        bigger_masks: Dict[int, int] = {}
+        bigger = 0
+        for line in sorted(line_masks, reverse=True):
+            bigger_masks[line] = bigger
+            bigger |= line_masks[line]
+        return [bigger_masks[cell[idx]] for cell in self._active_cells]
 
-    def _complete_ineq_matrices(self):
+    def _complete_ineq_masks(self):
         """
-        Return the matrices of inequalities between the cells.
+        Return the bitmasks of inequalities between the cells. The bitmask of
+        a cell has the bits of the indices of the cells that are bigger.
 
         OUTPUT:
-            tuple `(row_matrix, col_matrix)`
+            tuple `(row_masks, col_masks)`
         """
-        if self._ineq_matrices is not None:
-            return self._ineq_matrices
-        row_m = self._basic_matrix(row=True)
-        col_m = self._basic_matrix(row=False)
+        if self._ineq_masks is not None:
+            return self._ineq_masks
+        row_m = self._basic_masks(row=True)
+        col_m = self._basic_masks(row=False)
+        cell_idx = {cell: i for i, cell in enumerate(self._active_cells)}
         filtered_obs = (
             ob
             for ob in self._tiling.obstructions
@@ -347,19 +572,19 @@ class _RowColSeparationSingleApplication:
         for ob in filtered_obs:
             c1, c2 = ob.pos
             if c1[1] == c2[1]:
-                ineq = self._row_cell_order(ob)
-                self._add_ineq(ineq, row_m)
+                small_c, big_c = self._row_cell_order(ob)
+                row_m[cell_idx[small_c]] |= 1 << cell_idx[big_c]
             elif c1[0] == c2[0]:
-                ineq = self._col_cell_order(ob)
-                self._add_ineq(ineq, col_m)
-        self._ineq_matrices = row_m, col_m
-        return self._ineq_matrices
+                small_c, big_c = self._col_cell_order(ob)
+                col_m[cell_idx[small_c]] |= 1 << cell_idx[big_c]
+        self._ineq_masks = row_m, col_m
+        return self._ineq_masks
 
     def row_ineq_graph(self):
-        return Graph(self._active_cells, self._complete_ineq_matrices()[0])
+        return BitGraph(self._active_cells, self._complete_ineq_masks()[0])
 
     def col_ineq_graph(self):
-        return Graph(self._active_cells, self._complete_ineq_matrices()[1])
+        return BitGraph(self._active_cells, self._complete_ineq_masks()[1])
 
     @staticmethod
     def _all_order(graph, only_max=False):
@@ -480,7 +705,11 @@ class _RowColSeparationSingleApplication:
         """
         Return the one the possible maximal separation of the tiling.
         """
-        return self._separates_tiling(self.max_row_order, self.max_col_order)
+        if self._separated_tiling is None:
+            self._separated_tiling = self._separates_tiling(
+                self.max_row_order, self.max_col_order
+            )
+        return self._separated_tiling
 
     def get_cell_map(self) -> Dict[Cell, Cell]:
         """
@@ -526,16 +755,41 @@ class RowColSeparation:
     idempotent.
 
     It applies the row columns separation until it does not change the tiling.
+
+    The separated tilings and the cell map of each application are stored in
+    the cached properties of the tiling, and of each separated tiling, so they
+    are only computed once for each tiling.
     """
 
     def __init__(self, tiling: "Tiling") -> None:
         self._tiling = tiling
-        self._separated_tilings: List["Tiling"] = []
-        separation_algo = _RowColSeparationSingleApplication(self._tiling)
+        # pylint: disable=protected-access
+        separations = tiling._cached_properties.get("row_col_separation")
+        if separations is None:
+            separations = self._separations(tiling)
+        self._separated_tilings: List["Tiling"] = [t for t, _ in separations]
+        self._cell_maps: List[Dict[Cell, Cell]] = [m for _, m in separations]
+
+    @staticmethod
+    def _separations(
+        tiling: "Tiling",
+    ) -> Tuple[Tuple["Tiling", Dict[Cell, Cell]], ...]:
+        """
+        Return the separated tiling and the cell map of each application of the
+        separation, and store them in the cached properties of the tilings.
+        """
+        separations = []
+        separation_algo = _RowColSeparationSingleApplication(tiling)
         while separation_algo.separable():
             new_sep = separation_algo.separated_tiling()
-            self._separated_tilings.append(new_sep)
+            separations.append((new_sep, separation_algo.get_cell_map()))
             separation_algo = _RowColSeparationSingleApplication(new_sep)
+        res = tuple(separations)
+        # pylint: disable=protected-access
+        tiling._cached_properties["row_col_separation"] = res
+        for idx, (new_sep, _) in enumerate(res):
+            new_sep._cached_properties["row_col_separation"] = res[idx + 1 :]
+        return res
 
     def separable(self) -> bool:
         """
@@ -558,15 +812,8 @@ class RowColSeparation:
         """
         Return the cell map obtained by applying the algorithm until no change.
         """
-        separation_algo = _RowColSeparationSingleApplication(self._tiling)
-        cell_maps = []
-        while separation_algo.separable():
-            cell_map = separation_algo.get_cell_map()
-            cell_maps.append(cell_map)
-            new_sep = separation_algo.separated_tiling()
-            separation_algo = _RowColSeparationSingleApplication(new_sep)
         res = {cell: cell for cell in self._tiling.active_cells}
-        for cell_map in cell_maps:
+        for cell_map in self._cell_maps:
             for cell, mapped_cell in tuple(res.items()):
                 if mapped_cell in cell_map:
                     res[cell] = cell_map[mapped_cell]
@@ -3,10 +3,12 @@ The main algorithm for detecting when the underlying ungridded permutations on a
 are contained in one of a given set of subclasses.
 """
 
+import json
 from typing import TYPE_CHECKING, List, Optional, Set, Tuple, cast
 
 from permuta import Perm
 from tilings.algorithms import GriddedPermsOnTiling
+from tilings.verification_cache import get_verification_cache
 
 if TYPE_CHECKING:
     from tilings import Tiling
@@ -75,6 +77,22 @@ class SubclassVerificationAlgorithm:
         if len(perms_to_check) == 0:
             return
 
+        cache = get_verification_cache()
+        key = json.dumps(["SubclassVerificationAlgorithm", sorted(perms_to_check)])
+        if cache is not None:
+            subclasses = cache.get(key, self.tiling)
+            if subclasses is not None:
+                self._subclasses = tuple(Perm(perm) for perm in subclasses)
+                return
+        self._subclasses = self._perms_not_contained(perms_to_check)
+        if cache is not None:
+            cache.set(key, self.tiling, self._subclasses)
+
+    def _perms_not_contained(self, perms_to_check: Set[Perm]) -> Tuple[Perm, ...]:
+        """
+        Return the perms that are not contained in any of the underlying
+        permutations of the gridded perms on the tiling.
+        """
         max_len_of_perms_to_check = max(map(len, perms_to_check))
         max_length = (
             self.tiling.maximum_length_of_minimum_gridded_perm()
@@ -93,5 +111,5 @@ class SubclassVerificationAlgorithm:
                     to_remove.append(perm)
             perms_left.difference_update(to_remove)
             if len(perms_left) == 0:
-                return
-        self._subclasses = tuple(sorted(perms_left))
+                return tuple()
+        return tuple(sorted(perms_left))
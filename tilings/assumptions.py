@@ -40,18 +40,27 @@ class TrackingAssumption:
         Return the tracking absumption where all of the gridded perms avoiding
         the obstructions are removed. If active_cells is not None, then any
         assumptions involving a cell not in active_cells will be removed.
+
+        The obstructions can also be given as an ObstructionIndex, which saves
+        building one when the same obstructions are used repeatedly.
         """
-        obstructions = tuple(obstructions)
+        # pylint: disable=import-outside-toplevel
+        from .algorithms.obstruction_index import ObstructionIndex
+
+        if not isinstance(obstructions, ObstructionIndex):
+            obstructions = ObstructionIndex(obstructions)
         if active_cells is not None:
             return self.__class__(
                 tuple(
                     gp
                     for gp in self.gps
                     if all(cell in active_cells for cell in gp.pos)
-                    and gp.avoids(*obstructions)
+                    and obstructions.avoided_by(gp)
                 )
             )
-        return self.__class__(tuple(gp for gp in self.gps if gp.avoids(*obstructions)))
+        return self.__class__(
+            tuple(gp for gp in self.gps if obstructions.avoided_by(gp))
+        )
 
     def get_value(self, gp: GriddedPerm) -> int:
         """
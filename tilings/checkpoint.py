@@ -0,0 +1,535 @@
+"""
+Checkpoints of a TileScope search.
+
+A checkpoint file is a sequence of length prefixed pickles, called frames. The
+first frame is a header holding the class of the searcher and its strategy
+pack as json, and the second is a snapshot of the searcher. Each later frame
+holds what changed since the frame before it: the keys of the new classes, the
+classes found to be empty or not, the rules added, and the changes to the
+queue and the other state of the searcher. For a set or a dictionary these
+are the entries added and removed, and for a deque or a list the number of
+items taken from its start and the items added to its end. Everything is
+therefore written once, apart from the rest of the state, the containers
+that changed in another way and those holding objects that may have changed
+in place, which are written in full. When the state makes up more than half
+of the file, the file is replaced by a new header and snapshot.
+
+A frame that was only partly written, for example because the job was killed,
+is ignored when loading the checkpoint and overwritten by the next write.
+"""
+
+import copy
+import importlib
+import io
+import os
+import pickle
+import struct
+import time
+from collections import deque
+from itertools import islice
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    BinaryIO,
+    Dict,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Tuple,
+    cast,
+)
+
+from comb_spec_searcher.class_db import ClassDB
+from comb_spec_searcher.rule_db import RuleDB
+from comb_spec_searcher.strategies import AbstractStrategy
+from comb_spec_searcher.strategies.rule import AbstractRule, VerificationRule
+
+from .strategy_pack import TileScopePack
+
+if TYPE_CHECKING:
+    from .tilescope import TileScope
+
+__all__ = ("CheckpointRuleDB", "SearchCheckpoint")
+
+VERSION = 3
+_LENGTH = struct.Struct(">Q")
+
+# start, ends, strategy, possibly empty, verification, two way
+JournalEntry = Tuple[int, Tuple[int, ...], AbstractStrategy, bool, bool, bool]
+
+
+class CheckpointRuleDB(RuleDB):
+    """
+    A RuleDB that keeps a journal of the rules added, if the journal is not
+    None, so that a checkpoint only needs to write the new rules.
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.journal: Optional[List[JournalEntry]] = None
+
+    @classmethod
+    def from_ruledb(cls, ruledb: RuleDB) -> "CheckpointRuleDB":
+        """Return a CheckpointRuleDB with the rules of the ruledb, linked to
+        the same searcher."""
+        res = cls.__new__(cls)
+        res.__dict__.update(vars(ruledb))
+        res.journal = None
+        return res
+
+    def add(self, start: int, ends: Tuple[int, ...], rule: AbstractRule) -> None:
+        super().add(start, ends, rule)
+        if self.journal is not None:
+            self.journal.append(
+                (
+                    start,
+                    tuple(ends),
+                    rule.strategy,
+                    rule.possibly_empty,
+                    isinstance(rule, VerificationRule),
+                    (len(ends) == 1 or rule.possibly_empty) and rule.is_two_way(),
+                )
+            )
+
+
+class _ReplayedRule(NamedTuple):
+    """The parts of a rule used by RuleDB.add, with the empty children
+    already removed."""
+
+    strategy: AbstractStrategy
+    children: Tuple[None, ...]
+    two_way: bool
+    possibly_empty: bool = False
+
+    def is_two_way(self) -> bool:
+        return self.two_way
+
+
+class _Pickler(pickle.Pickler):
+    """
+    Pickle the parts of a search, writing references to the objects in refs
+    rather than copying them.
+    """
+
+    def __init__(self, file: BinaryIO, refs: Dict[Any, Any]) -> None:
+        super().__init__(file, protocol=pickle.HIGHEST_PROTOCOL)
+        self.refs = {id(obj): (obj, pid) for pid, obj in refs.items()}
+
+    def persistent_id(self, obj: Any) -> Any:
+        ref = self.refs.get(id(obj))
+        if ref is not None and ref[0] is obj:
+            return ref[1]
+        return None
+
+
+class _Unpickler(pickle.Unpickler):
+    def __init__(self, file: BinaryIO, refs: Dict[Any, Any]) -> None:
+        super().__init__(file)
+        self.refs = refs
+
+    def persistent_load(self, pid: Any) -> Any:
+        return self.refs[pid]
+
+
+def _dumps(obj: Any, refs: Dict[Any, Any]) -> bytes:
+    file = io.BytesIO()
+    _Pickler(file, refs).dump(obj)
+    return file.getvalue()
+
+
+def _loads(data: bytes, refs: Dict[Any, Any]) -> Any:
+    return _Unpickler(io.BytesIO(data), refs).load()
+
+
+def _references(searcher: "TileScope", pack: TileScopePack) -> Dict[Any, Any]:
+    """The objects that are the same from one frame to the next."""
+    refs: Dict[Any, Any] = {"searcher": searcher, "pack": pack}
+    for idx, strategy in enumerate(
+        (
+            *pack.inferral_strats,
+            *pack.initial_strats,
+            *(strategy for strats in pack.expansion_strats for strategy in strats),
+            *pack.ver_strats,
+            *pack.symmetries,
+        )
+    ):
+        refs[("strategy", idx)] = strategy
+    return refs
+
+
+# the state of a searcher split into its own attributes and those of its queue
+State = Dict[str, Dict[str, Any]]
+# the kind of change followed by its details, see _diff
+Change = Tuple[Any, ...]
+
+
+def _getstate(obj: Any) -> Dict[str, Any]:
+    """Return a copy of the attributes of obj, or the state given by its
+    __getstate__ if its class defines one, as for pickling."""
+    getstate = getattr(type(obj), "__getstate__", None)
+    if getstate is None or getstate is getattr(object, "__getstate__", None):
+        return dict(vars(obj))
+    return cast(Dict[str, Any], getstate(obj))
+
+
+def _setstate(obj: Any, state: Dict[str, Any]) -> None:
+    """Set the attributes of obj to the state, as for unpickling."""
+    setstate = getattr(obj, "__setstate__", None)
+    if setstate is None:
+        vars(obj).update(state)
+    else:
+        setstate(state)
+
+
+def _copy(value: Any) -> Any:
+    """Return a copy of the containers in value, to find the changes to them
+    with _diff."""
+    if isinstance(value, (set, dict, list, deque)):
+        return copy.copy(value)
+    if isinstance(value, tuple):
+        return tuple(_copy(item) for item in value)
+    return value
+
+
+def _removed_from_start(old: Sequence[Any], new: Sequence[Any]) -> Optional[int]:
+    """Return the number of items taken from the start of old if new is old
+    with items taken from its start and added to its end, and otherwise
+    None."""
+    start = len(old)
+    if new:
+        try:
+            start = old.index(new[0])
+        except ValueError:
+            pass
+    kept = len(old) - start
+    if list(islice(new, kept)) == list(islice(old, start, None)):
+        return start
+    return None
+
+
+def _is_immutable(value: Any) -> bool:
+    if isinstance(value, tuple):
+        return all(map(_is_immutable, value))
+    return isinstance(value, (int, float, str, bytes, type(None), frozenset))
+
+
+def _diff(old: Any, new: Any) -> Change:
+    """Return the change from old, a copy made by _copy, to new. Containers
+    holding objects that could have changed in place are returned in full."""
+    if type(old) is type(new):  # pylint: disable=unidiomatic-typecheck
+        if isinstance(new, set):
+            return ("set", new - old, old - new)
+        if isinstance(new, dict) and all(map(_is_immutable, new.values())):
+            missing = object()
+            return (
+                "dict",
+                {k: v for k, v in new.items() if old.get(k, missing) != v},
+                [k for k in old if k not in new],
+            )
+        if isinstance(new, (list, deque)) and all(map(_is_immutable, new)):
+            start = _removed_from_start(old, new)
+            if start is not None:
+                return ("sequence", start, list(islice(new, len(old) - start, None)))
+        if isinstance(new, tuple) and len(old) == len(new):
+            return ("tuple", tuple(_diff(a, b) for a, b in zip(old, new)))
+    return ("value", new)
+
+
+def _patch(value: Any, change: Change) -> Any:
+    """Return the value with the change made, changing its containers in
+    place."""
+    kind = change[0]
+    if kind == "set":
+        value |= change[1]
+        value -= change[2]
+    elif kind == "dict":
+        # a Counter adds the counts in its update
+        dict.update(value, change[1])
+        for key in change[2]:
+            del value[key]
+    elif kind == "sequence":
+        if isinstance(value, deque):
+            for _ in range(change[1]):
+                value.popleft()
+        else:
+            del value[: change[1]]
+        value.extend(change[2])
+    elif kind == "tuple":
+        return tuple(_patch(item, c) for item, c in zip(value, change[1]))
+    elif kind == "value":
+        return change[1]
+    return value
+
+
+def _read_frames(path: str) -> Iterator[Tuple[bytes, int]]:
+    """Yield the complete frames in the file, and the offset of their end."""
+    with open(path, "rb") as f:
+        offset = 0
+        while True:
+            prefix = f.read(_LENGTH.size)
+            if len(prefix) < _LENGTH.size:
+                return
+            (length,) = _LENGTH.unpack(prefix)
+            data = f.read(length)
+            if len(data) < length:
+                return
+            offset += _LENGTH.size + length
+            yield data, offset
+
+
+class SearchCheckpoint:
+    """
+    A checkpoint file for a searcher, written to every `interval` seconds
+    during its auto search.
+    """
+
+    def __init__(
+        self, path: str, searcher: "TileScope", interval: float = 600.0
+    ) -> None:
+        if type(searcher.ruledb) is RuleDB:  # pylint: disable=unidiomatic-typecheck
+            searcher.ruledb = CheckpointRuleDB.from_ruledb(searcher.ruledb)
+        if not isinstance(searcher.ruledb, CheckpointRuleDB):
+            raise ValueError("Checkpoints need the searcher to use a CheckpointRuleDB")
+        self.path = path
+        self.searcher = searcher
+        self.interval = interval
+        self.last_write = time.time()
+        self._num_classes = 0
+        self._num_tilings = 0
+        self._unknown_empty: List[int] = []
+        self._size = 0
+        self._state_size = 0
+        self._previous: State = {}
+
+    def is_due(self) -> bool:
+        """Return True if the last write was more than `interval` seconds ago."""
+        return time.time() - self.last_write >= self.interval
+
+    def write(self) -> None:
+        """
+        Append the changes since the last write to the file, or replace the
+        file with a snapshot if there are no earlier writes or the copies of
+        the queue make up more than half of the file.
+        """
+        if self._size == 0 or 2 * self._state_size > self._size:
+            self._write_snapshot()
+        else:
+            self._write_delta()
+        self.last_write = time.time()
+
+    def _databases(self) -> Tuple[ClassDB, Any]:
+        """Return the ClassDB holding the underlying classes, and the
+        TrackedClassDB if the searcher uses one."""
+        # pylint: disable=import-outside-toplevel
+        from .tilescope import TrackedClassDB
+
+        classdb = self.searcher.classdb
+        if isinstance(classdb, TrackedClassDB):
+            return classdb.classdb, classdb
+        return classdb, None
+
+    def _state(self) -> Dict[str, Any]:
+        state = _getstate(self.searcher)
+        for attr in ("classdb", "ruledb", "checkpoint"):
+            state.pop(attr, None)
+        return state
+
+    def _split_state(self) -> State:
+        state = self._state()
+        queue = state.pop("classqueue")
+        return {"searcher": state, "queue": vars(queue)}
+
+    def _copy_state(self) -> State:
+        return {
+            part: {attr: _copy(value) for attr, value in attrs.items()}
+            for part, attrs in self._split_state().items()
+        }
+
+    def _state_changes(self) -> Dict[str, Dict[str, Change]]:
+        """Return the changes to the state since the last write."""
+        missing = object()
+        return {
+            part: {
+                attr: _diff(self._previous[part].get(attr, missing), value)
+                for attr, value in attrs.items()
+            }
+            for part, attrs in self._split_state().items()
+        }
+
+    def _refs(self) -> Dict[Any, Any]:
+        return _references(
+            self.searcher, cast(TileScopePack, self.searcher.strategy_pack)
+        )
+
+    def _reset_counters(self) -> None:
+        underlying, tracked = self._databases()
+        self._num_classes = len(underlying.empty_list)
+        self._num_tilings = 0 if tracked is None else len(tracked.label_to_tilings)
+        self._unknown_empty = [
+            label for label, empty in enumerate(underlying.empty_list) if empty is None
+        ]
+        ruledb = cast(CheckpointRuleDB, self.searcher.ruledb)
+        ruledb.journal = []
+
+    def _write_snapshot(self) -> None:
+        searcher = self.searcher
+        ruledb = cast(CheckpointRuleDB, searcher.ruledb)
+        ruledb.journal = None
+        header = {
+            "version": VERSION,
+            "searcher": (type(searcher).__module__, type(searcher).__qualname__),
+            "pack": searcher.strategy_pack.to_jsonable(),
+        }
+        snapshot = _dumps((searcher.classdb, ruledb, self._state()), self._refs())
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "wb") as f:
+            for data in (pickle.dumps(header), snapshot):
+                f.write(_LENGTH.pack(len(data)))
+                f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+        self._size = os.path.getsize(self.path)
+        self._state_size = 0
+        self._reset_counters()
+        self._previous = self._copy_state()
+
+    def _write_delta(self) -> None:
+        underlying, tracked = self._databases()
+        ruledb = cast(CheckpointRuleDB, self.searcher.ruledb)
+        empty_list = underlying.empty_list
+        known_empty: List[Tuple[int, bool]] = []
+        unknown_empty: List[int] = []
+        for label in (
+            *self._unknown_empty,
+            *range(self._num_classes, len(empty_list)),
+        ):
+            empty = empty_list[label]
+            if empty is None:
+                unknown_empty.append(label)
+            else:
+                known_empty.append((label, empty))
+        refs = self._refs()
+        refs.update(classdb=self.searcher.classdb, ruledb=ruledb)
+        state = _dumps(self._state_changes(), refs)
+        delta = {
+            "classes": underlying.comb_class_list[self._num_classes :],
+            "empty": known_empty,
+            "tilings": (
+                None
+                if tracked is None
+                else tracked.label_to_tilings[self._num_tilings :]
+            ),
+            "assumption_types": (
+                None if tracked is None else tracked.int_to_assumption_type
+            ),
+            "rules": ruledb.journal,
+            "state": state,
+        }
+        data = _dumps(delta, refs)
+        with open(self.path, "r+b") as f:
+            f.seek(self._size)
+            f.write(_LENGTH.pack(len(data)))
+            f.write(data)
+            f.truncate()
+            f.flush()
+            os.fsync(f.fileno())
+        self._size += _LENGTH.size + len(data)
+        self._state_size += len(state)
+        self._num_classes = len(empty_list)
+        if tracked is not None:
+            self._num_tilings = len(tracked.label_to_tilings)
+        self._unknown_empty = unknown_empty
+        self._previous = self._copy_state()
+        ruledb.journal = []
+
+    @classmethod
+    def load(cls, path: str, interval: float = 600.0) -> "TileScope":
+        """
+        Return the searcher saved in the checkpoint file, with the checkpoint
+        attached so that the search continues to write to the file.
+        """
+        frames = _read_frames(path)
+        searcher, state, refs, size = cls._load_snapshot(path, frames)
+        checkpoint = cls(path, searcher, interval)
+        for data, size in frames:
+            checkpoint._apply_delta(_loads(data, refs), state, refs)
+        _setstate(searcher, state)
+        checkpoint._size = size
+        checkpoint._reset_counters()
+        checkpoint._previous = checkpoint._copy_state()
+        searcher.checkpoint = checkpoint
+        return searcher
+
+    @staticmethod
+    def _load_snapshot(
+        path: str, frames: Iterator[Tuple[bytes, int]]
+    ) -> Tuple["TileScope", Dict[str, Any], Dict[Any, Any], int]:
+        """
+        Return the searcher of the snapshot with its databases set, the rest
+        of its state, the references for the later frames and the offset of
+        the end of the snapshot.
+        """
+        try:
+            header = pickle.loads(next(frames)[0])
+            snapshot, size = next(frames)
+        except StopIteration as e:
+            raise ValueError(f"{path} does not hold a complete checkpoint") from e
+        if header.get("version") != VERSION:
+            raise ValueError(f"{path} is a checkpoint of an unknown version")
+        searcher_class = getattr(
+            importlib.import_module(header["searcher"][0]), header["searcher"][1]
+        )
+        searcher = searcher_class.__new__(searcher_class)
+        refs = _references(searcher, TileScopePack.from_dict(header["pack"]))
+        searcher.classdb, searcher.ruledb, state = _loads(snapshot, refs)
+        refs.update(classdb=searcher.classdb, ruledb=searcher.ruledb)
+        return cast("TileScope", searcher), state, refs, size
+
+    def _is_empty(self, label: int) -> bool:
+        underlying, tracked = self._databases()
+        if tracked is not None:
+            # pylint: disable=protected-access
+            label = tracked._decompress_key(tracked.label_to_tilings[label])[0]
+        return bool(underlying.empty_list[label])
+
+    def _apply_delta(
+        self, delta: Dict[str, Any], state: Dict[str, Any], refs: Dict[Any, Any]
+    ) -> None:
+        """Add the classes and rules of the delta, and make the changes to the
+        state, which is set on the searcher once every delta is applied."""
+        self._add_classes(delta)
+        self._replay_rules(delta["rules"])
+        changes = _loads(delta["state"], refs)
+        queue = vars(state["classqueue"])
+        for attr, change in changes["searcher"].items():
+            state[attr] = _patch(state.get(attr), change)
+        for attr, change in changes["queue"].items():
+            queue[attr] = _patch(queue.get(attr), change)
+
+    def _add_classes(self, delta: Dict[str, Any]) -> None:
+        underlying, tracked = self._databases()
+        for key in delta["classes"]:
+            underlying.add(key, compressed=True)
+        for label, empty in delta["empty"]:
+            underlying.empty_list[label] = empty
+        if tracked is not None:
+            for key in delta["tilings"]:
+                tracked.add(key, compressed=True)
+            tracked.int_to_assumption_type = delta["assumption_types"]
+            tracked.assumption_type_to_int = {
+                assumption_type: idx
+                for idx, assumption_type in enumerate(tracked.int_to_assumption_type)
+            }
+
+    def _replay_rules(self, journal: List[JournalEntry]) -> None:
+        ruledb = cast(CheckpointRuleDB, self.searcher.ruledb)
+        for start, ends, strategy, possibly_empty, verification, two_way in journal:
+            if possibly_empty:
+                ends = tuple(label for label in ends if not self._is_empty(label))
+            if verification:
+                ruledb.equivdb.set_verified(start)
+            rule = _ReplayedRule(strategy, (None,) * len(ends), two_way)
+            ruledb.add(start, ends, cast(AbstractRule, rule))
@@ -5,6 +5,7 @@ from typing import Callable, Dict
 
 from logzero import logger
 
+from comb_spec_searcher.exception import InvalidOperationError
 from permuta import Perm
 from permuta.misc import DIR_SOUTH, DIR_WEST
 from permuta.permutils import (
@@ -12,8 +13,10 @@ from permuta.permutils import (
     is_insertion_encodable_rightmost,
 )
 from tilings import Tiling
+from tilings.spec_store import SpecStore, enable_spec_store
 from tilings.strategy_pack import TileScopePack
-from tilings.tilescope import TileScope
+from tilings.tilescope import ParallelTileScope, TileScope
+from tilings.verification_cache import enable_verification_cache
 
 PackBuilder = Callable[..., TileScopePack]
 
@@ -93,14 +96,72 @@ def search_spec(args):
     """
     Search for a specification.
     """
-    pack = build_pack(args)
     start_class = Tiling.from_string(args.basis)
-    css = TileScope(start_class, pack)
-    spec = css.auto_search(status_update=30)
+    if args.offline and args.spec_store is None:
+        parser.error("--offline needs --spec-store")
+    if args.verification_cache is not None:
+        enable_verification_cache(args.verification_cache)
+    if args.spec_store is not None:
+        enable_spec_store(args.spec_store, download=not args.offline)
+    css: TileScope
+    if args.resume:
+        if args.checkpoint is None:
+            parser.error("Resuming a search needs the --checkpoint file")
+        ignored = {
+            "--workers": args.workers > 1,
+            "--canonical-symmetries": args.canonical_symmetries,
+            "--length": args.length is not None,
+            "--fusion": args.fusion,
+            "--symmetries": args.symmetries,
+            "--elementary": args.elementary,
+        }
+        given = [flag for flag, is_given in ignored.items() if is_given]
+        if given:
+            parser.error(
+                "A resumed search runs as it was saved in the checkpoint, so "
+                f"{', '.join(given)} can't be given with --resume"
+            )
+        css = TileScope.from_checkpoint(args.checkpoint, args.checkpoint_interval)
+        if css.start_class != start_class:
+            parser.error(f"The checkpoint is not a search for {args.basis}")
+    elif args.workers > 1:
+        css = ParallelTileScope(
+            start_class,
+            build_pack(args),
+            workers=args.workers,
+            canonical_symmetries=args.canonical_symmetries,
+        )
+    else:
+        css = TileScope(
+            start_class,
+            build_pack(args),
+            canonical_symmetries=args.canonical_symmetries,
+        )
+    spec = css.auto_search(
+        status_update=30,
+        checkpoint=args.checkpoint,
+        checkpoint_interval=args.checkpoint_interval,
+    )
     logger.info("The generating function is %s", spec.get_genf())
     return 0
 
 
+def build_store(args):
+    """
+    Download the specifications of the bases into the spec store.
+    """
+    store = SpecStore(args.store)
+    for basis_str in args.bases:
+        basis = [Perm.to_standard(p) for p in basis_str.split("_")]
+        try:
+            store.fetch_basis(basis)
+        except InvalidOperationError:
+            logger.warning("No specification for %s on permpal", basis_str)
+        else:
+            logger.info("Stored the specification for %s", store.basis_key(basis))
+    return 0
+
+
 parser = argparse.ArgumentParser(
     description="A command line tool for the TileScope algorithm."
 )
@@ -139,11 +200,75 @@ parser_tree.add_argument(
 parser_tree.add_argument(
     "-s", "--symmetries", action="store_true", help="Adds symmetries to the pack"
 )
+parser_tree.add_argument(
+    "--canonical-symmetries",
+    action="store_true",
+    help="Only expand the symmetry of each tiling with the smallest bytes, "
+    "rather than adding all the symmetries to the universe.",
+)
 parser_tree.add_argument(
     "-e", "--elementary", action="store_true", help="Makes the pack elementary."
 )
+parser_tree.add_argument(
+    "-w",
+    "--workers",
+    type=int,
+    default=1,
+    help="The number of processes used to apply the strategies.",
+)
+parser_tree.add_argument(
+    "-c",
+    "--checkpoint",
+    type=str,
+    help="Write the state of the search to this file every so often.",
+)
+parser_tree.add_argument(
+    "--checkpoint-interval",
+    type=float,
+    default=600.0,
+    help="The number of seconds between checkpoints, 600 by default.",
+)
+parser_tree.add_argument(
+    "-r",
+    "--resume",
+    action="store_true",
+    help="Resume the search saved in the checkpoint file.",
+)
+parser_tree.add_argument(
+    "--verification-cache",
+    type=str,
+    help="Store the results of verification checks in this database, and reuse "
+    "the results stored by earlier searches.",
+)
+parser_tree.add_argument(
+    "--spec-store",
+    type=str,
+    help="Look up the specifications of one by one verified tilings in this "
+    "directory before downloading them, and store the downloaded ones.",
+)
+parser_tree.add_argument(
+    "--offline",
+    action="store_true",
+    help="Never download specifications, only use the ones in the spec store.",
+)
 parser_tree.set_defaults(func=search_spec)
 
+# Store command
+helpstr = (
+    "Download the specifications of the given bases from permpal into a spec "
+    "store, so that they can be used without network access."
+)
+parser_store = subparsers.add_parser("store", help=helpstr, description=helpstr)
+parser_store.add_argument("store", type=str, help="The directory of the spec store.")
+parser_store.add_argument(
+    "bases",
+    type=str,
+    nargs="+",
+    help="The bases of the permutation classes, in the same format as for the "
+    "spec command, e.g. 012_021.",
+)
+parser_store.set_defaults(func=build_store)
+
 
 def main():
     args = parser.parse_args()
@@ -0,0 +1,499 @@
+"""
+Class databases stored in memory mapped files, so that the universe of a
+search does not need to fit in memory.
+
+The compressed keys are appended to a file, with their end offsets in a second
+file, and a third file holds an open addressing hash table from the keys to
+their labels. The most recently looked up keys are kept in an in memory cache.
+The files are grown by doubling and are memory mapped, so the operating system
+keeps the parts that are used in memory.
+
+>>> import tempfile
+>>> from tilings import Tiling
+>>> with tempfile.TemporaryDirectory() as directory:
+...     classdb = DiskClassDB(directory)
+...     label = classdb.get_label(Tiling.from_string("123"))
+...     classdb.get_class(label) == Tiling.from_string("123")
+True
+"""
+
+import mmap
+import os
+import struct
+from hashlib import blake2b
+from typing import (
+    Any,
+    Dict,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+    cast,
+    overload,
+)
+
+from comb_spec_searcher.class_db import ClassKey, ClassToInfo, LabelToInfo
+
+from . import assumptions
+from .assumptions import TrackingAssumption
+from .misc import LRUCache
+from .tilescope import LazyClassDB, TrackedClassAssumption, TrackedClassDB
+from .tiling import Tiling
+
+__all__ = ("DiskClassDB", "DiskKeyStore", "DiskTrackedClassDB")
+
+_COUNT = struct.Struct("<Q")
+_SLOT = struct.Struct("<QQ")
+_MIN_SIZE = mmap.PAGESIZE
+
+
+def _hash(key: bytes) -> int:
+    """A hash of the key that is the same in every process."""
+    return int.from_bytes(blake2b(key, digest_size=8).digest(), "little")
+
+
+class _MappedFile:
+    """A file that is memory mapped, and grown by doubling when needed."""
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        # pylint: disable=consider-using-with
+        self.file = open(path, "a+b")
+        if os.path.getsize(path) < _MIN_SIZE:
+            self.file.truncate(_MIN_SIZE)
+        self.map = mmap.mmap(self.file.fileno(), 0)
+
+    def __len__(self) -> int:
+        return len(self.map)
+
+    def reserve(self, size: int) -> None:
+        """Grow the file to at least the given size."""
+        if size <= len(self.map):
+            return
+        new_size = len(self.map)
+        while new_size < size:
+            new_size *= 2
+        self.map.close()
+        self.file.truncate(new_size)
+        self.map = mmap.mmap(self.file.fileno(), 0)
+
+    def flush(self) -> None:
+        self.map.flush()
+
+    def close(self) -> None:
+        self.map.close()
+        self.file.close()
+
+
+class DiskKeyStore(Sequence[bytes]):
+    """
+    An append only list of bytes keys stored in the given directory, together
+    with an index from the keys to their position in the list.
+
+    If the directory holds a store, then it is opened with the keys already
+    in it. The store is pickled as the directory and the number of keys, and
+    unpickling it drops any keys appended after it was pickled.
+    """
+
+    def __init__(self, directory: str, cache_size: int = 2**16) -> None:
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self._keys = _MappedFile(os.path.join(directory, "keys"))
+        self._offsets = _MappedFile(os.path.join(directory, "offsets"))
+        self._index = _MappedFile(os.path.join(directory, "index"))
+        self.cache: LRUCache[int] = LRUCache("Disk key", maxsize=cache_size)
+        self._len = cast(int, _COUNT.unpack_from(self._offsets.map, 0)[0])
+        self._capacity = cast(int, _COUNT.unpack_from(self._index.map, 0)[0])
+        if self._capacity == 0:
+            self._resize_index(_MIN_SIZE // _SLOT.size)
+
+    def _end(self, idx: int) -> int:
+        """Return the offset of the end of the key with the given index."""
+        if idx < 0:
+            return 0
+        return cast(int, _COUNT.unpack_from(self._offsets.map, 8 * (idx + 1))[0])
+
+    def _key(self, idx: int) -> bytes:
+        return self._keys.map[self._end(idx - 1) : self._end(idx)]
+
+    @overload
+    def __getitem__(self, idx: int) -> bytes: ...
+
+    @overload
+    def __getitem__(self, idx: slice) -> List[bytes]: ...
+
+    def __getitem__(self, idx: Union[int, slice]) -> Union[bytes, List[bytes]]:
+        if isinstance(idx, slice):
+            return [self._key(i) for i in range(*idx.indices(self._len))]
+        pos = idx + self._len if idx < 0 else idx
+        if not 0 <= pos < self._len:
+            raise IndexError("DiskKeyStore index out of range")
+        return self._key(pos)
+
+    def __len__(self) -> int:
+        return self._len
+
+    def __iter__(self) -> Iterator[bytes]:
+        for idx in range(self._len):
+            yield self._key(idx)
+
+    def __contains__(self, key: object) -> bool:
+        return isinstance(key, bytes) and self.get_label(key) is not None
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, (DiskKeyStore, list)):
+            return NotImplemented
+        return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+
+    def _slot(self, slot: int) -> Tuple[int, int]:
+        return cast(
+            Tuple[int, int], _SLOT.unpack_from(self._index.map, 8 + slot * _SLOT.size)
+        )
+
+    def _find(self, key: bytes, key_hash: int) -> Tuple[int, Optional[int]]:
+        """
+        Return the slot of the key in the index, and its label, or the empty
+        slot where it would be inserted, and None.
+        """
+        mask = self._capacity - 1
+        slot = key_hash & mask
+        while True:
+            slot_hash, label = self._slot(slot)
+            # labels are stored plus one, and labels beyond the end are left
+            # over from an unfinished append
+            if label == 0 or label > self._len:
+                return slot, None
+            if slot_hash == key_hash and self._key(label - 1) == key:
+                return slot, label - 1
+            slot = (slot + 1) & mask
+
+    def get_label(self, key: bytes) -> Optional[int]:
+        """Return the position of the key, or None if it is not stored."""
+        label = self.cache.get(key)
+        if label is None:
+            _, label = self._find(key, _hash(key))
+            if label is not None:
+                self.cache.set(key, label)
+        return label
+
+    def append(self, key: bytes) -> int:
+        """Append the key, which must not be stored, and return its label."""
+        label = self._len
+        start = self._end(label - 1)
+        self._keys.reserve(start + len(key))
+        self._keys.map[start : start + len(key)] = key
+        self._offsets.reserve(8 * (label + 2))
+        _COUNT.pack_into(self._offsets.map, 8 * (label + 1), start + len(key))
+        if 2 * (label + 1) > self._capacity:
+            self._resize_index(2 * self._capacity)
+        key_hash = _hash(key)
+        slot, _ = self._find(key, key_hash)
+        _SLOT.pack_into(self._index.map, 8 + slot * _SLOT.size, key_hash, label + 1)
+        self._len += 1
+        _COUNT.pack_into(self._offsets.map, 0, self._len)
+        self.cache.set(key, label)
+        return label
+
+    def add(self, key: bytes) -> int:
+        """Return the label of the key, appending it if it is not stored."""
+        label = self.get_label(key)
+        if label is None:
+            label = self.append(key)
+        return label
+
+    def _resize_index(self, capacity: int) -> None:
+        """Rebuild the index with the given number of slots, which must be a
+        power of two."""
+        path = self._index.path
+        if os.path.exists(f"{path}.new"):
+            os.remove(f"{path}.new")
+        new_index = _MappedFile(f"{path}.new")
+        new_index.reserve(8 + capacity * _SLOT.size)
+        _COUNT.pack_into(new_index.map, 0, capacity)
+        mask = capacity - 1
+        for old_slot in range(self._capacity):
+            key_hash, label = self._slot(old_slot)
+            if label == 0 or label > self._len:
+                continue
+            slot = key_hash & mask
+            while _SLOT.unpack_from(new_index.map, 8 + slot * _SLOT.size)[1] != 0:
+                slot = (slot + 1) & mask
+            _SLOT.pack_into(new_index.map, 8 + slot * _SLOT.size, key_hash, label)
+        new_index.flush()
+        new_index.close()
+        self._index.close()
+        os.replace(f"{path}.new", path)
+        self._index = _MappedFile(path)
+        self._capacity = capacity
+
+    def truncate(self, length: int) -> None:
+        """Drop the keys after the first length keys."""
+        if length >= self._len:
+            return
+        self._len = length
+        _COUNT.pack_into(self._offsets.map, 0, length)
+        self._resize_index(self._capacity)
+        self.cache.clear()
+
+    @property
+    def labels(self) -> "DiskLabels":
+        """The mapping from the keys to their labels."""
+        return DiskLabels(self)
+
+    def flush(self) -> None:
+        """Write the changes to the files."""
+        for mapped in (self._keys, self._offsets, self._index):
+            mapped.flush()
+
+    def close(self) -> None:
+        """Close the files."""
+        for mapped in (self._keys, self._offsets, self._index):
+            mapped.close()
+
+    def __getstate__(self) -> Dict[str, Any]:
+        self.flush()
+        return {
+            "directory": self.directory,
+            "cache_size": self.cache.maxsize,
+            "len": self._len,
+        }
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__init__(state["directory"], state["cache_size"])  # type: ignore
+        self.truncate(state["len"])
+
+
+class DiskLabels(Mapping[bytes, int]):
+    """The read only mapping from the keys of a DiskKeyStore to their labels.
+    Keys are added by appending them to the store."""
+
+    def __init__(self, store: DiskKeyStore) -> None:
+        self.store = store
+
+    def __getitem__(self, key: bytes) -> int:
+        label = self.store.get_label(key)
+        if label is None:
+            raise KeyError(key)
+        return label
+
+    def __contains__(self, key: object) -> bool:
+        return key in self.store
+
+    def __iter__(self) -> Iterator[bytes]:
+        return iter(self.store)
+
+    def __len__(self) -> int:
+        return len(self.store)
+
+    def values(self):  # type: ignore[override]
+        return range(len(self.store))
+
+
+class DiskEmptyList:
+    """
+    The list of whether each label is empty, stored as one byte per label in a
+    memory mapped file.
+    """
+
+    _DECODE = (None, False, True)
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._file = _MappedFile(path)
+        self._len = cast(int, _COUNT.unpack_from(self._file.map, 0)[0])
+
+    def __getitem__(self, label: int) -> Optional[bool]:
+        if not 0 <= label < self._len:
+            raise IndexError("DiskEmptyList index out of range")
+        return self._DECODE[self._file.map[8 + label]]
+
+    def __setitem__(self, label: int, empty: Optional[bool]) -> None:
+        if not 0 <= label < self._len:
+            raise IndexError("DiskEmptyList index out of range")
+        self._file.map[8 + label] = 0 if empty is None else 1 + empty
+
+    def append(self, empty: Optional[bool]) -> None:
+        self._file.reserve(8 + self._len + 1)
+        self._len += 1
+        self[self._len - 1] = empty
+        _COUNT.pack_into(self._file.map, 0, self._len)
+
+    def truncate(self, length: int) -> None:
+        """Drop the labels after the first length labels."""
+        self._len = min(self._len, length)
+        _COUNT.pack_into(self._file.map, 0, self._len)
+
+    def flush(self) -> None:
+        """Write the changes to the file."""
+        self._file.flush()
+
+    def close(self) -> None:
+        """Close the file."""
+        self._file.close()
+
+    def __iter__(self) -> Iterator[Optional[bool]]:
+        for label in range(self._len):
+            yield self[label]
+
+    def __len__(self) -> int:
+        return self._len
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, (DiskEmptyList, list)):
+            return NotImplemented
+        return list(self) == list(other)
+
+    def __getstate__(self) -> Dict[str, Any]:
+        self.flush()
+        return {"path": self.path, "len": self._len}
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__init__(state["path"])  # type: ignore
+        self.truncate(state["len"])
+
+
+class DiskClassDB(LazyClassDB):
+    """
+    A ClassDB of tilings stored in the given directory. If the directory
+    holds a DiskClassDB then the classes in it are kept.
+    """
+
+    def __init__(self, directory: str, cache_size: int = 2**16) -> None:
+        super().__init__()
+        self.store = DiskKeyStore(directory, cache_size)
+        self.comb_class_list = cast(List[ClassKey], self.store)
+        self.label_dict = cast(Dict[ClassKey, int], self.store.labels)
+        self.empty_list = cast(
+            List[Optional[bool]], DiskEmptyList(os.path.join(directory, "empty"))
+        )
+        self.empty_list.truncate(len(self.store))  # type: ignore
+        while len(self.empty_list) < len(self.store):
+            self.empty_list.append(None)
+        self.class_to_info = ClassToInfo(
+            self.comb_class_list, self.label_dict, self.empty_list
+        )
+        self.label_to_info = LabelToInfo(
+            self.comb_class_list, self.label_dict, self.empty_list
+        )
+
+    def add(self, comb_class: ClassKey, compressed: bool = False) -> None:
+        """
+        Add a tiling, or the compressed tiling if compressed, to the database.
+        """
+        if not compressed:
+            if not isinstance(comb_class, Tiling):
+                raise TypeError("Trying to add something that isn't a Tiling.")
+            comb_class = self._compress(comb_class)
+        if self.store.get_label(cast(bytes, comb_class)) is None:
+            self.store.append(cast(bytes, comb_class))
+            self.empty_list.append(None)
+
+    def flush(self) -> None:
+        """Write the changes to the files."""
+        self.store.flush()
+        cast(DiskEmptyList, self.empty_list).flush()
+
+    def close(self) -> None:
+        """Close the files."""
+        self.store.close()
+        cast(DiskEmptyList, self.empty_list).close()
+
+    def __getstate__(self) -> Dict[str, Any]:
+        state = self.__dict__.copy()
+        # the views are rebuilt from the store
+        for attr in ("comb_class_list", "label_dict", "class_to_info", "label_to_info"):
+            state.pop(attr)
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self.empty_list.truncate(len(self.store))  # type: ignore
+        self.comb_class_list = cast(List[ClassKey], self.store)
+        self.label_dict = cast(Dict[ClassKey, int], self.store.labels)
+        self.class_to_info = ClassToInfo(
+            self.comb_class_list, self.label_dict, self.empty_list
+        )
+        self.label_to_info = LabelToInfo(
+            self.comb_class_list, self.label_dict, self.empty_list
+        )
+
+
+class DiskTrackedClassDB(TrackedClassDB):
+    """
+    A TrackedClassDB stored in the given directory, with the underlying
+    tilings in a DiskClassDB in its subdirectory 'classes'.
+
+    The keys write the types of the assumptions as ints, so the types are
+    listed in order in the file 'assumption_types', and a directory holding
+    tilings but not this file can not be opened.
+    """
+
+    classdb: DiskClassDB
+
+    def __init__(self, directory: str, cache_size: int = 2**16) -> None:
+        super().__init__()
+        self.classdb = DiskClassDB(os.path.join(directory, "classes"), cache_size)
+        self.store = DiskKeyStore(os.path.join(directory, "tilings"), cache_size)
+        self.label_to_tilings = cast(List[bytes], self.store)
+        self.tilings_to_label = cast(Dict[bytes, int], self.store.labels)
+        self.assumption_types_path = os.path.join(directory, "assumption_types")
+        if os.path.exists(self.assumption_types_path):
+            with open(self.assumption_types_path, encoding="utf-8") as f:
+                self.int_to_assumption_type = [
+                    getattr(assumptions, name) for name in f.read().split()
+                ]
+            self.assumption_type_to_int = {
+                ass_type: i for i, ass_type in enumerate(self.int_to_assumption_type)
+            }
+        elif len(self.store) > 0:
+            raise ValueError(
+                f"{directory} has tilings but not the types of their assumptions."
+            )
+        else:
+            self._write_assumption_types()
+
+    def _write_assumption_types(self) -> None:
+        with open(self.assumption_types_path, "w", encoding="utf-8") as f:
+            f.writelines(f"{t.__name__}\n" for t in self.int_to_assumption_type)
+
+    def assumption_to_key(self, ass: TrackingAssumption) -> TrackedClassAssumption:
+        num_types = len(self.int_to_assumption_type)
+        key = super().assumption_to_key(ass)
+        if len(self.int_to_assumption_type) > num_types:
+            self._write_assumption_types()
+        return key
+
+    def add(self, comb_class: ClassKey, compressed: bool = False) -> None:
+        """
+        Adds a Tiling, or its compressed key if compressed, to the classdb
+        """
+        if compressed:
+            self.store.add(cast(bytes, comb_class))
+        elif isinstance(comb_class, Tiling):
+            self.store.add(self._compress_key(self.tiling_to_key(comb_class)))
+
+    def flush(self) -> None:
+        """Write the changes to the files."""
+        self.classdb.flush()
+        self.store.flush()
+
+    def close(self) -> None:
+        """Close the files."""
+        self.classdb.close()
+        self.store.close()
+
+    def __getstate__(self) -> Dict[str, Any]:
+        state = self.__dict__.copy()
+        for attr in ("label_to_tilings", "tilings_to_label"):
+            state.pop(attr)
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self.label_to_tilings = cast(List[bytes], self.store)
+        self.tilings_to_label = cast(Dict[bytes, int], self.store.labels)
+        # the types added after pickling are dropped with the keys
+        self._write_assumption_types()
@@ -9,9 +9,15 @@ from permuta.misc import DIR_EAST, DIR_NORTH, DIR_SOUTH, DIR_WEST, HTMLViewer, U
 
 Cell = Tuple[int, int]
 Position = Tuple[Cell, ...]
+# For each point of a pattern from left to right, its cell and the index of
+# the earlier point with the closest smaller value and closest larger value,
+# or -1 if there is no such point.
+OccurrencePlan = Tuple[Tuple[Cell, int, int], ...]
 
 
 class GriddedPerm(CombinatorialObject):
+    _occurrence_plan: Optional[OccurrencePlan] = None
+
     def __init__(
         self, pattern: Iterable[int] = (), positions: Iterable[Cell] = ()
     ) -> None:
@@ -24,6 +30,19 @@ class GriddedPerm(CombinatorialObject):
             self._patt
         ), "Pattern and positions must have the same length"
         self._cells: FrozenSet[Cell] = frozenset(self._pos)
+        self._hash = hash(self._patt) ^ hash(self._pos)
+
+    @classmethod
+    def from_unchecked(cls, patt: Perm, pos: Tuple[Cell, ...]) -> "GriddedPerm":
+        """Construct a gridded permutation from a Perm and a tuple of cells of
+        the same length, without copying or checking them."""
+        gp = cls.__new__(cls)
+        gp._patt = patt
+        gp._pos = pos
+        gp.len = len(pos)
+        gp._cells = frozenset(pos)
+        gp._hash = hash(patt) ^ hash(pos)
+        return gp
 
     @classmethod
     def single_cell(cls, pattern: Iterable[int], cell: Cell) -> "GriddedPerm":
@@ -74,8 +93,33 @@ class GriddedPerm(CombinatorialObject):
 
     def contains(self, *patts: "GriddedPerm") -> bool:
         """Return true if self contains an occurrence of any of patts."""
+        if OccurrenceMasks.worthwhile(self, len(patts)):
+            return OccurrenceMasks(self).contains(*patts)
         return any(self.contains_patt(patt) for patt in patts)
 
+    @staticmethod
+    def batch_contains(
+        hosts: Iterable["GriddedPerm"], patts: Iterable["GriddedPerm"]
+    ) -> Iterator[Tuple[bool, ...]]:
+        """Yield for each of the hosts a row saying whether it contains each of
+        the patts. The rows are computed as they are asked for, so the caller
+        can stop early."""
+        # pylint: disable=import-outside-toplevel
+        from .algorithms.obstruction_index import ObstructionIndex
+
+        patts = tuple(patts)
+        index = ObstructionIndex(patts)
+        for host in hosts:
+            contained = set(index.contained_obstructions(host))
+            yield tuple(patt in contained for patt in patts)
+
+    def occurrence_plan(self) -> OccurrencePlan:
+        """Return the plan used by OccurrenceMasks to look for occurrences of
+        the gridded permutation."""
+        if self._occurrence_plan is None:
+            self._occurrence_plan = _occurrence_plan(self)
+        return self._occurrence_plan
+
     def contains_patt(self, patt: "GriddedPerm") -> bool:
         """Returns true if self contains an occurrence of patt."""
         # In June 2025 we wrote 10 different containment methods to find the
@@ -716,9 +760,11 @@ class GriddedPerm(CombinatorialObject):
         return f"{self._patt}: {', '.join(str(c) for c in self.pos)}"
 
     def __hash__(self) -> int:
-        return hash(self._patt) ^ hash(self._pos)
+        return self._hash
 
     def __eq__(self, other: object) -> bool:
+        if self is other:
+            return True
         if not isinstance(other, type(self)):
             return False
         return self._patt == other.patt and self._pos == other.pos
@@ -731,3 +777,144 @@ class GriddedPerm(CombinatorialObject):
 
     def __iter__(self) -> Iterator[Tuple[int, Cell]]:
         return zip(self.patt, self.pos)
+
+    def __getstate__(self) -> dict:
+        state = self.__dict__.copy()
+        state.pop("_occurrence_plan", None)
+        return state
+
+
+def _occurrence_plan(gp: GriddedPerm) -> OccurrencePlan:
+    patt = gp.patt
+    res = []
+    for k, cell in enumerate(gp.pos):
+        below = [j for j in range(k) if patt[j] < patt[k]]
+        above = [j for j in range(k) if patt[j] > patt[k]]
+        res.append(
+            (
+                cell,
+                max(below, key=patt.__getitem__) if below else -1,
+                min(above, key=patt.__getitem__) if above else -1,
+            )
+        )
+    return tuple(res)
+
+
+class OccurrenceMasks:
+    """
+    Bitmasks of the points of a gridded permutation, used to check if it
+    contains many patterns.
+
+    For each cell there is a mask of the indices of the points in the cell,
+    and for each point the masks of the indices of the points with smaller
+    and larger values. A pattern is matched from left to right, and the
+    candidates for each point are found by intersecting the mask of its cell
+    with the masks of the points chosen so far, so the last point of the
+    pattern is never looped over.
+    """
+
+    __slots__ = ("_cell_masks", "_below", "_above", "_chosen")
+
+    # For shorter gridded permutations or fewer patterns, building the masks
+    # costs more than GriddedPerm.contains_patt saves by checking the positions
+    # first.
+    MIN_LENGTH = 7
+    MIN_PATTERNS = 4
+
+    def __init__(self, gp: GriddedPerm) -> None:
+        cell_masks: Dict[Cell, int] = {}
+        bit = 1
+        for cell in gp.pos:
+            cell_masks[cell] = cell_masks.get(cell, 0) | bit
+            bit <<= 1
+        below = [0 for _ in gp.pos]
+        mask = 0
+        for idx in sorted(range(gp.len), key=gp.patt.__getitem__):
+            below[idx] = mask
+            mask |= 1 << idx
+        self._cell_masks = cell_masks
+        self._below = below
+        self._above = [mask ^ m ^ (1 << idx) for idx, m in enumerate(below)]
+        self._chosen = [0 for _ in gp.pos]
+
+    @staticmethod
+    def worthwhile(gp: GriddedPerm, num_patterns: int) -> bool:
+        """Return True if checking num_patterns patterns in gp is faster with
+        the masks."""
+        return (
+            gp.len >= OccurrenceMasks.MIN_LENGTH
+            and num_patterns >= OccurrenceMasks.MIN_PATTERNS
+        )
+
+    def contains(self, *patts: GriddedPerm) -> bool:
+        """Return True if the gridded permutation contains any of patts."""
+        return any(self.contains_patt(patt) for patt in patts)
+
+    def contains_patt(self, patt: GriddedPerm) -> bool:
+        """Return True if the gridded permutation contains patt."""
+        plan = patt.occurrence_plan()
+        if len(plan) > len(self._chosen):
+            return False
+        masks = self._cell_candidates(plan)
+        if masks is None:
+            return False
+        if len(plan) <= 1:
+            return True
+        if len(plan) == 2:
+            # the most common case
+            return self._contains_pair(plan, masks[0], masks[1])
+        return self._search(plan, masks)
+
+    def _cell_candidates(self, plan: OccurrencePlan) -> Optional[List[int]]:
+        """Return the masks of the points in the cell of each point of the
+        plan, or None if one of the cells is empty."""
+        masks = []
+        for cell, _, _ in plan:
+            mask = self._cell_masks.get(cell, 0)
+            if not mask:
+                return None
+            masks.append(mask)
+        return masks
+
+    def _contains_pair(self, plan: OccurrencePlan, cand0: int, cand1: int) -> bool:
+        """Return True if a plan of two points occurs, by looping over the
+        candidates for the first point and finding the second with a mask."""
+        relation = self._above if plan[1][1] == 0 else self._below
+        while cand0:
+            low = cand0 & -cand0
+            if cand1 & relation[low.bit_length() - 1] & -(low << 1):
+                return True
+            cand0 ^= low
+        return False
+
+    def _search(self, plan: OccurrencePlan, masks: List[int]) -> bool:
+        """Return True if a plan of at least three points occurs, looping over
+        the candidates for all but the last point."""
+        below, above, chosen = self._below, self._above, self._chosen
+        candidates = [0 for _ in plan]
+        candidates[0] = masks[0]
+        last = len(plan) - 1
+        k = 0
+        while k >= 0:
+            cand = candidates[k]
+            if not cand:
+                k -= 1
+                continue
+            low = cand & -cand
+            candidates[k] = cand ^ low
+            chosen[k] = low.bit_length() - 1
+            k += 1
+            _, smaller, larger = plan[k]
+            # only points to the right of the last point chosen
+            cand = masks[k] & -(low << 1)
+            if smaller >= 0:
+                cand &= above[chosen[smaller]]
+            if larger >= 0:
+                cand &= below[chosen[larger]]
+            if k == last:
+                if cand:
+                    return True
+                k -= 1
+            else:
+                candidates[k] = cand
+        return False
@@ -0,0 +1,143 @@
+"""
+Opt-in interning of gridded permutations and tilings.
+
+When interning is enabled, equal objects passed through an intern table are
+resolved to a single shared instance. The tables only hold weak references,
+so an instance is dropped from its table once nothing else refers to it, and
+each table stops accepting new instances once it holds `maxsize` of them.
+
+>>> from tilings import GriddedPerm
+>>> enable_interning()
+>>> gp = intern_gridded_perm(GriddedPerm((0, 1), ((0, 0), (0, 0))))
+>>> intern_gridded_perm(GriddedPerm((0, 1), ((0, 0), (0, 0)))) is gp
+True
+>>> disable_interning()
+"""
+
+import sys
+import weakref
+from typing import TYPE_CHECKING, Generic, Iterable, Optional, Tuple, TypeVar
+
+from .griddedperm import GriddedPerm
+
+if TYPE_CHECKING:
+    from .tiling import Tiling
+
+__all__ = [
+    "InternTable",
+    "disable_interning",
+    "enable_interning",
+    "intern_gridded_perm",
+    "intern_gridded_perms",
+    "intern_tiling",
+    "interning_status",
+]
+
+T = TypeVar("T")
+
+
+class InternTable(Generic[T]):
+    """
+    A bounded table mapping objects to the shared instance equal to them.
+    """
+
+    def __init__(self, name: str, maxsize: int = 2**20) -> None:
+        self.name = name
+        self.maxsize = maxsize
+        self.enabled = False
+        self.hits = 0
+        self.misses = 0
+        self._table: "weakref.WeakKeyDictionary[T, weakref.ref[T]]" = (
+            weakref.WeakKeyDictionary()
+        )
+
+    def intern(self, obj: T) -> T:
+        """
+        Return the shared instance equal to obj. If there is none, then obj
+        becomes the shared instance if there is room in the table.
+        """
+        if not self.enabled:
+            return obj
+        ref = self._table.get(obj)
+        if ref is not None:
+            shared = ref()
+            if shared is not None:
+                self.hits += 1
+                return shared
+        self.misses += 1
+        if len(self._table) < self.maxsize:
+            self._table[obj] = weakref.ref(obj)
+        return obj
+
+    def clear(self) -> None:
+        """Remove all the instances and reset the counters."""
+        self._table = weakref.WeakKeyDictionary()
+        self.hits = 0
+        self.misses = 0
+
+    def hit_rate(self) -> float:
+        """Return the proportion of calls that returned a shared instance."""
+        calls = self.hits + self.misses
+        return self.hits / calls if calls else 0.0
+
+    def table_size(self) -> int:
+        """Return an estimate of the bytes used by the table itself, not
+        counting the instances it refers to."""
+        # pylint: disable=protected-access
+        data = self._table.data  # type: ignore[attr-defined]
+        return sys.getsizeof(data) + 2 * len(data) * sys.getsizeof(weakref.ref(self))
+
+    def status(self) -> str:
+        """Return a string describing the usage of the table."""
+        return (
+            f"{self.name} intern table: {len(self):,d} of {self.maxsize:,d} "
+            f"entries, {self.hits:,d} hits, {self.misses:,d} misses, "
+            f"hit rate {self.hit_rate():.1%}, table size "
+            f"{self.table_size() / 2**20:.1f} MiB"
+        )
+
+    def __len__(self) -> int:
+        return len(self._table)
+
+
+GRIDDED_PERMS: InternTable[GriddedPerm] = InternTable("GriddedPerm")
+TILINGS: "InternTable[Tiling]" = InternTable("Tiling")
+
+
+def enable_interning(
+    maxsize_gridded_perms: Optional[int] = None, maxsize_tilings: Optional[int] = None
+) -> None:
+    """Turn on interning of gridded perms and tilings."""
+    if maxsize_gridded_perms is not None:
+        GRIDDED_PERMS.maxsize = maxsize_gridded_perms
+    if maxsize_tilings is not None:
+        TILINGS.maxsize = maxsize_tilings
+    GRIDDED_PERMS.enabled = True
+    TILINGS.enabled = True
+
+
+def disable_interning() -> None:
+    """Turn off interning and empty the tables."""
+    for table in (GRIDDED_PERMS, TILINGS):
+        table.enabled = False
+        table.clear()
+
+
+def intern_gridded_perm(gp: GriddedPerm) -> GriddedPerm:
+    """Return the shared instance of the gridded perm."""
+    return GRIDDED_PERMS.intern(gp)
+
+
+def intern_gridded_perms(gps: Iterable[GriddedPerm]) -> Tuple[GriddedPerm, ...]:
+    """Return a tuple of the shared instances of the gridded perms."""
+    return tuple(map(GRIDDED_PERMS.intern, gps))
+
+
+def intern_tiling(tiling: "Tiling") -> "Tiling":
+    """Return the shared instance of the tiling."""
+    return TILINGS.intern(tiling)
+
+
+def interning_status() -> str:
+    """Return a string describing the usage of the intern tables."""
+    return "\n".join(table.status() for table in (GRIDDED_PERMS, TILINGS))
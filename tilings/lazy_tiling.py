@@ -0,0 +1,355 @@
+"""
+The encoder and decoder of the bytes written by `Tiling.to_bytes`, and a view
+of these bytes used by the lazy tilings returned by
+`Tiling.from_bytes(b, lazy=True)`.
+
+The bytes are scanned once for the offsets of the gridded perms. `decode`
+builds the gridded perms while scanning, whereas for a view the obstructions,
+requirements and assumptions are only built when they are first accessed. The
+dimensions, the active and empty cells and whether the tiling is trivially
+empty are read from the bytes without building any gridded perms.
+"""
+
+from itertools import chain, product
+from typing import (
+    Dict,
+    FrozenSet,
+    Iterable,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    Union,
+)
+
+from permuta import Perm
+
+from .assumptions import (
+    SkewComponentAssumption,
+    SumComponentAssumption,
+    TrackingAssumption,
+)
+from .griddedperm import Cell, GriddedPerm
+
+__all__ = ("BYTES_FORMAT_VERSION", "LazyTilingView", "decode", "encode")
+
+BYTES_FORMAT_VERSION = 1
+
+# indexed by the type written by Tiling.to_bytes
+ASSUMPTION_TYPES = (
+    TrackingAssumption,
+    SumComponentAssumption,
+    SkewComponentAssumption,
+)
+
+
+def encode(
+    obstructions: Iterable[GriddedPerm],
+    requirements: Iterable[Iterable[GriddedPerm]],
+    assumptions: Iterable[TrackingAssumption],
+) -> bytes:
+    """
+    Return the bytes of the obstructions, requirements and assumptions in the
+    format described by Tiling.to_bytes.
+    """
+    result = bytearray((BYTES_FORMAT_VERSION,))
+    seen: Dict[GriddedPerm, int] = {}
+
+    def write_int(n: int) -> None:
+        while n > 0x7F:
+            result.append((n & 0x7F) | 0x80)
+            n >>= 7
+        result.append(n)
+
+    def write_gps(gps: Iterable[GriddedPerm]) -> None:
+        gps = tuple(gps)
+        write_int(len(gps))
+        for gp in gps:
+            idx = seen.get(gp)
+            if idx is not None:
+                write_int(2 * idx + 1)
+                continue
+            seen[gp] = len(seen)
+            write_int(2 * len(gp))
+            values = (*gp.patt, *chain.from_iterable(gp.pos))
+            if max(values, default=0) < 0x80:
+                # every varint is a single byte
+                result.extend(values)
+                continue
+            for n in values:
+                write_int(n)
+
+    write_gps(obstructions)
+    requirements = tuple(requirements)
+    write_int(len(requirements))
+    for reqlist in requirements:
+        write_gps(reqlist)
+    assumptions = tuple(assumptions)
+    write_int(len(assumptions))
+    for assumption in assumptions:
+        if isinstance(assumption, SkewComponentAssumption):
+            result.append(2)
+        elif isinstance(assumption, SumComponentAssumption):
+            result.append(1)
+        elif isinstance(assumption, TrackingAssumption):
+            result.append(0)
+        else:
+            raise ValueError("Not a valid assumption.")
+        write_gps(assumption.gps)
+    return bytes(result)
+
+
+def _read_int(buffer: Union[bytes, memoryview], offset: int) -> Tuple[int, int]:
+    """Return the varint at the offset and the offset after it."""
+    n = buffer[offset]
+    offset += 1
+    if n < 0x80:
+        return n, offset
+    n &= 0x7F
+    shift = 7
+    while True:
+        byte = buffer[offset]
+        offset += 1
+        n |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return n, offset
+        shift += 7
+
+
+def _read_values(
+    buffer: Union[bytes, memoryview], offset: int, count: int
+) -> Tuple[Sequence[int], int]:
+    """Return the count varints at the offset and the offset after them."""
+    end = offset + count
+    values = buffer[offset:end]
+    if not count or max(values) < 0x80:
+        # every varint is a single byte
+        return values, end
+    res = []
+    for _ in range(count):
+        n, offset = _read_int(buffer, offset)
+        res.append(n)
+    return res, offset
+
+
+class _Layout(NamedTuple):
+    """
+    The offsets and lengths of the gridded perms written out in full, and
+    the indices of these for the obstructions, the requirement lists and the
+    assumptions, together with their types. The gridded perms are only built
+    if asked for when scanning.
+    """
+
+    offsets: List[int]
+    lengths: List[int]
+    obstructions: Tuple[int, ...]
+    requirements: Tuple[Tuple[int, ...], ...]
+    assumptions: Tuple[Tuple[int, Tuple[int, ...]], ...]
+    assumptions_offset: int
+    gps: List[GriddedPerm]
+
+
+def _gridded_perm(length: int, values: Sequence[int]) -> GriddedPerm:
+    """Return the gridded perm from the values of its pattern and its
+    flattened positions."""
+    return GriddedPerm.from_unchecked(
+        Perm(values[:length]),
+        tuple(zip(values[length::2], values[length + 1 :: 2])),
+    )
+
+
+def _assumption(assumption_type: int, gps: Iterable[GriddedPerm]):
+    """Return the assumption of the type written by Tiling.to_bytes."""
+    if assumption_type >= len(ASSUMPTION_TYPES):
+        raise ValueError("Invalid assumption type.")
+    return ASSUMPTION_TYPES[assumption_type](gps)
+
+
+def _scan(buffer: Union[bytes, memoryview], build: bool = False) -> _Layout:
+    """Return the layout of the bytes of a tiling, with the gridded perms if
+    build is True."""
+    if not buffer or buffer[0] != BYTES_FORMAT_VERSION:
+        raise ValueError("Unknown version of the tiling bytes format.")
+    offset = 1
+    offsets: List[int] = []
+    lengths: List[int] = []
+    gps: List[GriddedPerm] = []
+
+    def read_int() -> int:
+        nonlocal offset
+        n = buffer[offset]
+        offset += 1
+        if n < 0x80:
+            return n
+        n, offset = _read_int(buffer, offset - 1)
+        return n
+
+    def read_gps() -> Tuple[int, ...]:
+        nonlocal offset
+        res = []
+        for _ in range(read_int()):
+            code = read_int()
+            if code & 1:
+                res.append(code >> 1)
+                continue
+            res.append(len(offsets))
+            offsets.append(offset)
+            lengths.append(code >> 1)
+            values, offset = _read_values(buffer, offset, 3 * (code >> 1))
+            if build:
+                gps.append(_gridded_perm(code >> 1, values))
+        return tuple(res)
+
+    obstructions = read_gps()
+    requirements = tuple(read_gps() for _ in range(read_int()))
+    assumptions_offset = offset
+    assumptions = []
+    for _ in range(read_int()):
+        assumption_type = buffer[offset]
+        offset += 1
+        assumptions.append((assumption_type, read_gps()))
+    return _Layout(
+        offsets,
+        lengths,
+        obstructions,
+        requirements,
+        tuple(assumptions),
+        assumptions_offset,
+        gps,
+    )
+
+
+def decode(
+    b: Union[bytes, memoryview],
+) -> Tuple[List[GriddedPerm], List[List[GriddedPerm]], List[TrackingAssumption]]:
+    """
+    Return the obstructions, requirements and assumptions of the tiling
+    compressed by Tiling.to_bytes.
+    """
+    layout = _scan(b, build=True)
+    gps = layout.gps
+    return (
+        [gps[idx] for idx in layout.obstructions],
+        [[gps[idx] for idx in reqlist] for reqlist in layout.requirements],
+        [
+            _assumption(assumption_type, (gps[idx] for idx in idxs))
+            for assumption_type, idxs in layout.assumptions
+        ],
+    )
+
+
+class LazyTilingView:
+    """
+    A view of the bytes of a tiling, which are not copied, that builds the
+    gridded perms when they are first asked for.
+    """
+
+    __slots__ = ("buffer", "layout", "_gps")
+
+    def __init__(self, b: Union[bytes, memoryview]) -> None:
+        self.buffer = memoryview(b)
+        self.layout = _scan(self.buffer)
+        self._gps: Dict[int, GriddedPerm] = {}
+
+    def __reduce__(self):
+        return (type(self), (self.to_bytes(),))
+
+    def to_bytes(self) -> bytes:
+        """Return the bytes of the tiling."""
+        return self.buffer.tobytes()
+
+    def _values(self, idx: int) -> Sequence[int]:
+        """Return the values of the pattern and the flattened positions of the
+        gridded perm with the given index."""
+        values, _ = _read_values(
+            self.buffer, self.layout.offsets[idx], 3 * self.layout.lengths[idx]
+        )
+        return values
+
+    def _gp(self, idx: int) -> GriddedPerm:
+        gp = self._gps.get(idx)
+        if gp is None:
+            gp = _gridded_perm(self.layout.lengths[idx], self._values(idx))
+            self._gps[idx] = gp
+        return gp
+
+    def _cells(self, idx: int) -> Tuple[Cell, ...]:
+        gp = self._gps.get(idx)
+        if gp is not None:
+            return gp.pos
+        n = self.layout.lengths[idx]
+        values = self._values(idx)
+        return tuple(zip(values[n::2], values[n + 1 :: 2]))
+
+    def obstructions(self) -> Tuple[GriddedPerm, ...]:
+        return tuple(map(self._gp, self.layout.obstructions))
+
+    def requirements(self) -> Tuple[Tuple[GriddedPerm, ...], ...]:
+        return tuple(
+            tuple(map(self._gp, reqlist)) for reqlist in self.layout.requirements
+        )
+
+    def assumptions(self) -> Tuple[TrackingAssumption, ...]:
+        return tuple(
+            _assumption(assumption_type, map(self._gp, gps))
+            for assumption_type, gps in self.layout.assumptions
+        )
+
+    def cell_properties(
+        self,
+    ) -> Optional[Tuple[FrozenSet[Cell], FrozenSet[Cell], Tuple[int, int]]]:
+        """
+        Return the active cells, empty cells and dimensions, computed in the
+        same way as Tiling._prepare_properties. Return None if the point
+        obstructions are not exactly the empty cells, as then the obstructions
+        of the tiling would change.
+        """
+        layout = self.layout
+        active_cells: Set[Cell] = set()
+        point_cells: Set[Cell] = set()
+        for idx in layout.obstructions:
+            if layout.lengths[idx] > 1:
+                active_cells.update(self._cells(idx))
+            elif layout.lengths[idx] == 1:
+                point_cells.update(self._cells(idx))
+        for reqlist in layout.requirements:
+            for idx in reqlist:
+                active_cells.update(self._cells(idx))
+        dimensions = (
+            max((cell[0] for cell in active_cells), default=0) + 1,
+            max((cell[1] for cell in active_cells), default=0) + 1,
+        )
+        empty_cells = frozenset(
+            cell
+            for cell in product(range(dimensions[0]), range(dimensions[1]))
+            if cell not in active_cells
+        )
+        if (
+            layout.obstructions
+            and layout.lengths[layout.obstructions[0]] > 0
+            and point_cells != empty_cells
+        ):
+            return None
+        return frozenset(active_cells), empty_cells, dimensions
+
+    def is_empty(self) -> Optional[bool]:
+        """
+        Return True if the tiling has the empty obstruction, False if it has
+        at most one requirement list and no empty obstruction, and otherwise
+        None.
+        """
+        layout = self.layout
+        if any(layout.lengths[idx] == 0 for idx in layout.obstructions):
+            return True
+        if len(layout.requirements) <= 1:
+            return False
+        return None
+
+    def without_assumptions(self) -> "LazyTilingView":
+        """Return the view of the tiling with the assumptions removed."""
+        if not self.layout.assumptions:
+            return self
+        offset = self.layout.assumptions_offset
+        return LazyTilingView(self.buffer[:offset].tobytes() + b"\x00")
@@ -3,13 +3,18 @@ Collection of function that are not directly related to the code but still
 useful.
 """
 
+from collections import OrderedDict
 from functools import reduce
 from typing import (
+    Callable,
     Collection,
     Dict,
+    Generic,
+    Hashable,
     Iterable,
     Iterator,
     List,
+    Optional,
     Sequence,
     Set,
     Tuple,
@@ -18,6 +23,7 @@ from typing import (
 
 Vertex = TypeVar("Vertex")
 T = TypeVar("T")
+V = TypeVar("V")
 AdjTable = Dict[Vertex, Set[Vertex]]
 Cell = Tuple[int, int]
 
@@ -193,3 +199,111 @@ def algorithm_u(ns: Sequence[T], m: int):
     for j in range(1, m + 1):
         a[n - m + j] = j - 1
     return f(m, n, 0, n, a)
+
+
+class LRUCache(Generic[V]):
+    """
+    A dictionary holding values of total size at most maxsize, discarding the
+    least recently used value when full, that counts its hits and misses.
+
+    The size of a value is given by sizeof, and is 1 if sizeof is None.
+
+    >>> cache: LRUCache[int] = LRUCache("squares", maxsize=2)
+    >>> cache.set(1, 1); cache.set(2, 4); cache.get(1)
+    1
+    >>> cache.set(3, 9); cache.get(2) is None
+    True
+    >>> cache.hits, cache.misses
+    (1, 1)
+    >>> words: LRUCache[str] = LRUCache("words", maxsize=8, sizeof=len)
+    >>> words.set(1, "one"); words.set(2, "two"); words.set(3, "three")
+    >>> sorted(words), words.size
+    ([2, 3], 8)
+    """
+
+    def __init__(
+        self, name: str, maxsize: int, sizeof: Optional[Callable[[V], int]] = None
+    ) -> None:
+        self.name = name
+        self.maxsize = maxsize
+        self.sizeof = sizeof
+        self.enabled = True
+        self.hits = 0
+        self.misses = 0
+        self._size = 0
+        self._data: "OrderedDict[Hashable, V]" = OrderedDict()
+        self._sizes: Dict[Hashable, int] = {}
+
+    def get(self, key: Hashable) -> Optional[V]:
+        """Return the value stored for key, or None if there is none."""
+        res = self._data.get(key)
+        if res is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+            self._data.move_to_end(key)
+        return res
+
+    def set(self, key: Hashable, value: V) -> None:
+        """Store the value for key, discarding the least recently used."""
+        if self.maxsize <= 0:
+            return
+        if self.sizeof is None:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+            return
+        size = self.sizeof(value)
+        if key in self._data:
+            self._size -= self._sizes[key]
+        self._data[key] = value
+        self._data.move_to_end(key)
+        self._sizes[key] = size
+        self._size += size
+        while self._size > self.maxsize:
+            old_key, _ = self._data.popitem(last=False)
+            self._size -= self._sizes.pop(old_key)
+
+    def clear(self) -> None:
+        """Remove all the values and reset the counters."""
+        self._data.clear()
+        self._sizes.clear()
+        self._size = 0
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def size(self) -> int:
+        """The total size of the values stored."""
+        if self.sizeof is None:
+            return len(self._data)
+        return self._size
+
+    def hit_rate(self) -> float:
+        """Return the proportion of lookups that found a value."""
+        calls = self.hits + self.misses
+        return self.hits / calls if calls else 0.0
+
+    def status(self) -> str:
+        """Return a string describing the usage of the cache."""
+        if self.sizeof is None:
+            usage = f"{len(self):,d} of {self.maxsize:,d} entries"
+        else:
+            usage = (
+                f"{len(self):,d} entries of size {self.size:,d} of {self.maxsize:,d}"
+            )
+        return (
+            f"{self.name} cache: {usage}, "
+            f"{self.hits:,d} hits, {self.misses:,d} misses, "
+            f"hit rate {self.hit_rate():.1%}"
+        )
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._data
+
+    def __iter__(self) -> Iterator[Hashable]:
+        return iter(self._data)
+
+    def __len__(self) -> int:
+        return len(self._data)
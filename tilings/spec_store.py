@@ -0,0 +1,183 @@
+"""
+A local store of the json documents describing specifications, so that a
+specification only needs to be downloaded once, and searches can run on
+machines without network access once the store is built.
+
+The documents from permpal are stored by the lexicographically minimal
+symmetry of their basis, so a class and its symmetries share a document, and
+other documents by the uri they were downloaded from.
+
+>>> import tempfile
+>>> from permuta import Perm
+>>> with tempfile.TemporaryDirectory() as directory:
+...     store = SpecStore(directory, download=False)
+...     store.set_basis([Perm((1, 0, 2))], {"specs_and_eqs": []})
+...     store.get_basis([Perm((2, 0, 1))])
+{'specs_and_eqs': []}
+"""
+
+import json
+import os
+from hashlib import blake2b
+from typing import Iterable, Optional, cast
+
+import requests
+
+from comb_spec_searcher import CombinatorialSpecification
+from comb_spec_searcher.exception import InvalidOperationError
+from permuta import Perm
+from permuta.permutils import lex_min
+
+__all__ = [
+    "SpecStore",
+    "disable_spec_store",
+    "enable_spec_store",
+    "fetch_basis",
+    "get_spec_store",
+]
+
+PERMPAL_BASIS_URI = "https://permpal.com/perms/raw_data_json/basis/{}"
+
+
+class SpecStore:
+    """
+    A directory with the json documents of specifications. If download is
+    True, then the documents that are not in the store are downloaded and
+    added to it.
+    """
+
+    def __init__(self, path: str, download: bool = True) -> None:
+        self.path = path
+        self.download = download
+        for kind in ("basis", "uri"):
+            os.makedirs(os.path.join(path, kind), exist_ok=True)
+
+    @staticmethod
+    def basis_key(basis: Iterable[Perm]) -> str:
+        """Return the string of the lexicographically minimal symmetry of the
+        basis, e.g., 012_0321."""
+        return "_".join(map(str, lex_min(list(basis))))
+
+    @staticmethod
+    def download_basis(basis: Iterable[Perm]) -> dict:
+        """Return the document for the basis on permpal."""
+        uri = PERMPAL_BASIS_URI.format(SpecStore.basis_key(basis))
+        request = requests.get(uri, timeout=10)
+        if request.status_code == 404:
+            raise InvalidOperationError("Can't find spec for one by one verified rule.")
+        return cast(dict, request.json())
+
+    def _file(self, kind: str, name: str) -> str:
+        return os.path.join(self.path, kind, f"{name}.json")
+
+    @staticmethod
+    def _read(path: str) -> Optional[dict]:
+        try:
+            with open(path, encoding="utf-8") as f:
+                return cast(dict, json.load(f))
+        except FileNotFoundError:
+            return None
+
+    @staticmethod
+    def _write(path: str, data: dict) -> None:
+        # write to a temporary file first so that other processes never read a
+        # partially written document
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        os.replace(tmp, path)
+
+    def get_basis(self, basis: Iterable[Perm]) -> Optional[dict]:
+        """Return the document stored for the basis, or None if there is none."""
+        return self._read(self._file("basis", self.basis_key(basis)))
+
+    def set_basis(self, basis: Iterable[Perm], data: dict) -> None:
+        """Store the document for the basis."""
+        self._write(self._file("basis", self.basis_key(basis)), data)
+
+    def fetch_basis(self, basis: Iterable[Perm]) -> dict:
+        """
+        Return the document for the basis, downloading it from permpal if it
+        is not in the store.
+        """
+        basis = tuple(basis)
+        data = self.get_basis(basis)
+        if data is None:
+            if not self.download:
+                raise InvalidOperationError(
+                    f"No spec for the basis {self.basis_key(basis)} in the store."
+                )
+            data = self.download_basis(basis)
+            self.set_basis(basis, data)
+        return data
+
+    def add_specification(self, spec: CombinatorialSpecification) -> None:
+        """
+        Store a specification whose root is a 1x1 tiling without requirements,
+        in the same format as permpal, e.g., one found by a local search.
+        """
+        root = spec.root
+        if root.dimensions != (1, 1) or root.requirements:
+            raise ValueError(
+                "The root of the specification must be a 1x1 tiling without "
+                "requirements."
+            )
+        self.set_basis(
+            (ob.patt for ob in root.obstructions),
+            {"specs_and_eqs": [{"spec_json": spec.to_jsonable()}]},
+        )
+
+    @staticmethod
+    def _uri_key(uri: str) -> str:
+        return blake2b(uri.encode(), digest_size=16).hexdigest()
+
+    def get_uri(self, uri: str) -> Optional[dict]:
+        """Return the document stored for the uri, or None if there is none."""
+        return self._read(self._file("uri", self._uri_key(uri)))
+
+    def set_uri(self, uri: str, data: dict) -> None:
+        """Store the document for the uri."""
+        self._write(self._file("uri", self._uri_key(uri)), data)
+
+    def fetch_uri(self, uri: str) -> dict:
+        """
+        Return the document for the uri, downloading it if it is not in the
+        store.
+        """
+        data = self.get_uri(uri)
+        if data is None:
+            if not self.download:
+                raise InvalidOperationError(f"No document for {uri} in the store.")
+            data = requests.get(uri, timeout=10).json()
+            self.set_uri(uri, data)
+        return data
+
+
+_STORE: Optional[SpecStore] = None
+
+
+def enable_spec_store(path: str, download: bool = True) -> None:
+    """Use the store in the directory for the specifications from permpal."""
+    global _STORE  # pylint: disable=global-statement
+    _STORE = SpecStore(path, download)
+
+
+def disable_spec_store() -> None:
+    """Stop using the spec store."""
+    global _STORE  # pylint: disable=global-statement
+    _STORE = None
+
+
+def get_spec_store() -> Optional[SpecStore]:
+    """Return the spec store if it is enabled."""
+    return _STORE
+
+
+def fetch_basis(basis: Iterable[Perm]) -> dict:
+    """
+    Return the permpal document for the basis, using the spec store if it is
+    enabled.
+    """
+    if _STORE is not None:
+        return _STORE.fetch_basis(basis)
+    return SpecStore.download_basis(basis)
@@ -2,7 +2,17 @@ from collections import defaultdict
 from functools import reduce
 from itertools import product
 from operator import mul
-from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    FrozenSet,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+)
 
 from sympy import Eq, Function, var
 
@@ -196,7 +206,7 @@ class SplittingStrategy(Strategy[Tiling, GriddedPerm]):
         return (new_tiling,)
 
     def _split_assumption(
-        self, assumption: TrackingAssumption, components: Tuple[Set[Cell], ...]
+        self, assumption: TrackingAssumption, components: Tuple[FrozenSet[Cell], ...]
     ) -> List[TrackingAssumption]:
         if isinstance(assumption, SkewComponentAssumption):
             return self._split_skew_assumption(assumption)
@@ -206,7 +216,7 @@ class SplittingStrategy(Strategy[Tiling, GriddedPerm]):
 
     @staticmethod
     def _split_tracking_assumption(
-        assumption: TrackingAssumption, components: Tuple[Set[Cell], ...]
+        assumption: TrackingAssumption, components: Tuple[FrozenSet[Cell], ...]
     ) -> List[TrackingAssumption]:
         split_gps: List[List[GriddedPerm]] = [[] for _ in range(len(components))]
         for gp in assumption.gps:
@@ -79,7 +79,7 @@ class FactorStrategy(CartesianProductStrategy[Tiling, GriddedPerm]):
         )
 
     def decomposition_function(self, comb_class: Tiling) -> Tuple[Tiling, ...]:
-        return tuple(comb_class.sub_tiling(cells) for cells in self.partition)
+        return comb_class.sub_tilings(self.partition)
 
     def extra_parameters(
         self, comb_class: Tiling, children: Optional[Tuple[Tiling, ...]] = None
@@ -94,7 +94,7 @@ class FactorStrategy(CartesianProductStrategy[Tiling, GriddedPerm]):
         ):
             for idx, child in enumerate(children):
                 new_assumption = child.forward_map.map_assumption(assumption).avoiding(
-                    child.obstructions
+                    child.obstruction_index
                 )
                 if new_assumption.gps:
                     child_var = child.get_assumption_parameter(new_assumption)
@@ -396,8 +396,8 @@ class FusionFactory(StrategyFactory[Tiling]):
         return self.__class__(tracked=True, isolation_level=self.isolation_level)
 
     def __call__(self, comb_class: Tiling) -> Iterator[Rule]:
-        cols, rows = comb_class.dimensions
-        for row_idx in range(rows - 1):
+        rows, cols = Fusion.candidate_rows_and_cols(comb_class)
+        for row_idx in rows:
             algo = Fusion(
                 comb_class,
                 row_idx=row_idx,
@@ -409,7 +409,7 @@ class FusionFactory(StrategyFactory[Tiling]):
                 yield FusionStrategy(row_idx=row_idx, tracked=self.tracked)(
                     comb_class, (fused_tiling,)
                 )
-        for col_idx in range(cols - 1):
+        for col_idx in cols:
             algo = Fusion(
                 comb_class,
                 col_idx=col_idx,
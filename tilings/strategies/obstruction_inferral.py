@@ -47,7 +47,7 @@ class ObstructionInferralStrategy(DisjointUnionStrategy[Tiling, GriddedPerm]):
         params: Dict[str, str] = {}
         for assumption in comb_class.assumptions:
             mapped_assumption = child.forward_map.map_assumption(assumption).avoiding(
-                child.obstructions
+                child.obstruction_index
             )
             if mapped_assumption.gps:
                 parent_var = comb_class.get_assumption_parameter(assumption)
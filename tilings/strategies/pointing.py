@@ -154,7 +154,7 @@ class PointingStrategy(Strategy[Tiling, GriddedPerm]):
         for child, cell in zip(children, sorted(cells)):
             params: Dict[str, str] = {}
             mapped_assumptions = [
-                child.forward_map.map_assumption(ass).avoiding(child.obstructions)
+                child.forward_map.map_assumption(ass).avoiding(child.obstruction_index)
                 for ass in algo.stretched_assumptions(cell)
             ]
             for ass, mapped_ass in zip(comb_class.assumptions, mapped_assumptions):
@@ -93,13 +93,13 @@ class RequirementInsertionStrategy(DisjointUnionStrategy[Tiling, GriddedPerm]):
         for assumption in comb_class.assumptions:
             parent_var = comb_class.get_assumption_parameter(assumption)
             av_mapped_assumption = av.forward_map.map_assumption(assumption).avoiding(
-                av.obstructions
+                av.obstruction_index
             )
             if av_mapped_assumption.gps:
                 child_var = av.get_assumption_parameter(av_mapped_assumption)
                 av_params[parent_var] = child_var
             co_mapped_assumption = co.forward_map.map_assumption(assumption).avoiding(
-                co.obstructions
+                co.obstruction_index
             )
             if co_mapped_assumption.gps:
                 child_var = co.get_assumption_parameter(co_mapped_assumption)
@@ -648,8 +648,10 @@ class TargetedCellInsertionFactory(AbstractRequirementInsertionFactory):
         reqs_and_obs: Set[GriddedPerm] = set(
             chain(tiling.obstructions, *tiling.requirements)
         )
-        for cells in potential_factors:
-            if self.verified(tiling.sub_tiling(cells)):
+        for cells, sub_tiling in zip(
+            potential_factors, tiling.sub_tilings(potential_factors)
+        ):
+            if self.verified(sub_tiling):
                 for gp in reqs_and_obs:
                     if any(cell in cells for cell in gp.pos) and any(
                         cell not in cells for cell in gp.pos
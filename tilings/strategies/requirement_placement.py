@@ -94,7 +94,7 @@ class RequirementPlacementStrategy(DisjointUnionStrategy[Tiling, GriddedPerm]):
             for assumption in comb_class.assumptions:
                 mapped_assumption = child.forward_map.map_assumption(
                     assumption
-                ).avoiding(child.obstructions)
+                ).avoiding(child.obstruction_index)
                 if mapped_assumption.gps:
                     parent_var = comb_class.get_assumption_parameter(assumption)
                     child_var = child.get_assumption_parameter(mapped_assumption)
@@ -103,7 +103,7 @@ class RequirementPlacementStrategy(DisjointUnionStrategy[Tiling, GriddedPerm]):
             zip(self._placed_cells, children[1:] if self.include_empty else children)
         ):
             mapped_assumptions = [
-                child.forward_map.map_assumption(ass).avoiding(child.obstructions)
+                child.forward_map.map_assumption(ass).avoiding(child.obstruction_index)
                 for ass in algo.stretched_assumptions(cell)
             ]
             for assumption, mapped_assumption in zip(
@@ -648,32 +648,43 @@ class FusableRowAndColumnPlacementFactory(RowAndColumnPlacementFactory):
             gp = GriddedPerm((0,), (cell,))
             cols[cell[0]].add(gp)
             rows[cell[1]].add(gp)
+        candidate_rows, candidate_cols = Fusion.candidate_rows_and_cols(tiling)
         if self.place_col:
             fusable_indices = set(
                 chain.from_iterable(
                     (idx, idx + 1)
-                    for idx in range(tiling.dimensions[0] - 1)
+                    for idx in candidate_cols
                     if Fusion(tiling, col_idx=idx).fusable()
                 )
             )
-            fusable_cols = [cols[idx] for idx in fusable_indices]
-            col_dirs = tuple(d for d in self.dirs if d in (DIR_EAST, DIR_WEST))
-            for gps, direction in product(fusable_cols, col_dirs):
-                indices = tuple(0 for _ in gps)
-                yield tuple(gps), indices, direction
+            yield from self._line_placements(
+                cols, fusable_indices, (DIR_EAST, DIR_WEST)
+            )
         if self.place_row:
             fusable_indices = set(
                 chain.from_iterable(
                     (idx, idx + 1)
-                    for idx in range(tiling.dimensions[1] - 1)
+                    for idx in candidate_rows
                     if Fusion(tiling, row_idx=idx).fusable()
                 )
             )
-            fusable_rows = [rows[idx] for idx in fusable_indices]
-            row_dirs = tuple(d for d in self.dirs if d in (DIR_NORTH, DIR_SOUTH))
-            for gps, direction in product(fusable_rows, row_dirs):
-                indices = tuple(0 for _ in gps)
-                yield tuple(gps), indices, direction
+            yield from self._line_placements(
+                rows, fusable_indices, (DIR_NORTH, DIR_SOUTH)
+            )
+
+    def _line_placements(
+        self,
+        lines: Dict[int, Set[GriddedPerm]],
+        indices: Iterable[int],
+        line_dirs: Tuple[int, ...],
+    ) -> Iterator[Tuple[Tuple[GriddedPerm, ...], Tuple[int, ...], int]]:
+        """
+        Yield the placements of the points in each of the lines with the given
+        indices, in the directions of self.dirs that are in line_dirs.
+        """
+        dirs = tuple(d for d in self.dirs if d in line_dirs)
+        for gps, direction in product([lines[idx] for idx in indices], dirs):
+            yield tuple(gps), tuple(0 for _ in gps), direction
 
     def __str__(self) -> str:
         return "fusable " + super().__str__()
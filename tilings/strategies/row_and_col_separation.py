@@ -71,7 +71,7 @@ class RowColumnSeparationStrategy(DisjointUnionStrategy[Tiling, GriddedPerm]):
                     for gp in ass.gps
                     if all(cell in self.forward_cell_map(comb_class) for cell in gp.pos)
                 )
-            ).avoiding(child.obstructions)
+            ).avoiding(child.obstruction_index)
             for ass in comb_class.assumptions
         )
         return (
@@ -1,7 +1,17 @@
 import abc
-from functools import partial
 from itertools import chain, combinations
-from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple, Type, cast
+from typing import (
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    Type,
+    cast,
+)
 
 from comb_spec_searcher import StrategyFactory, SymmetryStrategy
 from comb_spec_searcher.exception import StrategyDoesNotApply
@@ -13,14 +23,24 @@ from tilings.assumptions import (
     SumComponentAssumption,
     TrackingAssumption,
 )
+from tilings.tiling import Cell
 
 __all__ = ("SymmetriesFactory",)
 
 
 class TilingSymmetryStrategy(SymmetryStrategy[Tiling, GriddedPerm]):
+    @staticmethod
+    @abc.abstractmethod
+    def cell_transform(tiling: Tiling) -> Callable[[Cell], Cell]:
+        """Return the mapping of the cells of the tiling to its symmetry."""
+
+    @staticmethod
     @abc.abstractmethod
+    def gp_symmetry(gp: GriddedPerm, transf: Callable[[Cell], Cell]) -> GriddedPerm:
+        """The method of GriddedPerm for the symmetry."""
+
     def gp_transform(self, tiling: Tiling, gp: GriddedPerm) -> GriddedPerm:
-        pass
+        return self.gp_symmetry(gp, self.cell_transform(tiling))
 
     @abc.abstractmethod
     def inverse_gp_transform(self, tiling: Tiling, gp: GriddedPerm) -> GriddedPerm:
@@ -50,23 +70,10 @@ class TilingSymmetryStrategy(SymmetryStrategy[Tiling, GriddedPerm]):
 
     def decomposition_function(self, comb_class: Tiling) -> Tuple[Tiling, ...]:
         return (
-            Tiling(
-                tuple(
-                    map(partial(self.gp_transform, comb_class), comb_class.obstructions)
-                ),
-                tuple(
-                    tuple(map(partial(self.gp_transform, comb_class), req))
-                    for req in comb_class.requirements
-                ),
-                tuple(
-                    self.__class__.assumption_type_transform(ass)(
-                        map(partial(self.gp_transform, comb_class), ass.gps)
-                    )
-                    for ass in comb_class.assumptions
-                ),
-                remove_empty_rows_and_cols=False,
-                derive_empty=False,
-                simplify=False,
+            comb_class._symmetry(  # pylint: disable=protected-access
+                self.cell_transform(comb_class),
+                self.gp_symmetry,
+                self.__class__.assumption_type_transform,
             ),
         )
 
@@ -128,11 +135,16 @@ class TilingReverse(TilingSymmetryStrategy):
     Flips the tiling on its vertical axis.
     """
 
-    def gp_transform(self, tiling: Tiling, gp: GriddedPerm) -> GriddedPerm:
+    @staticmethod
+    def cell_transform(tiling: Tiling) -> Callable[[Cell], Cell]:
         def reverse_cell(cell):
             return (tiling.dimensions[0] - cell[0] - 1, cell[1])
 
-        return gp.reverse(reverse_cell)
+        return reverse_cell
+
+    @staticmethod
+    def gp_symmetry(gp: GriddedPerm, transf: Callable[[Cell], Cell]) -> GriddedPerm:
+        return gp.reverse(transf)
 
     def inverse_gp_transform(self, tiling: Tiling, gp: GriddedPerm) -> GriddedPerm:
         return self.gp_transform(tiling, gp)
@@ -151,11 +163,16 @@ class TilingComplement(TilingSymmetryStrategy):
     Flips the tiling over the horizontal axis.
     """
 
-    def gp_transform(self, tiling: Tiling, gp: GriddedPerm) -> GriddedPerm:
+    @staticmethod
+    def cell_transform(tiling: Tiling) -> Callable[[Cell], Cell]:
         def complement_cell(cell):
             return (cell[0], tiling.dimensions[1] - cell[1] - 1)
 
-        return gp.complement(complement_cell)
+        return complement_cell
+
+    @staticmethod
+    def gp_symmetry(gp: GriddedPerm, transf: Callable[[Cell], Cell]) -> GriddedPerm:
+        return gp.complement(transf)
 
     def inverse_gp_transform(self, tiling: Tiling, gp: GriddedPerm) -> GriddedPerm:
         return self.gp_transform(tiling, gp)
@@ -174,11 +191,16 @@ class TilingInverse(TilingSymmetryStrategy):
     Flips the tiling over the diagonal.
     """
 
-    def gp_transform(self, tiling: Tiling, gp: GriddedPerm) -> GriddedPerm:
+    @staticmethod
+    def cell_transform(tiling: Tiling) -> Callable[[Cell], Cell]:
         def inverse_cell(cell):
             return (cell[1], cell[0])
 
-        return gp.inverse(inverse_cell)
+        return inverse_cell
+
+    @staticmethod
+    def gp_symmetry(gp: GriddedPerm, transf: Callable[[Cell], Cell]) -> GriddedPerm:
+        return gp.inverse(transf)
 
     def inverse_gp_transform(self, tiling: Tiling, gp: GriddedPerm) -> GriddedPerm:
         return self.gp_transform(tiling, gp)
@@ -197,14 +219,19 @@ class TilingAntidiagonal(TilingSymmetryStrategy):
     Flips the tiling over the antidiagonal.
     """
 
-    def gp_transform(self, tiling: Tiling, gp: GriddedPerm) -> GriddedPerm:
+    @staticmethod
+    def cell_transform(tiling: Tiling) -> Callable[[Cell], Cell]:
         def antidiagonal_cell(cell):
             return (
                 tiling.dimensions[1] - cell[1] - 1,
                 tiling.dimensions[0] - cell[0] - 1,
             )
 
-        return gp.antidiagonal(antidiagonal_cell)
+        return antidiagonal_cell
+
+    @staticmethod
+    def gp_symmetry(gp: GriddedPerm, transf: Callable[[Cell], Cell]) -> GriddedPerm:
+        return gp.antidiagonal(transf)
 
     def inverse_gp_transform(self, tiling: Tiling, gp: GriddedPerm) -> GriddedPerm:
         def antidiagonal_cell(cell):
@@ -229,11 +256,16 @@ class TilingRotate90(TilingSymmetryStrategy):
     Rotate the tiling 90 degrees clockwise.
     """
 
-    def gp_transform(self, tiling: Tiling, gp: GriddedPerm) -> GriddedPerm:
+    @staticmethod
+    def cell_transform(tiling: Tiling) -> Callable[[Cell], Cell]:
         def rotate90_cell(cell):
             return (cell[1], tiling.dimensions[0] - cell[0] - 1)
 
-        return gp.rotate90(rotate90_cell)
+        return rotate90_cell
+
+    @staticmethod
+    def gp_symmetry(gp: GriddedPerm, transf: Callable[[Cell], Cell]) -> GriddedPerm:
+        return gp.rotate90(transf)
 
     def inverse_gp_transform(self, tiling: Tiling, gp: GriddedPerm) -> GriddedPerm:
         def rotate270_cell(cell):
@@ -255,14 +287,19 @@ class TilingRotate180(TilingSymmetryStrategy):
     Rotate the tiling 180 degrees clockwise.
     """
 
-    def gp_transform(self, tiling: Tiling, gp: GriddedPerm) -> GriddedPerm:
+    @staticmethod
+    def cell_transform(tiling: Tiling) -> Callable[[Cell], Cell]:
         def rotate180_cell(cell):
             return (
                 tiling.dimensions[0] - cell[0] - 1,
                 tiling.dimensions[1] - cell[1] - 1,
             )
 
-        return gp.rotate180(rotate180_cell)
+        return rotate180_cell
+
+    @staticmethod
+    def gp_symmetry(gp: GriddedPerm, transf: Callable[[Cell], Cell]) -> GriddedPerm:
+        return gp.rotate180(transf)
 
     def inverse_gp_transform(self, tiling: Tiling, gp: GriddedPerm) -> GriddedPerm:
         return self.gp_transform(tiling, gp)
@@ -281,11 +318,16 @@ class TilingRotate270(TilingSymmetryStrategy):
     Rotate the tiling 270 degrees clockwise.
     """
 
-    def gp_transform(self, tiling: Tiling, gp: GriddedPerm) -> GriddedPerm:
+    @staticmethod
+    def cell_transform(tiling: Tiling) -> Callable[[Cell], Cell]:
         def rotate270_cell(cell):
             return (tiling.dimensions[1] - cell[1] - 1, cell[0])
 
-        return gp.rotate270(rotate270_cell)
+        return rotate270_cell
+
+    @staticmethod
+    def gp_symmetry(gp: GriddedPerm, transf: Callable[[Cell], Cell]) -> GriddedPerm:
+        return gp.rotate270(transf)
 
     def inverse_gp_transform(self, tiling: Tiling, gp: GriddedPerm) -> GriddedPerm:
         def rotate90_cell(cell):
@@ -4,7 +4,6 @@ from itertools import chain
 from operator import mul
 from typing import Any, Callable, Dict, Iterable, Iterator, Optional, Tuple, cast
 
-import requests
 from sympy import Eq, Expr, Function, Symbol, collect, degree, solve, sympify, var
 
 from comb_spec_searcher import (
@@ -21,12 +20,12 @@ from permuta import Av, Perm
 from permuta.permutils import (
     is_insertion_encodable_maximum,
     is_insertion_encodable_rightmost,
-    lex_min,
 )
 from tilings import GriddedPerm, Tiling
-from tilings.algorithms import locally_factorable_shift
+from tilings.algorithms import Factor, locally_factorable_shift
 from tilings.algorithms.enumeration import LocalEnumeration, MonotoneTreeEnumeration
 from tilings.assumptions import ComponentAssumption, TrackingAssumption
+from tilings.spec_store import fetch_basis
 from tilings.strategies import (
     DetectComponentsStrategy,
     FactorFactory,
@@ -35,6 +34,7 @@ from tilings.strategies import (
     RequirementCorroborationFactory,
     SymmetriesFactory,
 )
+from tilings.verification_cache import cached_verification
 
 from .abstract import BasisAwareVerificationStrategy
 
@@ -53,6 +53,14 @@ __all__ = [
 TileScopeVerificationStrategy = VerificationStrategy[Tiling, GriddedPerm]
 
 
+def _has_one_factor(tiling: Tiling) -> bool:
+    """
+    Return True if the tiling has a single factor, as given by
+    `Tiling.find_factors`, without building the factors.
+    """
+    return len(Factor(tiling).get_components()) == 1 or tiling.is_empty()
+
+
 class BasicVerificationStrategy(AtomStrategy):
     """
     TODO: can this be moved to the CSS atom strategy?
@@ -134,13 +142,10 @@ class OneByOneVerificationRule(VerificationRule[Tiling, GriddedPerm]):
         funcs: Optional[Dict[Tiling, Function]] = None,
     ) -> Eq:
         # Find the minimal polynomial for the underlying class
-        basis = [ob.patt for ob in self.comb_class.obstructions]
-        basis_str = "_".join(map(str, lex_min(basis)))
-        uri = f"https://permpal.com/perms/raw_data_json/basis/{basis_str}"
-        request = requests.get(uri, timeout=10)
-        if request.status_code == 404:
+        try:
+            data = fetch_basis(ob.patt for ob in self.comb_class.obstructions)
+        except InvalidOperationError:
             return super().get_equation(get_function, funcs)
-        data = request.json()
         min_poly = data["min_poly_maple"]
         if min_poly is None:
             return Eq(
@@ -240,13 +245,11 @@ class OneByOneVerificationStrategy(BasisAwareVerificationStrategy):
 
     @staticmethod
     def _spec_from_permpal(tiling: Tiling) -> CombinatorialSpecification:
-        basis = [ob.patt for ob in tiling.obstructions]
-        basis_str = "_".join(map(str, lex_min(basis)))
-        uri = f"https://permpal.com/perms/raw_data_json/basis/{basis_str}"
-        request = requests.get(uri, timeout=10)
-        if request.status_code == 404:
-            raise InvalidOperationError("Can't find spec for one by one verified rule.")
-        data = request.json()
+        """
+        Return the specification of the 1x1 tiling without requirements from
+        permpal, or from the spec store if it is enabled.
+        """
+        data = fetch_basis(ob.patt for ob in tiling.obstructions)
         spec_json = data["specs_and_eqs"][0]["spec_json"]
         spec = cast(
             CombinatorialSpecification, CombinatorialSpecification.from_dict(spec_json)
@@ -338,6 +341,7 @@ class OneByOneVerificationStrategy(BasisAwareVerificationStrategy):
                 raise StrategyDoesNotApply("The combinatorial class is not verified")
         return OneByOneVerificationRule(self, comb_class, children)
 
+    @cached_verification
     def verified(self, comb_class: Tiling) -> bool:
         if not comb_class.dimensions == (1, 1):
             return False
@@ -569,6 +573,7 @@ class LocallyFactorableVerificationStrategy(BasisAwareVerificationStrategy):
         reqs = chain.from_iterable(tiling.requirements)
         return all(not r.is_interleaving() for r in reqs)
 
+    @cached_verification
     def verified(self, comb_class: Tiling):
         return (
             not comb_class.dimensions == (1, 1)
@@ -706,7 +711,7 @@ class LocalVerificationStrategy(BasisAwareVerificationStrategy):
     def verified(self, comb_class: Tiling) -> bool:
         return (
             comb_class.dimensions != (1, 1)
-            and (not self.no_factors or len(comb_class.find_factors()) == 1)
+            and (not self.no_factors or _has_one_factor(comb_class))
             and LocalEnumeration(comb_class).verified()
             and all(
                 not isinstance(ass, ComponentAssumption)
@@ -799,6 +804,7 @@ class InsertionEncodingVerificationStrategy(TileScopeVerificationStrategy):
             for basis, _ in tiling.cell_basis().values()
         )
 
+    @cached_verification
     def verified(self, comb_class: Tiling) -> bool:
         return self.has_rightmost_insertion_encoding(
             comb_class
@@ -867,7 +873,7 @@ class MonotoneTreeVerificationStrategy(TileScopeVerificationStrategy):
 
     def verified(self, comb_class: Tiling) -> bool:
         return (
-            not self.no_factors or len(comb_class.find_factors()) == 1
+            not self.no_factors or _has_one_factor(comb_class)
         ) and MonotoneTreeEnumeration(comb_class).verified()
 
     def formal_step(self) -> str:
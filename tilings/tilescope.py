@@ -1,11 +1,19 @@
+# pylint: disable=too-many-lines
 import itertools
 import math
+import multiprocessing
+import os
+import time
+import zlib
 from array import array
 from collections import Counter
+from multiprocessing.pool import AsyncResult, Pool
+from typing import Any
 from typing import Counter as CounterType
 from typing import (
     Deque,
     Dict,
+    FrozenSet,
     Iterable,
     Iterator,
     List,
@@ -27,19 +35,34 @@ from comb_spec_searcher import (
 )
 from comb_spec_searcher.class_db import ClassDB, ClassKey, Info, Key
 from comb_spec_searcher.class_queue import CSSQueue, DefaultQueue, WorkPacket
+from comb_spec_searcher.exception import StrategyDoesNotApply
 from comb_spec_searcher.rule_db.abstract import RuleDBAbstract
+from comb_spec_searcher.strategies import AbstractStrategy
 from comb_spec_searcher.strategies.rule import AbstractRule
 from comb_spec_searcher.typing import CombinatorialClassType, CSSstrategy
 from permuta import Basis, Perm
 from tilings import GriddedPerm, Tiling
+from tilings.algorithms import Factor, MinimalGriddedPerms
 from tilings.assumptions import TrackingAssumption
+from tilings.checkpoint import SearchCheckpoint
+from tilings.misc import LRUCache
+from tilings.spec_store import SpecStore, get_spec_store
 from tilings.strategy_pack import TileScopePack
-
-__all__ = ("TileScope", "TileScopePack", "LimitedAssumptionTileScope", "GuidedSearcher")
+from tilings.verification_cache import get_verification_cache, verification_cache_status
+
+__all__ = (
+    "TileScope",
+    "TileScopePack",
+    "LimitedAssumptionTileScope",
+    "GuidedSearcher",
+    "ParallelTileScope",
+)
 
 Cell = Tuple[int, int]
 TrackedClassAssumption = Tuple[int, Tuple[Cell, ...]]
 TrackedClassDBKey = Tuple[int, Tuple[TrackedClassAssumption, ...]]
+CompressedRule = Tuple[AbstractStrategy, Optional[bytes], Tuple[bytes, ...]]
+WorkKey = Tuple[bytes, int]
 
 
 class TileScope(CombinatorialSpecificationSearcher):
@@ -48,6 +71,8 @@ class TileScope(CombinatorialSpecificationSearcher):
     respect to the given basis.
     """
 
+    _queue_class: Type[DefaultQueue] = DefaultQueue
+
     def __init__(
         self,
         start_class: Union[str, Iterable[Perm], Tiling],
@@ -57,8 +82,15 @@ class TileScope(CombinatorialSpecificationSearcher):
         classqueue: Optional[CSSQueue] = None,
         expand_verified: bool = False,
         debug: bool = False,
+        canonical_symmetries: bool = False,
     ) -> None:
-        """Initialise TileScope."""
+        """
+        Initialise TileScope.
+
+        If canonical_symmetries is True, then a tiling is only linked to its
+        symmetry with the smallest bytes, which is expanded in its place,
+        rather than adding every symmetry of every tiling to the universe.
+        """
         if isinstance(start_class, Tiling):
             start_tiling = start_class
             if start_tiling.dimensions == (1, 1):
@@ -85,16 +117,159 @@ class TileScope(CombinatorialSpecificationSearcher):
             strategy_pack = strategy_pack.add_basis(basis)
         strategy_pack = strategy_pack.setup_subclass_verification(start_tiling)
 
+        self.checkpoint: Optional[SearchCheckpoint] = None
+        self.canonical_symmetries = canonical_symmetries
+        self._canonical_labels: Dict[int, int] = {}
         super().__init__(
             start_class=start_tiling,
             strategy_pack=strategy_pack,
             classdb=classdb,
             ruledb=ruledb,
-            classqueue=classqueue,
+            classqueue=(
+                classqueue
+                if classqueue is not None
+                else self._queue_class(strategy_pack)
+            ),
             expand_verified=expand_verified,
             debug=debug,
         )
 
+    @classmethod
+    def from_checkpoint(cls, path: str, interval: float = 600.0) -> "TileScope":
+        """
+        Return the searcher saved in the checkpoint file at path. Its auto
+        search continues to write to the checkpoint every interval seconds.
+        """
+        searcher = SearchCheckpoint.load(path, interval)
+        if not isinstance(searcher, cls):
+            raise TypeError(
+                f"{path} is a checkpoint of a {type(searcher).__name__}, "
+                f"not a {cls.__name__}"
+            )
+        return searcher
+
+    def auto_search(self, **kwargs) -> CombinatorialSpecification:
+        """
+        An automatic search function, see
+        CombinatorialSpecificationSearcher.auto_search.
+
+        If the keyword 'checkpoint' is set to a path then the state of the
+        search is written to that file every 'checkpoint_interval' seconds,
+        by default 600, and when there are no more classes to expand. The
+        search can then be resumed with TileScope.from_checkpoint. A RuleDB is
+        replaced by a CheckpointRuleDB with the same rules, which keeps a
+        journal of the rules added since the last write.
+        """
+        path = kwargs.pop("checkpoint", None)
+        interval = kwargs.pop("checkpoint_interval", None)
+        if path is not None and (
+            self.checkpoint is None or self.checkpoint.path != path
+        ):
+            self.checkpoint = SearchCheckpoint(
+                path, self, 600.0 if interval is None else interval
+            )
+            self.checkpoint.write()
+        elif interval is not None and self.checkpoint is not None:
+            self.checkpoint.interval = interval
+        return super().auto_search(**kwargs)
+
+    def status(self, elaborate: bool) -> str:
+        """
+        Return a string of the current status of the TileScope, which also
+        includes the usage of the caches of the minimal gridded perms and of
+        the verification cache if it is enabled, and the factor counters.
+        """
+        status = super().status(elaborate)
+        status += "Cache status:\n\t"
+        status += MinimalGriddedPerms.cache_status().replace("\n", "\n\t")
+        status += "\n\t" + Factor.counters.status()
+        if get_verification_cache() is not None:
+            status += "\n\t" + verification_cache_status()
+        return status + "\n"
+
+    def _canonical_symmetry_rule(self, comb_class: Tiling) -> Optional[AbstractRule]:
+        """
+        Return the rule from the tiling to its symmetry with the smallest bytes,
+        among the symmetries given by the pack, or None if the tiling is the
+        smallest.
+        """
+        res = None
+        smallest = comb_class.to_bytes()
+        for strategy_generator in self.symmetries:
+            for rule in self._rules_from_strategy(comb_class, strategy_generator):
+                key = cast(Tiling, rule.children[0]).to_bytes()
+                if key < smallest:
+                    smallest, res = key, rule
+        return res
+
+    def _symmetry_expand(self, comb_class: CombinatorialClassType, label: int) -> None:
+        """
+        If canonical_symmetries is True, then add the rule from the tiling to
+        its canonical symmetry, which is expanded instead of the tiling.
+        """
+        if not self.canonical_symmetries:
+            super()._symmetry_expand(comb_class, label)
+            return
+        self.symmetry_expanded.add(label)
+        rule = self._canonical_symmetry_rule(cast(Tiling, comb_class))
+        if rule is None:
+            return
+        canonical = rule.children[0]
+        canonical_label = self.classdb.get_label(canonical)
+        self.classdb.set_empty(
+            canonical_label, self.classdb.is_empty(comb_class, label)
+        )
+        self.ruledb.add(label, (canonical_label,), rule)
+        self.classqueue.set_stop_yielding(label)
+        self._canonical_labels[label] = canonical_label
+        if canonical_label not in self.symmetry_expanded:
+            # the symmetry with the smallest bytes is its own canonical symmetry
+            self.symmetry_expanded.add(canonical_label)
+            self.try_verify(canonical, canonical_label)
+        if label == self.start_label:
+            self.classqueue.add(canonical_label)
+
+    def add_rule(
+        self, start_label: int, end_labels: Tuple[int, ...], rule: AbstractRule
+    ) -> None:
+        super().add_rule(start_label, end_labels, rule)
+        # the canonical symmetries are expanded in place of the children
+        for label in end_labels:
+            canonical_label = self._canonical_labels.get(label)
+            if canonical_label is not None:
+                if rule.workable:
+                    self.classqueue.add(canonical_label)
+                if not rule.inferrable:
+                    self.classqueue.set_not_inferrable(canonical_label)
+
+    def _expand_classes_for(
+        self,
+        expansion_time: float,
+        status_update: Optional[int],
+        status_start: float,
+        auto_search_start: float,
+    ) -> Tuple[bool, float]:
+        if self.checkpoint is None:
+            return super()._expand_classes_for(
+                expansion_time, status_update, status_start, auto_search_start
+            )
+        expansion_start = time.time()
+        while True:
+            time_left = expansion_time - (time.time() - expansion_start)
+            time_to_checkpoint = self.checkpoint.interval - (
+                time.time() - self.checkpoint.last_write
+            )
+            expanding, status_start = super()._expand_classes_for(
+                min(time_left, time_to_checkpoint),
+                status_update,
+                status_start,
+                auto_search_start,
+            )
+            if not expanding or self.checkpoint.is_due():
+                self.checkpoint.write()
+            if not expanding or time.time() - expansion_start >= expansion_time:
+                return expanding, status_start
+
 
 class LimitedAssumptionTileScope(TileScope):
     """
@@ -108,13 +283,14 @@ class LimitedAssumptionTileScope(TileScope):
         strategy_pack: TileScopePack,
         max_assumptions: int,
         ignore_full_tiling_assumptions: bool = False,
+        classdb: Optional["TrackedClassDB"] = None,
         **kwargs,
     ) -> None:
         self.max_assumptions = max_assumptions
         super().__init__(
             start_class,
             strategy_pack,
-            classdb=TrackedClassDB(),
+            classdb=classdb if classdb is not None else TrackedClassDB(),
             **kwargs,
         )
         self.ignore_full_tiling_assumptions = ignore_full_tiling_assumptions
@@ -144,19 +320,308 @@ class LimitedAssumptionTileScope(TileScope):
                 yield rule
 
 
+_WORKER_STRATEGIES: Tuple[CSSstrategy, ...] = tuple()
+_WORKER_INFERRAL: FrozenSet[int] = frozenset()
+_WORKER_VERIFICATION: Tuple[int, ...] = tuple()
+
+
+def _searcher_strategies(pack: TileScopePack) -> Tuple[CSSstrategy, ...]:
+    """The strategies of the pack, the inferral strategies first and the
+    verification strategies last."""
+    return tuple(
+        itertools.chain(
+            pack.inferral_strats,
+            pack.initial_strats,
+            *pack.expansion_strats,
+            pack.ver_strats,
+        )
+    )
+
+
+def _init_worker(pack: TileScopePack) -> None:
+    # pylint: disable=global-statement
+    global _WORKER_STRATEGIES, _WORKER_INFERRAL, _WORKER_VERIFICATION
+    _WORKER_STRATEGIES = _searcher_strategies(pack)
+    _WORKER_INFERRAL = frozenset(range(len(pack.inferral_strats)))
+    _WORKER_VERIFICATION = tuple(
+        range(len(_WORKER_STRATEGIES) - len(pack.ver_strats), len(_WORKER_STRATEGIES))
+    )
+
+
+def _rules_in_worker(key: bytes, idx: int) -> Dict[WorkKey, List[CompressedRule]]:
+    """
+    Return the rules found by applying the strategy with the given index to the
+    tiling with the given bytes, with the parent if it is not the tiling and
+    the children as bytes.
+
+    The rules the searcher will look for next are also returned, i.e., the
+    verification strategies applied to the children and the inferral
+    strategies applied to the children of inferral rules.
+    """
+    # pylint: disable=protected-access
+    res: Dict[WorkKey, List[CompressedRule]] = {}
+    todo = [(key, idx)]
+    while todo:
+        key, idx = todo.pop()
+        if (key, idx) in res:
+            continue
+        tiling = Tiling.from_bytes(key)
+        rules: List[CompressedRule] = []
+        for rule in CombinatorialSpecificationSearcher._rules_from_strategy(
+            tiling, _WORKER_STRATEGIES[idx]
+        ):
+            try:
+                children = tuple(child.to_bytes() for child in rule.children)
+            except StrategyDoesNotApply:
+                continue
+            parent = None if rule.comb_class == tiling else rule.comb_class.to_bytes()
+            rules.append((rule.strategy, parent, children))
+            for child in children:
+                if idx in _WORKER_INFERRAL:
+                    todo.extend((child, i) for i in _WORKER_INFERRAL)
+                if idx not in _WORKER_VERIFICATION:
+                    todo.extend((child, i) for i in _WORKER_VERIFICATION)
+        res[(key, idx)] = rules
+    return res
+
+
+class PrefetchQueue(DefaultQueue):
+    """
+    A DefaultQueue which can list the work it will yield next, so that the
+    ParallelTileScope can send it to the workers ahead of the search.
+    """
+
+    def upcoming(self) -> Iterator[Tuple[int, Iterable[CSSstrategy]]]:
+        """
+        Yield the labels and strategies of the work packets that are next in
+        the queue, in roughly the order they will be yielded.
+        """
+        work: Iterator[Tuple[int, Iterable[CSSstrategy]]] = itertools.chain(
+            ((packet.label, packet.strategies) for packet in self.staging),
+            (
+                (
+                    label,
+                    itertools.chain(
+                        self.inferral_strategies if self.can_do_inferral(label) else (),
+                        self.initial_strategies if self.can_do_initial(label) else (),
+                    ),
+                )
+                for label in self.working
+            ),
+            *(
+                ((label, strategies) for label in labels)
+                for labels, strategies in zip(self.curr_level, self.expansion_strats)
+            ),
+        )
+        for label, strategies in work:
+            if label not in self.ignore:
+                yield label, strategies
+
+
+class ParallelTileScope(TileScope):
+    """
+    A TileScope that applies the strategies in a pool of worker processes.
+
+    Upcoming work is read from the class queue and sent to the workers as the
+    tiling bytes and the index of the strategy. The rules come back with the
+    children as bytes, together with the verification of the children, and
+    are added to the searcher in the same order as the serial search would add
+    them. The ClassDB and RuleDB only live in the main process, and so the
+    universe, and therefore the specification, found is the same as for the
+    TileScope.
+    """
+
+    _queue_class = PrefetchQueue
+
+    def __init__(
+        self,
+        start_class: Union[str, Iterable[Perm], Tiling],
+        strategy_pack: TileScopePack,
+        workers: Optional[int] = None,
+        prefetch: Optional[int] = None,
+        **kwargs,
+    ) -> None:
+        """
+        - workers is the number of worker processes, by default the number of
+            cpus.
+        - prefetch is the number of work packets sent to the workers ahead of
+            the search, by default four times the number of workers.
+
+        The classdb is a LazyClassDB by default, so that the bytes of the
+        tilings sent to the workers are read without building the tilings.
+        """
+        if kwargs.get("classdb") is None:
+            kwargs["classdb"] = LazyClassDB()
+        self.workers = workers if workers is not None else (os.cpu_count() or 1)
+        self.prefetch = prefetch if prefetch is not None else 4 * self.workers
+        self._strategy_indices: Dict[int, int] = {}
+        self._pool: Optional[Pool] = None
+        self._pending: Dict[Tuple[int, int], AsyncResult] = {}
+        self._results: LRUCache[List[CompressedRule]] = LRUCache(
+            "Worker results", maxsize=2**16
+        )
+        self._expanding: Optional[Tuple[int, Tiling]] = None
+        self._keys: Dict[int, Tuple[Tiling, bytes]] = {}
+        super().__init__(start_class, strategy_pack, **kwargs)
+        for idx, strategy in enumerate(
+            _searcher_strategies(cast(TileScopePack, self.strategy_pack))
+        ):
+            self._strategy_indices.setdefault(id(strategy), idx)
+
+    def _get_pool(self) -> Pool:
+        if self._pool is None:
+            self._pool = multiprocessing.Pool(  # pylint: disable=consider-using-with
+                self.workers, initializer=_init_worker, initargs=(self.strategy_pack,)
+            )
+        return self._pool
+
+    def close(self) -> None:
+        """Stop the worker processes. They are restarted if needed."""
+        if self._pool is not None:
+            self._pool.terminate()
+            self._pool.join()
+            self._pool = None
+        self._pending.clear()
+        self._results.clear()
+
+    def __enter__(self) -> "ParallelTileScope":
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # the pool and the work sent to it are not kept
+        state = vars(self).copy()
+        state["_pool"] = None
+        state["_pending"] = {}
+        state["_results"] = LRUCache("Worker results", maxsize=self._results.maxsize)
+        state["_expanding"] = None
+        state["_keys"] = {}
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        vars(self).update(state)
+        # the strategies are new objects
+        self._strategy_indices = {}
+        for idx, strategy in enumerate(
+            _searcher_strategies(cast(TileScopePack, self.strategy_pack))
+        ):
+            self._strategy_indices.setdefault(id(strategy), idx)
+
+    def auto_search(self, **kwargs):
+        try:
+            return super().auto_search(**kwargs)
+        finally:
+            self.close()
+
+    def _label_to_bytes(self, label: int) -> bytes:
+        if isinstance(self.classdb, (LazyClassDB, TrackedClassDB)):
+            return self.classdb.get_bytes(label)
+        return cast(Tiling, self.classdb.get_class(label)).to_bytes()
+
+    def _tiling_to_bytes(self, tiling: Tiling) -> bytes:
+        known = self._keys.get(id(tiling))
+        if known is not None and known[0] is tiling:
+            return known[1]
+        key = tiling.to_bytes()
+        self._keys[id(tiling)] = (tiling, key)
+        return key
+
+    def _tiling_from_bytes(self, key: bytes) -> Tiling:
+        tiling = Tiling.from_bytes(key)
+        self._keys[id(tiling)] = (tiling, key)
+        return tiling
+
+    def _submit(self, key: bytes, idx: int) -> AsyncResult:
+        return self._get_pool().apply_async(_rules_in_worker, (key, idx))
+
+    def _upcoming_work(self) -> Iterator[Tuple[int, int]]:
+        """
+        Yield the label and strategy index of the work packets that are next in
+        the class queue, if it is a PrefetchQueue.
+        """
+        queue = self.classqueue
+        if not isinstance(queue, PrefetchQueue):
+            return
+        for label, strategies in queue.upcoming():
+            if not self.expand_verified and self.ruledb.is_verified(label):
+                continue
+            for strategy in strategies:
+                idx = self._strategy_indices.get(id(strategy))
+                if idx is not None:
+                    yield label, idx
+
+    def _prefetch(self) -> None:
+        """Send the upcoming work packets to the workers."""
+        pending = {}
+        for label, idx in itertools.islice(self._upcoming_work(), self.prefetch):
+            res = self._pending.get((label, idx))
+            if res is None:
+                res = self._submit(self._label_to_bytes(label), idx)
+            pending[(label, idx)] = res
+        self._pending = pending
+
+    def _expand(
+        self,
+        comb_class: CombinatorialClassType,
+        label: int,
+        strategies: Tuple[CSSstrategy, ...],
+        inferral: bool,
+    ) -> None:
+        self._expanding = (label, cast(Tiling, comb_class))
+        try:
+            super()._expand(comb_class, label, strategies, inferral)
+        finally:
+            self._expanding = None
+            self._keys.clear()
+
+    def _rules_from_strategy(  # type: ignore
+        self, comb_class: CombinatorialClassType, strategy: CSSstrategy
+    ) -> Iterator[AbstractRule]:
+        # pylint: disable=arguments-differ
+        idx = self._strategy_indices.get(id(strategy))
+        if idx is None or self.workers < 2 or self.debug:
+            yield from super()._rules_from_strategy(comb_class, strategy)
+            return
+        key = self._tiling_to_bytes(cast(Tiling, comb_class))
+        rules = self._results.get((key, idx))
+        if rules is None:
+            res = None
+            if self._expanding is not None and self._expanding[1] is comb_class:
+                res = self._pending.pop((self._expanding[0], idx), None)
+            if res is None:
+                res = self._submit(key, idx)
+            self._prefetch()
+            results = res.get()
+            rules = results.pop((key, idx))
+            for work_key, work_rules in results.items():
+                self._results.set(work_key, work_rules)
+        for rule_strategy, parent, children in rules:
+            yield rule_strategy(
+                comb_class if parent is None else Tiling.from_bytes(parent),
+                tuple(map(self._tiling_from_bytes, children)),
+            )
+
+
 class GuidedSearcher(TileScope):
     def __init__(
         self,
         tilings: Iterable[Tiling],
         basis: Tiling,
         pack: TileScopePack,
+        classdb: Optional["TrackedClassDB"] = None,
         **kwargs,
     ):
+        if kwargs.get("canonical_symmetries", False):
+            # only the given tilings are expanded, which need not include the
+            # canonical symmetries
+            raise ValueError("GuidedSearcher does not support canonical_symmetries")
         self.tilings = frozenset(t.remove_assumptions() for t in tilings)
         super().__init__(
             basis,
             pack,
-            classdb=TrackedClassDB(),
+            classdb=classdb if classdb is not None else TrackedClassDB(),
             **kwargs,
         )
         for t in self.tilings:
@@ -198,10 +663,20 @@ class GuidedSearcher(TileScope):
         return cls(tilings, root, pack)
 
     @classmethod
-    def from_uri(cls, URI: str) -> "GuidedSearcher":
-        response = requests.get(URI, timeout=10)
-        spec = CombinatorialSpecification.from_dict(response.json()["specification"])
-        pack = TileScopePack.from_dict(response.json()["pack"]).make_tracked()
+    def from_uri(cls, URI: str, store: Optional[SpecStore] = None) -> "GuidedSearcher":
+        """
+        Return a searcher for the specification and pack in the document at
+        the uri. If a store is given, or the spec store is enabled, then the
+        document is only downloaded if it is not in the store.
+        """
+        if store is None:
+            store = get_spec_store()
+        if store is not None:
+            data = store.fetch_uri(URI)
+        else:
+            data = requests.get(URI, timeout=10).json()
+        spec = CombinatorialSpecification.from_dict(data["specification"])
+        pack = TileScopePack.from_dict(data["pack"]).make_tracked()
         return cls.from_spec(spec, pack)
 
 
@@ -405,10 +880,35 @@ class TrackedQueue(CSSQueue):
         raise StopIteration("No elements in queue")
 
 
+class LazyClassDB(ClassDB[Tiling]):
+    """
+    A ClassDB of tilings that returns lazy tilings, i.e., views of the
+    compressed tilings whose gridded perms are only built when needed.
+    """
+
+    def __init__(self) -> None:
+        super().__init__(Tiling)
+
+    def get_bytes(self, label: int) -> bytes:
+        """
+        Return the bytes of the tiling with the given label, without building
+        the tiling.
+        """
+        comb_class = self._get_info(label).comb_class
+        if isinstance(comb_class, bytes):
+            return zlib.decompress(comb_class)
+        return cast(Tiling, comb_class).to_bytes()
+
+    def _decompress(self, key: ClassKey) -> Tiling:
+        if isinstance(key, bytes):
+            return Tiling.from_bytes(zlib.decompress(key), lazy=True)
+        return super()._decompress(key)
+
+
 class TrackedClassDB(ClassDB[Tiling]):
     def __init__(self) -> None:
         super().__init__(Tiling)
-        self.classdb = ClassDB(Tiling)
+        self.classdb = LazyClassDB()
         self.label_to_tilings: List[bytes] = []
         self.tilings_to_label: Dict[bytes, int] = {}
         self.assumption_type_to_int: Dict[Type[TrackingAssumption], int] = {}
@@ -559,16 +1059,17 @@ class TrackedClassDB(ClassDB[Tiling]):
 
     def add(self, comb_class: ClassKey, compressed: bool = False) -> None:
         """
-        Adds a Tiling to the classdb
+        Adds a Tiling, or its compressed key if compressed, to the classdb
         """
         if compressed:
-            raise NotImplementedError
-        if isinstance(comb_class, Tiling):
-            key = self.tiling_to_key(comb_class)
-            compressed_key = self._compress_key(key)
-            if compressed_key not in self.tilings_to_label:
-                self.label_to_tilings.append(compressed_key)
-                self.tilings_to_label[compressed_key] = len(self.tilings_to_label)
+            compressed_key = cast(bytes, comb_class)
+        elif isinstance(comb_class, Tiling):
+            compressed_key = self._compress_key(self.tiling_to_key(comb_class))
+        else:
+            return
+        if compressed_key not in self.tilings_to_label:
+            self.label_to_tilings.append(compressed_key)
+            self.tilings_to_label[compressed_key] = len(self.tilings_to_label)
 
     def _get_info(self, key: Key) -> Info:
         """
@@ -612,6 +1113,20 @@ class TrackedClassDB(ClassDB[Tiling]):
         info = self._get_info(key)
         return cast(Tiling, info.comb_class)
 
+    def get_bytes(self, label: int) -> bytes:
+        """
+        Return the bytes of the tiling with the given label, without building
+        the tiling if it has no assumptions.
+        """
+        if not 0 <= label < len(self.label_to_tilings):
+            raise KeyError("Key not in ClassDB")
+        underlying_label, assumption_keys = self._decompress_key(
+            self.label_to_tilings[label]
+        )
+        if assumption_keys:
+            return self.get_class(label).to_bytes()
+        return cast(LazyClassDB, self.classdb).get_bytes(underlying_label)
+
     def is_empty(self, comb_class: Tiling, label: Optional[int] = None) -> bool:
         """
         Return True if combinatorial class is set to be empty, False if not.
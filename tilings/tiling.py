@@ -1,21 +1,24 @@
 # pylint: disable=too-many-lines
 import json
-from array import array
 from collections import Counter, defaultdict
 from functools import reduce
 from itertools import chain, filterfalse, product
+from math import factorial
 from operator import mul, xor
 from typing import (
     Any,
     Callable,
     Dict,
     FrozenSet,
+    Hashable,
     Iterable,
     Iterator,
     List,
     Optional,
     Set,
     Tuple,
+    Type,
+    Union,
 )
 
 import sympy
@@ -35,9 +38,11 @@ from .algorithms import (
     FactorWithInterleaving,
     FactorWithMonotoneInterleaving,
     Fusion,
+    GriddedPermCounter,
     GriddedPermReduction,
     GriddedPermsOnTiling,
     MinimalGriddedPerms,
+    ObstructionIndex,
     ObstructionTransitivity,
     RequirementPlacement,
     RowColMap,
@@ -46,16 +51,13 @@ from .algorithms import (
     SubobstructionInferral,
     guess_obstructions,
 )
-from .assumptions import (
-    ComponentAssumption,
-    SkewComponentAssumption,
-    SumComponentAssumption,
-    TrackingAssumption,
-)
+from .assumptions import ComponentAssumption, TrackingAssumption
 from .exception import InvalidOperationError
 from .griddedperm import GriddedPerm
 from .gui_launcher import run_gui
-from .misc import intersection_reduce, union_reduce
+from .interning import GRIDDED_PERMS, intern_gridded_perms, intern_tiling
+from .lazy_tiling import BYTES_FORMAT_VERSION, LazyTilingView, decode, encode
+from .misc import LRUCache, intersection_reduce, union_reduce
 
 __all__ = ["Tiling"]
 
@@ -72,13 +74,18 @@ CachedProperties = TypedDict(
     {
         "active_cells": CellFrozenSet,
         "backward_map": RowColMap,
+        "bytes": bytes,
         "cell_basis": CellBasis,
         "dimensions": Dimension,
         "empty_cells": CellFrozenSet,
         "forward_map": RowColMap,
+        "hash": int,
+        "is_empty": bool,
+        "obstruction_index": ObstructionIndex,
         "point_cells": CellFrozenSet,
         "positive_cells": CellFrozenSet,
         "possibly_empty": CellFrozenSet,
+        "row_col_separation": Tuple[Tuple["Tiling", Dict[Cell, Cell]], ...],
     },
     total=False,
 )
@@ -92,8 +99,30 @@ class Tiling(CombinatorialClass):
 
     Tilings store the obstructions and requirements but also caches the empty
     cells and the active cells.
+
+    The result of simplifying a tiling is stored in `Tiling.construction_cache`,
+    keyed on the sorted input, so constructing the same tiling again skips the
+    simplification. Both the key and the result are stored in the format of
+    `Tiling.to_bytes`, so the cache does not keep any gridded perms alive, and
+    a tiling restored from it builds its gridded perms when first accessed.
+    Set `Tiling.construction_cache.enabled = False` to turn it off, or change
+    `Tiling.construction_cache.maxsize` to bound its memory.
+    Similarly, whether a tiling is empty is stored in `Tiling.emptiness_cache`,
+    keyed on the bytes of its obstructions and requirements. Like the caches of
+    `MinimalGriddedPerms`, both are bounded and only store results, so they
+    are on by default, unlike `tilings.interning` which changes the instances
+    that tilings share.
     """
 
+    construction_cache: LRUCache[Tuple[bytes, CachedProperties]] = LRUCache(
+        "Tiling construction", maxsize=2**16
+    )
+    emptiness_cache: LRUCache[bool] = LRUCache("Tiling emptiness", maxsize=2**16)
+
+    BYTES_FORMAT_VERSION = BYTES_FORMAT_VERSION
+    # the bytes of a tiling from Tiling.from_bytes(b, lazy=True)
+    _view: Optional[LazyTilingView] = None
+
     def __init__(
         self,
         obstructions: Iterable[GriddedPerm] = tuple(),
@@ -104,6 +133,7 @@ class Tiling(CombinatorialClass):
         simplify: bool = True,
         sorted_input: bool = False,
         already_minimized_obs: bool = False,
+        already_minimized_reqs: Iterable[ReqList] = tuple(),
     ) -> None:
         """
         - if remove_empty_rows_and_cols, then remove empty rows and columns.
@@ -112,7 +142,12 @@ class Tiling(CombinatorialClass):
         - if not sorted_input, input will be sorted
         - already_minimized_obs indicates if the obstructions are already minimized
             we pass this through to GriddedPermReduction
+        - already_minimized_reqs are sorted requirement lists which are known not
+            to imply any new obstructions, e.g. the requirements of a simplified
+            tiling to which a requirement list is added, we pass this through
+            to GriddedPermReduction
         """
+        # pylint: disable=too-many-branches
         self._cached_properties: CachedProperties = {}
 
         super().__init__()
@@ -131,9 +166,26 @@ class Tiling(CombinatorialClass):
             # Set of assumptions
             self._assumptions = tuple(sorted(assumptions))
 
+        key = None
+        if simplify and Tiling.construction_cache.enabled:
+            # the shortcuts skip part of the simplification, so are in the key
+            already_minimized_reqs = tuple(already_minimized_reqs)
+            key = (
+                encode(self._obstructions, self._requirements, self._assumptions),
+                remove_empty_rows_and_cols,
+                derive_empty,
+                already_minimized_obs,
+                encode((), already_minimized_reqs, ()),
+            )
+            if self._restore_from_construction_cache(key):
+                return
+
         # Simplify the set of obstructions and the set of requirement lists
         if simplify:
-            self._simplify_griddedperms(already_minimized_obs=already_minimized_obs)
+            self._simplify_griddedperms(
+                already_minimized_obs=already_minimized_obs,
+                already_minimized_reqs=already_minimized_reqs,
+            )
 
         if not any(ob.is_empty() for ob in self.obstructions):
             # Remove gridded perms that avoid obstructions from assumptions
@@ -163,6 +215,32 @@ class Tiling(CombinatorialClass):
             self._cached_properties["positive_cells"] = frozenset()
             self._cached_properties["possibly_empty"] = frozenset()
 
+        if GRIDDED_PERMS.enabled:
+            self._intern_griddedperms()
+
+        if key is not None:
+            cached_properties = self._cached_properties.copy()
+            # the index holds the gridded perms the cache is not to keep alive
+            cached_properties.pop("obstruction_index", None)
+            Tiling.construction_cache.set(key, (self.to_bytes(), cached_properties))
+
+    def _restore_from_construction_cache(self, key: Hashable) -> bool:
+        """
+        Set the simplified tiling stored for key in the construction cache.
+        Return False if there is none.
+        """
+        cached = Tiling.construction_cache.get(key)
+        if cached is None:
+            return False
+        b, cached_properties = cached
+        # the gridded perms are built from the bytes when first accessed
+        del self._obstructions, self._requirements, self._assumptions
+        self._view = LazyTilingView(b)
+        self._cached_properties = cached_properties.copy()
+        if GRIDDED_PERMS.enabled:
+            self._intern_griddedperms()
+        return True
+
     @classmethod
     def from_perms(
         cls,
@@ -181,10 +259,41 @@ class Tiling(CombinatorialClass):
             t = t.add_list_requirement(req_list)
         return t
 
+    def __getattr__(self, name: str) -> Any:
+        # the gridded perms of a lazy tiling are built when first accessed
+        view = self._view
+        if view is None or name not in (
+            "_obstructions",
+            "_requirements",
+            "_assumptions",
+        ):
+            raise AttributeError(
+                f"'{type(self).__name__}' object has no attribute '{name}'"
+            )
+        value = getattr(view, name[1:])()
+        setattr(self, name, value)
+        return value
+
     def _prepare_properties(self) -> None:
         """
         Compute _active_cells, _empty_cells, _dimensions, and store them
         """
+        if self._view is not None:
+            properties = self._view.cell_properties()
+            if properties is not None:
+                (
+                    self._cached_properties["active_cells"],
+                    self._cached_properties["empty_cells"],
+                    self._cached_properties["dimensions"],
+                ) = properties
+                return
+            # the obstructions change so the bytes no longer match
+            for name in ("_obstructions", "_requirements", "_assumptions"):
+                getattr(self, name)
+            self._view = None
+        self._cached_properties.pop("hash", None)
+        self._cached_properties.pop("bytes", None)
+        self._cached_properties.pop("obstruction_index", None)
         active_cells = union_reduce(
             set(ob.pos) for ob in self.obstructions if len(ob) > 1
         )
@@ -226,7 +335,11 @@ class Tiling(CombinatorialClass):
         self._cached_properties["empty_cells"] = frozenset(empty_cells)
         self._cached_properties["dimensions"] = dimensions
 
-    def _simplify_griddedperms(self, already_minimized_obs=False) -> None:
+    def _simplify_griddedperms(
+        self,
+        already_minimized_obs: bool = False,
+        already_minimized_reqs: Iterable[ReqList] = tuple(),
+    ) -> None:
         """
         Simplifies the set of obstructions and the set of requirement lists.
         The set of obstructions are first reduced to a minimal set. The
@@ -239,13 +352,27 @@ class Tiling(CombinatorialClass):
             self.requirements,
             sorted_input=True,
             already_minimized_obs=already_minimized_obs,
+            already_minimized_reqs=already_minimized_reqs,
         )
 
         self._obstructions = GPR.obstructions
         self._requirements = GPR.requirements
+        self._cached_properties.pop("hash", None)
+        self._cached_properties.pop("bytes", None)
+        self._cached_properties.pop("obstruction_index", None)
+
+    def _intern_griddedperms(self) -> None:
+        """Replace the obstructions and requirements with their shared instances."""
+        self._obstructions = intern_gridded_perms(self._obstructions)
+        self._requirements = tuple(
+            intern_gridded_perms(reqlist) for reqlist in self._requirements
+        )
 
     def _remove_empty_rows_and_cols(self) -> None:
         """Remove empty rows and columns."""
+        self._cached_properties.pop("hash", None)
+        self._cached_properties.pop("bytes", None)
+        self._cached_properties.pop("obstruction_index", None)
         # Produce the mapping between the two tilings
         if not self.active_cells:
             assert GriddedPerm.empty_perm() not in self.obstructions
@@ -318,11 +445,14 @@ class Tiling(CombinatorialClass):
         that are contained in every gridded perm.
         """
         res: List[TrackingAssumption] = []
+        obstruction_index = ObstructionIndex(self._obstructions)
         for assumption in self.assumptions:
-            ass = assumption.avoiding(self._obstructions, self.active_cells)
+            ass = assumption.avoiding(obstruction_index, self.active_cells)
             if ass.gps:
                 res.append(ass)
         self._assumptions = tuple(sorted(set(res)))
+        self._cached_properties.pop("hash", None)
+        self._cached_properties.pop("bytes", None)
 
     @classmethod
     def guess_from_gridded_perms(
@@ -395,116 +525,59 @@ class Tiling(CombinatorialClass):
     # -------------------------------------------------------------
 
     def to_bytes(self) -> bytes:
-        """Compresses the tiling by flattening the sets of cells into lists of
-        integers which are concatenated together, every list preceeded by its
-        size. The obstructions are compressed and concatenated to the list, as
-        are the requirement lists."""
-
-        def split_16bit(n) -> Tuple[int, int]:
-            """
-            Takes a 16 bit integer and splits it into
-            (lower 8bits, upper 8bits).
-            """
-            return (n & 0xFF, (n >> 8) & 0xFF)
+        """Compresses the tiling into bytes. The first byte is the version of
+        the format and the rest are unsigned LEB128 varints.
+
+        The obstructions, the requirement lists and the assumptions are each
+        written as a list of gridded perms preceded by its size, and the
+        assumptions also by their type. A gridded perm of length n is written
+        as 2n followed by the values of its pattern and its flattened
+        positions, unless it has been written before, in which case it is
+        written as 2i + 1 where i is the index of its first occurrence among
+        the gridded perms written out in full."""
+        if self._view is not None:
+            return self._view.to_bytes()
+        res = self._cached_properties.get("bytes")
+        if res is not None:
+            return res
+        res = encode(self.obstructions, self.requirements, self.assumptions)
+        self._cached_properties["bytes"] = res
+        return res
 
-        result = []  # type: List[int]
-        result.extend(split_16bit(len(self.obstructions)))
-        result.extend(
-            chain.from_iterable([len(ob)] + ob.compress() for ob in self.obstructions)
-        )
-        result.extend(split_16bit(len(self.requirements)))
-        for reqlist in self.requirements:
-            result.extend(split_16bit(len(reqlist)))
-            result.extend(
-                chain.from_iterable([len(req)] + req.compress() for req in reqlist)
+    @classmethod
+    def from_bytes(cls, b: Union[bytes, memoryview], lazy: bool = False) -> "Tiling":
+        """Given a tiling compressed by the to_bytes method, decompress it and
+        return a tiling.
+
+        If lazy, then the tiling is a view of the bytes, which are not copied,
+        and the gridded perms are only built when they are first accessed. The
+        tiling is not interned."""
+        if lazy:
+            return cls.from_view(LazyTilingView(b))
+        obstructions, requirements, assumptions = decode(b)
+        return intern_tiling(
+            cls(
+                obstructions=obstructions,
+                requirements=requirements,
+                assumptions=assumptions,
+                remove_empty_rows_and_cols=False,
+                derive_empty=False,
+                simplify=False,
+                sorted_input=True,
             )
-        if self.assumptions:
-            result.extend(split_16bit(len(self.assumptions)))
-            for assumption in self.assumptions:
-                if isinstance(assumption, SkewComponentAssumption):
-                    result.append(2)
-                elif isinstance(assumption, SumComponentAssumption):
-                    result.append(1)
-                elif isinstance(assumption, TrackingAssumption):
-                    result.append(0)
-                else:
-                    raise ValueError("Not a valid assumption.")
-                result.extend(split_16bit(len(assumption.gps)))
-                result.extend(
-                    chain.from_iterable(
-                        [len(gp)] + gp.compress() for gp in assumption.gps
-                    )
-                )
-        res = array("B", result)
-        return res.tobytes()
+        )
 
     @classmethod
-    def from_bytes(cls, b: bytes) -> "Tiling":
-        """Given a compressed tiling in the form of an 1-byte array, decompress
-        it and return a tiling."""
-        # pylint: disable=too-many-locals
-
-        def merge_8bit(lh, uh):
-            """
-            Takes two 16 bit integers and merges them into
-            one 16 bit integer assuming lh is lower half and
-            uh is the upper half.
-            """
-            return lh | (uh << 8)
-
-        def recreate_gp_list(offset):
-            """
-            Return the gplist implied started at the offset, together
-            with the offset after reading it.
-            """
-            ngps = merge_8bit(arr[offset], arr[offset + 1])
-            offset += 2
-            res = []
-            for _ in range(ngps):
-                pattlen = arr[offset]
-                offset += 1
-                res.append(GriddedPerm.decompress(arr[offset : offset + 3 * pattlen]))
-                offset += 3 * pattlen
-            return res, offset
-
-        arr = array("B", b)
-        obstructions, offset = recreate_gp_list(0)
-
-        nreqs = merge_8bit(arr[offset], arr[offset + 1])
-        offset += 2
-        requirements = []
-        for _ in range(nreqs):
-            reqlist, offset = recreate_gp_list(offset)
-            requirements.append(reqlist)
-
-        assumptions = []
-        if offset < len(arr):
-            nassumptions = merge_8bit(arr[offset], arr[offset + 1])
-            offset += 2
-            for _ in range(nassumptions):
-                assumption_type = arr[offset]
-                offset += 1
-                gps, offset = recreate_gp_list(offset)
-                if assumption_type == 0:
-                    # tracking
-                    assumptions.append(TrackingAssumption(gps))
-                elif assumption_type == 1:
-                    # sum
-                    assumptions.append(SumComponentAssumption(gps))
-                elif assumption_type == 2:
-                    # skew
-                    assumptions.append(SkewComponentAssumption(gps))
-                else:
-                    raise ValueError("Invalid assumption type.")
-        return cls(
-            obstructions=obstructions,
-            requirements=requirements,
-            assumptions=assumptions,
-            remove_empty_rows_and_cols=False,
-            derive_empty=False,
-            simplify=False,
-            sorted_input=True,
-        )
+    def from_view(cls, view: LazyTilingView) -> "Tiling":
+        """Return the lazy tiling of the bytes of the view. It reads its
+        dimensions, active and empty cells, bytes and whether it is trivially
+        empty from the bytes, and only builds its gridded perms when they are
+        first accessed. A pickled lazy tiling is still a view of the bytes, and
+        the tilings built from it are not lazy."""
+        tiling = cls.__new__(cls)
+        tiling._cached_properties = {}
+        tiling._view = view
+        return tiling
 
     @classmethod
     def from_string(cls, string: str) -> "Tiling":
@@ -584,19 +657,40 @@ class Tiling(CombinatorialClass):
         return self.add_obstructions((GriddedPerm(patt, pos),))
 
     def add_obstructions(self, gps: Iterable[GriddedPerm]) -> "Tiling":
-        """Returns a new tiling with the obstructions added."""
-        new_obs = tuple(gps)
+        """
+        Returns a new tiling with the obstructions added.
+
+        As the obstructions of the tiling are minimal, only the new
+        obstructions are compared to the existing ones when minimizing.
+        """
+        # pylint: disable=protected-access
+        new_obs = tuple(
+            filter(
+                self.obstruction_index.avoided_by,
+                GriddedPermReduction._minimize(gps),
+            )
+        )
+        new_obs_index = ObstructionIndex(new_obs)
         return Tiling(
-            sorted(self._obstructions + new_obs),
+            sorted(
+                chain(
+                    filterfalse(new_obs_index.contained_in, self._obstructions),
+                    new_obs,
+                )
+            ),
             self._requirements,
             self._assumptions,
             sorted_input=True,
+            already_minimized_obs=True,
             derive_empty=False,
         )
 
     def add_list_requirement(self, req_list: Iterable[GriddedPerm]) -> "Tiling":
         """
         Return a new tiling with the requirement list added.
+
+        The existing requirements are already minimized with respect to the
+        obstructions, so only the new requirement can imply new obstructions.
         """
         new_req = tuple(sorted(req_list))
         return Tiling(
@@ -605,6 +699,7 @@ class Tiling(CombinatorialClass):
             self._assumptions,
             sorted_input=True,
             already_minimized_obs=True,
+            already_minimized_reqs=self._requirements,
             derive_empty=False,
         )
 
@@ -688,6 +783,8 @@ class Tiling(CombinatorialClass):
         """
         Return the tiling with all assumptions removed.
         """
+        if self._view is not None:
+            return self.from_bytes(self._view.without_assumptions().buffer, lazy=True)
         return self.__class__(
             self._obstructions,
             self._requirements,
@@ -916,6 +1013,116 @@ class Tiling(CombinatorialClass):
             simplify=False,
         )
 
+    def _symmetry(
+        self,
+        transf: Callable[[Cell], Cell],
+        gptransf: Callable[[GriddedPerm, Callable[[Cell], Cell]], GriddedPerm],
+        assumption_type: Optional[
+            Callable[[TrackingAssumption], Type[TrackingAssumption]]
+        ] = None,
+    ) -> "Tiling":
+        """
+        Return the symmetry of the tiling given by the mapping of cells transf
+        and gptransf, the method of GriddedPerm for the same symmetry. The
+        class of each assumption of the symmetry is given by assumption_type,
+        by default it is the class of the assumption.
+
+        A symmetry of a tiling is as simplified as the tiling, so only the
+        order of the gridded perms changes. The symmetry of each pattern is
+        computed once, and the cell properties of the tiling are mapped to the
+        symmetry rather than being computed again.
+        """
+        # computing the dimensions may change the point obstructions
+        dimensions = self.dimensions
+        cells = {
+            cell: transf(cell)
+            for cell in product(range(dimensions[0]), range(dimensions[1]))
+        }
+        patterns: Dict[Perm, Tuple[Perm, Tuple[int, ...]]] = {}
+
+        def gp_symmetry(gp: GriddedPerm) -> GriddedPerm:
+            try:
+                patt, order = patterns[gp.patt]
+            except KeyError:
+                # the index of each point is stored as the column of its cell
+                probe = gptransf(
+                    GriddedPerm(gp.patt, ((idx, 0) for idx in range(len(gp)))),
+                    lambda cell: cell,
+                )
+                patt, order = probe.patt, tuple(idx for idx, _ in probe.pos)
+                patterns[gp.patt] = (patt, order)
+            pos = map(gp.pos.__getitem__, order)
+            try:
+                return GriddedPerm.from_unchecked(
+                    patt, tuple(map(cells.__getitem__, pos))
+                )
+            except KeyError:
+                # a cell outside of the dimensions of the tiling
+                return GriddedPerm.from_unchecked(
+                    patt, tuple(map(transf, map(gp.pos.__getitem__, order)))
+                )
+
+        def assumption_symmetry(ass: TrackingAssumption) -> TrackingAssumption:
+            ass_class = (
+                ass.__class__ if assumption_type is None else assumption_type(ass)
+            )
+            return ass_class(map(gp_symmetry, ass.gps))
+
+        tiling = Tiling(
+            obstructions=sorted(
+                map(gp_symmetry, self.obstructions), key=Tiling._gp_sort_key
+            ),
+            requirements=sorted(
+                tuple(sorted(map(gp_symmetry, req), key=Tiling._gp_sort_key))
+                for req in self.requirements
+            ),
+            assumptions=sorted(map(assumption_symmetry, self.assumptions)),
+            remove_empty_rows_and_cols=False,
+            derive_empty=False,
+            simplify=False,
+            sorted_input=True,
+        )
+        properties = self._cached_properties
+        active_cells = frozenset(cells[cell] for cell in self.active_cells)
+        sym_dimensions = (
+            max((cell[0] for cell in active_cells), default=0) + 1,
+            max((cell[1] for cell in active_cells), default=0) + 1,
+        )
+        if sym_dimensions != (
+            max(cell[0] for cell in cells.values()) + 1,
+            max(cell[1] for cell in cells.values()) + 1,
+        ):
+            # the tiling has empty rows or columns on its boundary, so the
+            # properties of the symmetry are computed when they are needed
+            return tiling
+        sym_properties: CachedProperties = {
+            "dimensions": sym_dimensions,
+            "active_cells": active_cells,
+            "empty_cells": frozenset(cells[cell] for cell in self.empty_cells),
+        }
+        if "point_cells" in properties:
+            sym_properties["point_cells"] = frozenset(
+                cells[cell] for cell in properties["point_cells"]
+            )
+        if "positive_cells" in properties:
+            sym_properties["positive_cells"] = frozenset(
+                cells[cell] for cell in properties["positive_cells"]
+            )
+        if "possibly_empty" in properties:
+            sym_properties["possibly_empty"] = frozenset(
+                cells[cell] for cell in properties["possibly_empty"]
+            )
+        if "is_empty" in properties:
+            sym_properties["is_empty"] = properties["is_empty"]
+        # pylint: disable=protected-access
+        tiling._cached_properties.update(sym_properties)
+        return tiling
+
+    @staticmethod
+    def _gp_sort_key(gp: GriddedPerm) -> Tuple[int, Tuple[int, ...], Tuple[Cell, ...]]:
+        """A key that sorts gridded perms in the same order as comparing them."""
+        return (len(gp), tuple(gp.patt), gp.pos)
+
     def reverse(self, regions=False):
         """
         Reverses the tiling within its boundary. Every cell and obstruction
@@ -926,9 +1133,7 @@ class Tiling(CombinatorialClass):
         def reverse_cell(cell: Cell) -> Cell:
             return (self.dimensions[0] - cell[0] - 1, cell[1])
 
-        reversed_tiling = self._transform(
-            reverse_cell, lambda gp: gp.reverse(reverse_cell)
-        )
+        reversed_tiling = self._symmetry(reverse_cell, GriddedPerm.reverse)
         if not regions:
             return reversed_tiling
         return (
@@ -942,9 +1147,7 @@ class Tiling(CombinatorialClass):
         def complement_cell(cell: Cell) -> Cell:
             return (cell[0], self.dimensions[1] - cell[1] - 1)
 
-        return self._transform(
-            complement_cell, lambda gp: gp.complement(complement_cell)
-        )
+        return self._symmetry(complement_cell, GriddedPerm.complement)
 
     def inverse(self) -> "Tiling":
         """Flip over the diagonal"""
@@ -952,7 +1155,7 @@ class Tiling(CombinatorialClass):
         def inverse_cell(cell: Cell) -> Cell:
             return (cell[1], cell[0])
 
-        return self._transform(inverse_cell, lambda gp: gp.inverse(inverse_cell))
+        return self._symmetry(inverse_cell, GriddedPerm.inverse)
 
     def antidiagonal(self) -> "Tiling":
         """Flip over the anti-diagonal"""
@@ -960,9 +1163,7 @@ class Tiling(CombinatorialClass):
         def antidiagonal_cell(cell: Cell) -> Cell:
             return (self.dimensions[1] - cell[1] - 1, self.dimensions[0] - cell[0] - 1)
 
-        return self._transform(
-            antidiagonal_cell, lambda gp: gp.antidiagonal(antidiagonal_cell)
-        )
+        return self._symmetry(antidiagonal_cell, GriddedPerm.antidiagonal)
 
     def rotate270(self) -> "Tiling":
         """Rotate 270 degrees"""
@@ -970,7 +1171,7 @@ class Tiling(CombinatorialClass):
         def rotate270_cell(cell: Cell) -> Cell:
             return (self.dimensions[1] - cell[1] - 1, cell[0])
 
-        return self._transform(rotate270_cell, lambda gp: gp.rotate270(rotate270_cell))
+        return self._symmetry(rotate270_cell, GriddedPerm.rotate270)
 
     def rotate180(self) -> "Tiling":
         """Rotate 180 degrees"""
@@ -978,7 +1179,7 @@ class Tiling(CombinatorialClass):
         def rotate180_cell(cell: Cell) -> Cell:
             return (self.dimensions[0] - cell[0] - 1, self.dimensions[1] - cell[1] - 1)
 
-        return self._transform(rotate180_cell, lambda gp: gp.rotate180(rotate180_cell))
+        return self._symmetry(rotate180_cell, GriddedPerm.rotate180)
 
     def rotate90(self) -> "Tiling":
         """Rotate 90 degrees"""
@@ -986,7 +1187,7 @@ class Tiling(CombinatorialClass):
         def rotate90_cell(cell: Cell) -> Cell:
             return (cell[1], self.dimensions[0] - cell[0] - 1)
 
-        return self._transform(rotate90_cell, lambda gp: gp.rotate90(rotate90_cell))
+        return self._symmetry(rotate90_cell, GriddedPerm.rotate90)
 
     def all_symmetries(self) -> Set["Tiling"]:
         """
@@ -1083,38 +1284,69 @@ class Tiling(CombinatorialClass):
         factors: bool = False,
         add_assumptions: Iterable[TrackingAssumption] = tuple(),
     ) -> "Tiling":
-        """Return the tiling using only the obstructions and requirements
-        completely contained in the given cells. If factors is set to True,
-        then it assumes that the first cells confirms if a gridded perm uses only
-        the cells."""
-        obstructions = tuple(
-            ob
-            for ob in self.obstructions
-            if (factors and ob.pos[0] in cells) or all(c in cells for c in ob.pos)
-        )
-        requirements = Tiling.sort_requirements(
-            req
-            for req in self.requirements
-            if (factors and req[0].pos[0] in cells)
-            or all(c in cells for c in chain.from_iterable(r.pos for r in req))
-        )
-        assumptions = tuple(
-            ass.__class__(
-                gp
-                for gp in ass.gps
-                if (factors and gp.pos[0] in cells) or all(c in cells for c in gp.pos)
-            )
-            for ass in self.assumptions
-        ) + tuple(add_assumptions)
-        # TODO: check sum/skew assumptions
+        """Return the tiling using only the obstructions, requirements and
+        assumptions completely contained in the given cells, as given by
+        `Tiling.sub_tilings`, with the assumptions add_assumptions added. The
+        factors flag is no longer needed and is ignored."""
+        (tiling,) = self.sub_tilings((cells,))
+        add_assumptions = tuple(ass for ass in add_assumptions if ass.gps)
+        if not add_assumptions:
+            return tiling
         return self.__class__(
-            obstructions,
-            requirements,
-            tuple(sorted(set(ass for ass in assumptions if ass.gps))),
+            tiling.obstructions,
+            tiling.requirements,
+            tuple(sorted(set(tiling.assumptions + add_assumptions))),
             simplify=False,
             sorted_input=True,
         )
 
+    def sub_tilings(self, partition: Iterable[Iterable[Cell]]) -> Tuple["Tiling", ...]:
+        """Return the sub tiling of each part of the partition of cells, as
+        given by `Tiling.sub_tiling`, reading the obstructions, requirements
+        and assumptions once."""
+        parts = tuple(map(frozenset, partition))
+        part_of = {cell: idx for idx, part in enumerate(parts) for cell in part}
+
+        def parts_containing(cells: Iterable[Cell]) -> Iterable[Optional[int]]:
+            idxs = set(map(part_of.get, cells))
+            if not idxs:
+                return range(len(parts))
+            if len(idxs) == 1:
+                return idxs
+            return ()
+
+        obstructions: List[List[GriddedPerm]] = [[] for _ in parts]
+        requirements: List[List[ReqList]] = [[] for _ in parts]
+        for ob in self.obstructions:
+            for idx in parts_containing(ob.pos):
+                if idx is not None:
+                    obstructions[idx].append(ob)
+        for req in self.requirements:
+            for idx in parts_containing(chain.from_iterable(r.pos for r in req)):
+                if idx is not None:
+                    requirements[idx].append(req)
+        assumptions: List[List[TrackingAssumption]] = [[] for _ in parts]
+        for ass in self.assumptions:
+            ass_gps: List[List[GriddedPerm]] = [[] for _ in parts]
+            for gp in ass.gps:
+                for idx in parts_containing(gp.pos):
+                    if idx is not None:
+                        ass_gps[idx].append(gp)
+            for idx, gps in enumerate(ass_gps):
+                if gps:
+                    assumptions[idx].append(ass.__class__(gps))
+        # TODO: check sum/skew assumptions
+        return tuple(
+            self.__class__(
+                obs,
+                Tiling.sort_requirements(reqs),
+                tuple(sorted(set(asses))),
+                simplify=False,
+                sorted_input=True,
+            )
+            for obs, reqs, asses in zip(obstructions, requirements, assumptions)
+        )
+
     def find_factors(self, interleaving: str = "none") -> Tuple["Tiling", ...]:
         """
         Return list with the factors of the tiling.
@@ -1453,13 +1685,67 @@ class Tiling(CombinatorialClass):
         Tiling is empty if it has been inferred to be contradictory due to
         contradicting requirements and obstructions or no gridded permutation
         can be gridded on the tiling.
+
+        The result of searching for a gridded permutation is stored on the
+        tiling and in `Tiling.emptiness_cache`.
         """
+        res = self._cached_properties.get("is_empty")
+        if res is not None:
+            return res
+        if self._view is not None:
+            empty = self._view.is_empty()
+            if empty is not None:
+                return empty
         if any(ob.is_empty() for ob in self.obstructions):
             return True
         if len(self.requirements) <= 1:
             return False
-        MGP = MinimalGriddedPerms(self.obstructions, self.requirements)
-        return all(False for _ in MGP.minimal_gridded_perms(yield_non_minimal=True))
+        # the result does not depend on the assumptions
+        key = encode(self._obstructions, self._requirements, ())
+        res = (
+            Tiling.emptiness_cache.get(key) if Tiling.emptiness_cache.enabled else None
+        )
+        if res is None:
+            if self._obstructions_cover_positive_cells() or any(
+                all(self.obstruction_index.contained_in(gp) for gp in reqlist)
+                for reqlist in self.requirements
+            ):
+                res = True
+            else:
+                MGP = MinimalGriddedPerms(self.obstructions, self.requirements)
+                res = MGP.witness() is None
+            if Tiling.emptiness_cache.enabled:
+                Tiling.emptiness_cache.set(key, res)
+        self._cached_properties["is_empty"] = res
+        return res
+
+    def _obstructions_cover_positive_cells(self) -> bool:
+        """
+        Return True if for some positive cells, every way of placing one point
+        in each of them is an obstruction, so the tiling is empty.
+
+        The points can be placed in the product of the factorials of the
+        number of cells in each row and in each column ways, as only the
+        order of the points in the same row or column can be chosen.
+        """
+        positive_cells = self.positive_cells
+        covered: Counter[CellFrozenSet] = Counter()
+        for ob in self._obstructions:
+            cells = frozenset(ob.pos)
+            if (
+                len(cells) == len(ob)
+                and cells <= positive_cells
+                and not ob.contradictory()
+            ):
+                covered[cells] += 1
+        for cells, count in covered.items():
+            lines = chain(
+                Counter(cell[0] for cell in cells).values(),
+                Counter(cell[1] for cell in cells).values(),
+            )
+            if count == reduce(mul, map(factorial, lines), 1):
+                return True
+        return False
 
     def is_finite(self) -> bool:
         """Returns True if all active cells have finite basis."""
@@ -1516,42 +1802,54 @@ class Tiling(CombinatorialClass):
             if len(gp) == length:
                 yield gp
 
-    def initial_conditions(self, check: int = 6) -> List[Any]:
+    def initial_conditions(self, check: int = 6, workers: int = 1) -> List[Any]:
         """
         Returns a list with the initial conditions to size `check` of the
         CombinatorialClass.
+
+        If `workers` is more than one, the gridded perms are counted in a pool
+        of that many processes.
         """
         res = [0 for _ in range(check + 1)]
         extra_params = self.extra_parameters
-        ass_counter = [
-            (sympy.var(k), self.get_assumption(k).get_value) for k in extra_params
-        ]
-        for gp in self.gridded_perms(check):
-            res[len(gp)] += reduce(
-                mul,
-                (var ** func(gp) for var, func in ass_counter),
-                sympy.Number(1),
-            )
+        variables = [sympy.var(k) for k in extra_params]
+        counter = GriddedPermCounter(
+            self, [self.get_assumption(k) for k in extra_params]
+        )
+        for length, counts in enumerate(counter.count_by_parameters(check, workers)):
+            for values, count in counts.items():
+                res[length] += count * reduce(
+                    mul,
+                    (var**val for var, val in zip(variables, values)),
+                    sympy.Number(1),
+                )
         return res
 
-    def gridded_perms(self, maxlen: Optional[int] = None) -> Iterator[GriddedPerm]:
+    def gridded_perms(
+        self, maxlen: Optional[int] = None, workers: int = 1
+    ) -> Iterator[GriddedPerm]:
         """
         Iterator of all gridded permutations griddable on the tiling.
 
         The gridded permutations are up to length of the longest minimum
         gridded permutations that is griddable on the tiling.
+
+        If `workers` is more than one, the gridded permutations are built in a
+        pool of that many processes, and are not yielded in order of length.
         """
         maxlen = (
             maxlen
             if maxlen is not None
             else self.maximum_length_of_minimum_gridded_perm()
         )
-        yield from GriddedPermsOnTiling(self).gridded_perms(maxlen)
+        yield from GriddedPermsOnTiling(self).gridded_perms(maxlen, workers=workers)
 
-    def enmerate_gp_up_to(self, max_length: int) -> List[int]:
-        """Count gridded perms of each length up to a max length."""
-        cnt = Counter(len(gp) for gp in self.gridded_perms(max_length))
-        return [cnt[i] for i in range(max_length + 1)]
+    def enmerate_gp_up_to(self, max_length: int, workers: int = 1) -> List[int]:
+        """
+        Count gridded perms of each length up to a max length, in a pool of
+        processes if `workers` is more than one.
+        """
+        return GriddedPermCounter(self).count(max_length, workers)
 
     def merge(self) -> "Tiling":
         """Return an equivalent tiling with a single requirement list.
@@ -1721,6 +2019,16 @@ class Tiling(CombinatorialClass):
     def obstructions(self) -> Tuple[GriddedPerm, ...]:
         return self._obstructions
 
+    @property
+    def obstruction_index(self) -> ObstructionIndex:
+        """Returns an index of the obstructions for fast avoidance checks."""
+        try:
+            return self._cached_properties["obstruction_index"]
+        except KeyError:
+            obstruction_index = ObstructionIndex(self._obstructions)
+            self._cached_properties["obstruction_index"] = obstruction_index
+            return obstruction_index
+
     def total_obstructions(self) -> int:
         return len(self._obstructions)
 
@@ -1875,13 +2183,19 @@ class Tiling(CombinatorialClass):
     # -------------------------------------------------------------
 
     def __hash__(self) -> int:
-        return (
-            hash(self._requirements)
-            ^ hash(self._obstructions)
-            ^ hash(self._assumptions)
-        )
+        res = self._cached_properties.get("hash")
+        if res is None:
+            res = (
+                hash(self._requirements)
+                ^ hash(self._obstructions)
+                ^ hash(self._assumptions)
+            )
+            self._cached_properties["hash"] = res
+        return res
 
     def __eq__(self, other: object) -> bool:
+        if self is other:
+            return True
         if not isinstance(other, Tiling):
             return False
         return (
@@ -1901,7 +2215,7 @@ class Tiling(CombinatorialClass):
 
     def __contains__(self, gp: GriddedPerm) -> bool:
         """Test if a gridded permtuaiton is griddable on the given tiling."""
-        return gp.avoids(*self.obstructions) and all(
+        return self.obstruction_index.avoided_by(gp) and all(
             gp.contains(*req) for req in self.requirements
         )
 
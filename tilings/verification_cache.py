@@ -0,0 +1,211 @@
+"""
+An opt-in cache of verification results stored in an SQLite database, so that
+searches for related bases do not repeat the same checks on the same tilings.
+
+The results are keyed by the bytes of the tiling and the strategy, and all the
+results are removed when the database was written by another version of
+tilings.
+
+>>> import os, tempfile
+>>> from tilings import Tiling
+>>> from tilings.strategies.verification import (
+...     InsertionEncodingVerificationStrategy,
+... )
+>>> with tempfile.TemporaryDirectory() as directory:
+...     enable_verification_cache(os.path.join(directory, "verified.db"))
+...     strategy = InsertionEncodingVerificationStrategy()
+...     strategy.verified(Tiling.from_string("12"))
+...     strategy.verified(Tiling.from_string("12"))
+...     print(verification_cache_status())
+...     disable_verification_cache()
+True
+True
+Verification cache: 1 entries, 1 hits, 1 misses, hit rate 50.0%
+"""
+
+import atexit
+import json
+import os
+import sqlite3
+from functools import wraps
+from typing import TYPE_CHECKING, Any, Callable, Optional, TypeVar
+
+if TYPE_CHECKING:
+    from .tiling import Tiling
+
+__all__ = [
+    "VerificationCache",
+    "cached_verification",
+    "disable_verification_cache",
+    "enable_verification_cache",
+    "get_verification_cache",
+    "verification_cache_status",
+]
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+
+class VerificationCache:
+    """
+    A persistent map from a strategy, given by a string, and a tiling to the
+    result of a verification check, which must be json serialisable and not
+    None.
+
+    Each result is committed as soon as it is stored, and the database uses
+    write-ahead logging, so that the processes of a parallel search, which
+    each use their own connection, only lock the database briefly. If the
+    database is still locked after timeout seconds the lookup counts as a miss
+    and the result is not stored.
+    """
+
+    def __init__(self, path: str, timeout: float = 60) -> None:
+        # pylint: disable=import-outside-toplevel
+        from . import __version__
+
+        self.path = path
+        self.version = __version__
+        self.timeout = timeout
+        self.hits = 0
+        self.misses = 0
+        self._pid = -1
+        self._connection: Optional[sqlite3.Connection] = None
+        connection = self.connection
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute(
+            "CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)"
+        )
+        connection.execute(
+            "CREATE TABLE IF NOT EXISTS results (strategy TEXT, tiling BLOB, "
+            "result TEXT, PRIMARY KEY (strategy, tiling)) WITHOUT ROWID"
+        )
+        row = connection.execute(
+            "SELECT value FROM meta WHERE key = 'version'"
+        ).fetchone()
+        if row is None or row[0] != self.version:
+            connection.execute("DELETE FROM results")
+            connection.execute(
+                "INSERT OR REPLACE INTO meta VALUES ('version', ?)", (self.version,)
+            )
+        connection.commit()
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        """The connection to the database for the current process."""
+        if self._connection is None or self._pid != os.getpid():
+            # a connection can not be used in a forked process
+            self._connection = sqlite3.connect(self.path, timeout=self.timeout)
+            self._pid = os.getpid()
+        return self._connection
+
+    def get(self, strategy: str, tiling: "Tiling") -> Any:
+        """
+        Return the result stored for the strategy and tiling, or None if there
+        is none or the database is locked.
+        """
+        try:
+            row = self.connection.execute(
+                "SELECT result FROM results WHERE strategy = ? AND tiling = ?",
+                (strategy, tiling.to_bytes()),
+            ).fetchone()
+        except sqlite3.OperationalError:
+            row = None
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return json.loads(row[0])
+
+    def set(self, strategy: str, tiling: "Tiling", result: Any) -> None:
+        """
+        Store the result for the strategy and tiling, unless the database is
+        locked.
+        """
+        try:
+            with self.connection:
+                self.connection.execute(
+                    "INSERT OR REPLACE INTO results VALUES (?, ?, ?)",
+                    (strategy, tiling.to_bytes(), json.dumps(result)),
+                )
+        except sqlite3.OperationalError:
+            pass
+
+    def clear(self) -> None:
+        """Remove all the results and reset the counters."""
+        with self.connection:
+            self.connection.execute("DELETE FROM results")
+        self.hits = 0
+        self.misses = 0
+
+    def close(self) -> None:
+        """Close the connection."""
+        if self._connection is not None and self._pid == os.getpid():
+            self._connection.close()
+        self._connection = None
+
+    def hit_rate(self) -> float:
+        """Return the proportion of lookups that found a result."""
+        calls = self.hits + self.misses
+        return self.hits / calls if calls else 0.0
+
+    def status(self) -> str:
+        """Return a string describing the usage of the cache."""
+        return (
+            f"Verification cache: {len(self):,d} entries, {self.hits:,d} hits, "
+            f"{self.misses:,d} misses, hit rate {self.hit_rate():.1%}"
+        )
+
+    def __len__(self) -> int:
+        return int(
+            self.connection.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+        )
+
+
+_CACHE: Optional[VerificationCache] = None
+
+
+def enable_verification_cache(path: str, timeout: float = 60) -> None:
+    """Store the verification results in the database at the path."""
+    global _CACHE  # pylint: disable=global-statement
+    disable_verification_cache()
+    _CACHE = VerificationCache(path, timeout)
+
+
+@atexit.register
+def disable_verification_cache() -> None:
+    """Stop using the verification cache."""
+    global _CACHE  # pylint: disable=global-statement
+    if _CACHE is not None:
+        _CACHE.close()
+        _CACHE = None
+
+
+def get_verification_cache() -> Optional[VerificationCache]:
+    """Return the verification cache if it is enabled."""
+    return _CACHE
+
+
+def verification_cache_status() -> str:
+    """Return a string describing the usage of the verification cache."""
+    if _CACHE is None:
+        return "Verification cache: disabled"
+    return _CACHE.status()
+
+
+def cached_verification(func: F) -> F:
+    """
+    Decorate the verified method of a strategy, so that the result is looked
+    up in the verification cache when it is enabled.
+    """
+
+    @wraps(func)
+    def verified(self, comb_class: "Tiling") -> Any:
+        if _CACHE is None:
+            return func(self, comb_class)
+        strategy = json.dumps(self.to_jsonable(), sort_keys=True)
+        res = _CACHE.get(strategy, comb_class)
+        if res is None:
+            res = func(self, comb_class)
+            _CACHE.set(strategy, comb_class, res)
+        return res
+
+    return verified  # type: ignore[return-value]